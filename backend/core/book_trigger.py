@@ -0,0 +1,75 @@
+import logging
+import os
+import time
+from backend.exchanges.orderbook import OrderbookSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class TopOfBookTrigger:
+    """
+    실시간 오더북의 최우선 호가 변화를 감지하여 재계산할 코인을 골라내는 트리거.
+
+    (거래소, 티커)마다 마지막으로 트리거한 시점의 최우선 매도/매수 호가를 기준값으로 두고,
+    어느 한쪽이 기준값 대비 threshold_bps 이상 움직이면 해당 코인을 재계산 대상으로 표시합니다.
+    같은 코인은 min_interval초에 한 번만 내보내며, 그 사이의 변화는 모아 두었다가 다음 due()에서 내보냅니다.
+    처음 보는 오더북은 기준값만 기록합니다. (주기 작업이 전체 티커를 계산하므로)
+    """
+
+    def __init__(self, threshold_bps: float = 5.0, min_interval: float = 1.0):
+        self.threshold = threshold_bps / 10000
+        self.min_interval = min_interval
+        self._anchors: dict[tuple[str, str], tuple[float, float]] = {}  # {(거래소, 티커): (best_ask, best_bid)}
+        self._fired_at: dict[str, float] = {}  # {코인: 마지막으로 내보낸 시각}
+        self._pending: set[str] = set()
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(MARKETDATA_TRIGGER_BPS, MARKETDATA_TRIGGER_MIN_INTERVAL)로 생성합니다.
+        """
+        return cls(
+            threshold_bps=float(os.getenv("MARKETDATA_TRIGGER_BPS", 5.0)),
+            min_interval=float(os.getenv("MARKETDATA_TRIGGER_MIN_INTERVAL", 1.0)),
+        )
+
+    def observe(self, venue: str, ticker: str, snapshot: OrderbookSnapshot) -> bool:
+        """
+        새 오더북을 반영합니다.
+
+        Returns:
+            bool: 최우선 호가가 임계값 이상 움직였으면 True
+        """
+        best_ask, best_bid = snapshot.best_ask, snapshot.best_bid
+        if not best_ask or not best_bid:
+            return False
+        key = (venue, ticker)
+        anchor = self._anchors.get(key)
+        if anchor is not None:
+            anchor_ask, anchor_bid = anchor
+            moved = max(abs(best_ask - anchor_ask) / anchor_ask, abs(best_bid - anchor_bid) / anchor_bid)
+            if moved < self.threshold:
+                return False
+            self._pending.add(ticker)
+        self._anchors[key] = (best_ask, best_bid)
+        return anchor is not None
+
+    def due(self) -> list[str]:
+        """
+        재계산할 코인 목록을 반환합니다. (min_interval 안에 이미 내보낸 코인은 다음 호출로 미룸)
+        """
+        now = time.monotonic()
+        coins = [coin for coin in self._pending if now - self._fired_at.get(coin, float("-inf")) >= self.min_interval]
+        for coin in coins:
+            self._pending.discard(coin)
+            self._fired_at[coin] = now
+        return coins
+
+    def forget(self, venue: str, ticker: str):
+        """
+        구독 해제한 오더북의 기준 호가를 버립니다. (거래 유니버스에서 빠진 티커)
+        """
+        self._anchors.pop((venue, ticker), None)
+        if not any(key[1] == ticker for key in self._anchors):
+            self._pending.discard(ticker)
+            self._fired_at.pop(ticker, None)
@@ -0,0 +1,46 @@
+import os
+
+# 거래소별 시장가(taker) 수수료율 ~ TAKER_FEE_<거래소> 환경변수로 변경 가능 (예: TAKER_FEE_UPBIT=0.0005)
+TAKER_FEES = {
+    "upbit": 0.0005,
+    "bithumb": 0.0004,
+    "bybit": 0.00055,
+    "binance": 0.0005,
+    "gateio": 0.0005,
+}
+
+
+def taker_fee(venue: str) -> float:
+    """
+    거래소의 시장가 수수료율
+    """
+    venue = venue.lower()
+    return float(os.getenv(f"TAKER_FEE_{venue.upper()}", TAKER_FEES.get(venue, 0.0)))
+
+
+def net_factors(korean_fee: float, foreign_fee: float, funding_rate: float = 0.0, funding_periods: float = 1.0) -> tuple[float, float]:
+    """
+    원시 환율(seed / 해외 체결금액)에 곱하면 수수료/펀딩비가 반영된 순환율이 되는 계수를 계산합니다.
+
+    진입: 한국 매수 seed x (1 + 한국 수수료) / 해외 숏 체결금액 x (1 - 해외 수수료 + 펀딩비 x 보유 펀딩 횟수)
+    종료: 한국 매도 seed x (1 - 한국 수수료) / 해외 숏 청산 체결금액 x (1 + 해외 수수료)
+    펀딩비가 양수이면 숏 포지션이 펀딩비를 받으므로 진입 순환율이 낮아집니다.
+
+    Returns:
+        tuple[float, float]: (진입 계수, 종료 계수)
+    """
+    entry_factor = (1 + korean_fee) / (1 - foreign_fee + funding_rate * funding_periods)
+    exit_factor = (1 - korean_fee) / (1 + foreign_fee)
+    return entry_factor, exit_factor
+
+
+def pair_net_factors(korean_ex: str, foreign_ex: str, funding_rate: float = 0.0) -> tuple[float, float]:
+    """
+    거래소 조합의 순환율 계수 ~ 펀딩 횟수는 FUNDING_PERIODS 환경변수 (기본값 1회)
+    """
+    return net_factors(
+        taker_fee(korean_ex),
+        taker_fee(foreign_ex),
+        funding_rate,
+        float(os.getenv("FUNDING_PERIODS", 1))
+    )
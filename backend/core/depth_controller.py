@@ -0,0 +1,106 @@
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+# 거래소별 오더북 조회 최대 레벨 수 (기존 고정값)
+VENUE_MAX_DEPTH = {
+    "upbit": 100,
+    "bithumb": 100,
+    "bybit": 500,
+    "gateio": 100,
+    "binance": 100,
+}
+
+
+class DepthController:
+    """
+    (거래소, 티커)별로 다음 사이클에 요청할 오더북 레벨 수를 관리합니다.
+
+    매 사이클 최대 시드를 채우는 데 필요했던 레벨 수를 관측하여
+    필요 레벨 수 x margin + pad 만큼만 요청하고, 받은 호가창으로 최대 시드를 채우지 못하면
+    다음 사이클에는 거래소 최대 레벨 수로 요청합니다.
+    처음 보는 티커는 거래소 최대 레벨 수로 시작합니다.
+    주문 직전 재확인처럼 시드 하나만 계산할 때는 seed_depth()로 그 시드에 필요한 만큼만 요청합니다.
+    """
+
+    def __init__(self, min_depth: int = 20, margin: float = 1.5, pad: int = 5, max_depth: dict | None = None):
+        self.min_depth = min_depth
+        self.margin = margin
+        self.pad = pad
+        self.max_depth = dict(VENUE_MAX_DEPTH if max_depth is None else max_depth)
+        self._depths: dict[tuple[str, str], int] = {}
+        self._observed: dict[tuple[str, str], tuple[int, float]] = {}  # {(거래소, 티커): (필요 레벨 수, 최대 시드)}
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(ORDERBOOK_DEPTH_MIN, ORDERBOOK_DEPTH_MARGIN, ORDERBOOK_DEPTH_PAD)로 생성합니다.
+        """
+        return cls(
+            min_depth=int(os.getenv("ORDERBOOK_DEPTH_MIN", 20)),
+            margin=float(os.getenv("ORDERBOOK_DEPTH_MARGIN", 1.5)),
+            pad=int(os.getenv("ORDERBOOK_DEPTH_PAD", 5)),
+        )
+
+    def venue_max(self, venue: str) -> int:
+        return self.max_depth.get(venue.lower(), max(self.max_depth.values()))
+
+    def depth(self, venue: str, ticker: str) -> int:
+        """
+        다음 요청에 사용할 레벨 수
+        """
+        return self._depths.get((venue.lower(), ticker), self.venue_max(venue))
+
+    def seed_depth(self, venue: str, ticker: str, seed: float) -> int:
+        """
+        시드 하나를 채우는 데 필요한 레벨 수 추정 ~ 마지막 관측(최대 시드에 필요했던 레벨 수)을 시드 비율로 줄이고
+        margin/pad를 더합니다. depth()를 넘지 않으며, 관측 전이거나 최대 시드 이상이면 depth()를 반환합니다.
+        """
+        ceiling = self.depth(venue, ticker)
+        observed = self._observed.get((venue.lower(), ticker))
+        if observed is None:
+            return ceiling
+        needed, max_seed = observed
+        if seed >= max_seed:
+            return ceiling
+        target = math.ceil(needed * seed / max_seed * self.margin) + self.pad
+        return min(max(target, self.min_depth), ceiling)
+
+    def batch_depth(self, venue: str, tickers: list[str]) -> int:
+        """
+        여러 티커를 한 번에 조회하는 거래소(Upbit/Bithumb)용 ~ 티커별 레벨 수 중 최댓값
+        """
+        return max((self.depth(venue, ticker) for ticker in tickers), default=self.venue_max(venue))
+
+    def observe(self, venue: str, ticker: str, needed: int, received: int, max_seed: float | None = None):
+        """
+        이번 사이클의 관측값으로 다음 요청 레벨 수를 갱신합니다.
+
+        Args:
+            needed (int): 최대 시드를 채우는 데 필요한 레벨 수 (호가창 소진 시 received + 1)
+            received (int): 실제로 받은 레벨 수
+            max_seed (float | None): needed를 계산한 최대 시드 (KRW) ~ seed_depth() 추정에 사용
+        """
+        venue = venue.lower()
+        limit = self.venue_max(venue)
+        requested = self.depth(venue, ticker)
+
+        if needed > received or not max_seed:
+            self._observed.pop((venue, ticker), None)
+        else:
+            self._observed[(venue, ticker)] = (needed, max_seed)
+
+        if needed > received:
+            if received < requested or requested >= limit:
+                # 요청한 만큼 호가가 없음 ~ 호가창 자체가 얇은 티커
+                logger.warning(f"[{venue}] {ticker} 호가창 부족: {received}레벨로 최대 시드를 채울 수 없습니다.")
+            self._depths[(venue, ticker)] = limit
+            return
+
+        target = math.ceil(needed * self.margin) + self.pad
+        self._depths[(venue, ticker)] = min(max(target, self.min_depth), limit)
+
+
+depth_controller = DepthController.from_env()
@@ -1,22 +1,81 @@
 import logging
 import asyncio
 import os
+import time
+from concurrent.futures import Executor
 from backend.exchanges import *
 import psycopg2
 from contextlib import contextmanager
 from backend.exchanges.base import Exchange, ForeignExchange, KoreanExchange
+from backend.core.rate_engine import calc_rate_ladder_with_liquidity, calc_side_rate
+from backend.core.depth_controller import DepthController, depth_controller
+from backend.core.costs import pair_net_factors
+from backend.core.rate_memo import RateMemo, rate_memo
+from backend.core.seed_grid import DEFAULT_SEED_GRID, SeedGrid
+from backend.core.task_planner import KOREAN_LATENCY_PREFIX
+from backend.core.universe import TICKER_UNIVERSE_CHANNEL
 from backend.utils.safe_numeric import safe_numeric
 from dotenv import load_dotenv
-from decimal import Decimal, ROUND_HALF_UP
 
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+def _get_exchange_class(name):
+    # 예: 'upbit' -> 'UpbitExchange', 'bybit' -> 'BybitExchange'
+    class_name = name.lower().capitalize() + 'Exchange'
+    return globals().get(class_name)
+
+async def _get_funding_rates(foreign_ex_class) -> dict[str, float]:
+    # 펀딩비 조회 실패 시 환율 계산은 계속 진행 (펀딩비 0으로 간주)
+    try:
+        return await foreign_ex_class.get_funding_rates()
+    except Exception as e:
+        logger.warning(f"[{foreign_ex_class.name}] 펀딩비 조회 실패, 0으로 계산합니다: {e}")
+        return {}
+
+async def _timed(coro, timings: dict[str, float] | None, key: str):
+    # timings가 주어지면 요청 소요 시간(초)을 key별로 누적
+    if timings is None:
+        return await coro
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[key] = timings.get(key, 0.0) + time.perf_counter() - started
+
+def batch_tickers_by_coin(tickers: list[tuple], batch_size: int) -> list[list[tuple]]:
+    """
+    (korean_ex, foreign_ex, coin_symbol) 튜플을 코인 단위로 묶어 배치로 나눕니다.
+    한 코인의 모든 거래소 조합은 항상 같은 배치에 들어가므로
+    워커는 거래소별 오더북을 코인당 한 번만 조회합니다.
+
+    Args:
+        tickers: (korean_ex, foreign_ex, coin_symbol) 튜플 리스트
+        batch_size: 배치당 튜플 수 (코인 그룹은 쪼개지 않으므로 초과할 수 있음)
+    """
+    coins = {}  # {coin_symbol: [tuple]} ~ 입력 순서 유지
+    for ticker in tickers:
+        coins.setdefault(ticker[2], []).append(tuple(ticker))
+
+    batches, batch = [], []
+    for pairs in coins.values():
+        batch.extend(pairs)
+        if len(batch) >= batch_size:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+    return batches
+
 class ExchangeManager:
     def __init__(self):
         self.exchanges: dict[str, KoreanExchange | ForeignExchange] = {}
+        # 시드 그리드 캐시 ~ 활성 전략 조회(DB)를 태스크마다 하지 않도록 SEED_GRID_CACHE_TTL초 동안 재사용
+        self.seed_grid_ttl = float(os.getenv("SEED_GRID_CACHE_TTL", 60))
+        self._seed_grid: SeedGrid | None = None
+        self._seed_grid_at = float("-inf")
 
     def register_exchange(self, name, exchange):
         self.exchanges[name] = exchange
@@ -44,24 +103,29 @@ class ExchangeManager:
         finally:
             conn.close()
 
-    async def upsert_tickers(self):
+    async def upsert_tickers(self) -> bool:
         """
         데이터베이스에 티커 정보를 갱신합니다.
+        실제로 바뀐 행이 있으면 같은 트랜잭션에서 NOTIFY를 보내 공통 티커를 캐시하는 프로세스(TickerUniverse)가 다시 읽도록 합니다.
+
+        Returns:
+            bool: 바뀐 티커가 있으면 True
         """
-        async def process_exchange(exchange_name, exchange_obj):
+        async def process_exchange(exchange_name, exchange_obj) -> int:
             with self._get_db_cursor() as cursor:
                 ticker_infos = await exchange_obj.get_full_ticker_info()
                 if not ticker_infos:
                     logger.warning(f"No ticker info found for {exchange_name}")
-                    return
+                    return 0
 
                 cursor.execute("SELECT id FROM exchanges WHERE eng_name = %s", (exchange_name,))
                 exchange_id_row = cursor.fetchone()
                 if not exchange_id_row:
                     logger.error(f"Exchange id not found for {exchange_name}")
-                    return
+                    return 0
                 exchange_id = exchange_id_row[0]
 
+                changed = 0
                 for info in ticker_infos:
                     cursor.execute(
                         """
@@ -73,6 +137,10 @@ class ExchangeManager:
                         net_type = EXCLUDED.net_type, 
                         deposit_yn = EXCLUDED.deposit_yn, 
                         withdraw_yn = EXCLUDED.withdraw_yn
+                        WHERE (coins_exchanges.display_name, coins_exchanges.net_type,
+                               coins_exchanges.deposit_yn, coins_exchanges.withdraw_yn)
+                        IS DISTINCT FROM (EXCLUDED.display_name, EXCLUDED.net_type,
+                                          EXCLUDED.deposit_yn, EXCLUDED.withdraw_yn)
                         """,
                         (
                             exchange_id,
@@ -83,6 +151,8 @@ class ExchangeManager:
                             bool(info.get('withdraw_yn', 0))
                         )
                     )
+                    # 값이 같으면 UPDATE가 생략되어 rowcount 0
+                    changed += max(cursor.rowcount, 0)
 
                 # ticker_infos에 없는 티커는 삭제
                 current_tickers = {info.get('ticker') for info in ticker_infos}
@@ -95,9 +165,16 @@ class ExchangeManager:
                         (exchange_id, list(tickers_to_delete))
                     )
                     logger.info(f"Deleted {len(tickers_to_delete)} obsolete tickers for {exchange_name}: {list(tickers_to_delete)}")
+                    changed += len(tickers_to_delete)
+
+                if changed:
+                    # 커밋 시점에 LISTEN 중인 연결로 전달됨
+                    cursor.execute(f"NOTIFY {TICKER_UNIVERSE_CHANNEL}")
+                    logger.info(f"[{exchange_name}] {changed}개 티커 변경")
+                return changed
 
         tasks = [process_exchange(name, obj) for name, obj in self.exchanges.items()]
-        await asyncio.gather(*tasks)
+        return sum(await asyncio.gather(*tasks)) > 0
 
     def get_users_with_both_exchanges_running_autotrading(self, korean_ex, foreign_ex):
         """
@@ -145,6 +222,97 @@ class ExchangeManager:
                 return [dict(zip(colnames, row)) for row in rows]
             return []
         
+    def get_active_strategy_seeds(self) -> list[tuple]:
+        """
+        활성화된 전략(is_active=true)의 (seed_amount, seed_division) 목록을 반환합니다.
+        """
+        try:
+            with self._get_db_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT DISTINCT s.seed_amount, s.seed_division
+                    FROM users u
+                    JOIN strategies s ON u.active_strategy_id = s.id
+                    WHERE s.is_active = TRUE
+                    """
+                )
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"활성 전략 시드 조회 중 에러: {e}")
+            return []
+
+    def get_active_strategy_coins(self) -> set[str] | None:
+        """
+        활성화된 전략이 거래하는 코인 목록을 반환합니다.
+        자동 코인 모드(coin_mode != 'custom') 전략이 하나라도 있으면 전체 코인 대상이므로 None을 반환합니다.
+        """
+        try:
+            with self._get_db_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT DISTINCT s.coin_mode, s.selected_coins
+                    FROM users u
+                    JOIN strategies s ON u.active_strategy_id = s.id
+                    WHERE s.is_active = TRUE
+                    """
+                )
+                coins = set()
+                for coin_mode, selected_coins in cursor.fetchall():
+                    if coin_mode != 'custom':
+                        return None
+                    coins.update(selected_coins or [])
+                return coins
+        except Exception as e:
+            logger.error(f"활성 전략 코인 조회 중 에러: {e}")
+            return None
+
+    def get_open_position_coins(self) -> set[str] | None:
+        """
+        열린 포지션이 있는 코인 목록을 반환합니다. 조회 실패 시 None.
+        (유저/거래소 조합별 마지막 CLOSED 포지션 이후의 OPEN 포지션 ~ get_user_positions_for_settlement와 같은 기준)
+        """
+        try:
+            with self._get_db_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT DISTINCT p.coin_symbol
+                    FROM positions p
+                    WHERE p.status = 'OPEN'
+                    AND p.entry_time > COALESCE((
+                        SELECT MAX(c.entry_time)
+                        FROM positions c
+                        WHERE c.user_id = p.user_id
+                        AND c.coin_symbol = p.coin_symbol
+                        AND c.kr_exchange = p.kr_exchange
+                        AND c.fr_exchange = p.fr_exchange
+                        AND c.status = 'CLOSED'
+                    ), '-infinity')
+                    """
+                )
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"열린 포지션 코인 조회 중 에러: {e}")
+            return None
+
+    def get_seed_grid(self) -> SeedGrid:
+        """
+        SEED_GRID_MODE 환경변수에 따라 이번 사이클에 계산할 시드 그리드를 반환합니다.
+        seed_grid_ttl초 동안은 이전 그리드를 재사용합니다.
+        그 사이 추가된 전략의 진입시드는 invalidate_seed_grid()로 다음 사이클에 반영합니다.
+        """
+        now = time.monotonic()
+        if self._seed_grid is None or now - self._seed_grid_at >= self.seed_grid_ttl:
+            self._seed_grid = SeedGrid.from_env(self.get_active_strategy_seeds)
+            self._seed_grid_at = now
+        return self._seed_grid
+
+    def invalidate_seed_grid(self, min_age: float = 1.0):
+        """
+        다음 get_seed_grid()에서 그리드를 다시 만들도록 합니다. (그리드에 없는 진입시드 발견 시)
+        그리드에 없는 시드가 계속 들어와도 DB 조회가 몰리지 않도록 마지막 생성 후 min_age초는 재사용합니다.
+        """
+        self._seed_grid_at = min(self._seed_grid_at, time.monotonic() - self.seed_grid_ttl + min_age)
+        
     def get_user_positions_for_settlement(self, user_id, coin_symbol, kr_exchange, fr_exchange):
         """
         마지막 OPEN 포지션부터 마지막 포지션까지 모두 조회하여
@@ -416,164 +584,215 @@ class ExchangeManager:
         }
         
     @staticmethod
-    async def calc_exrate_batch(tickers: list[tuple[str, str, str]]):
+    async def calc_exrate_batch(tickers: list[tuple[str, str, str]], seed_grid: SeedGrid | None = None,
+                                depth: DepthController | None = None, net: bool = False,
+                                executor: Executor | None = None, memo: RateMemo | None = None,
+                                timings: dict[str, float] | None = None):
         """
         여러 티커에 대해 여러 시드금액 기준 환율을 일괄 계산합니다.
         tickers: (exchange1, exchange2, coin_symbol) 형식의 튜플 리스트
+        seed_grid: 계산할 시드 그리드 (기본값: 100만원 ~ 1억원, 100만원 단위)
+        depth: 티커별 오더북 조회 레벨 수 컨트롤러 (기본값: 모듈 공용 depth_controller)
+        net: True이면 거래소별 시장가 수수료와 현재 펀딩비를 반영한 순환율(net_entry_ex_rate, net_exit_ex_rate)도 계산
+        executor: 환율 계산을 실행할 스레드/프로세스 풀 (기본값: None ~ 이벤트 루프에서 직접 계산)
+        memo: 오더북 타임스탬프 기반 결과 메모 (기본값: 모듈 공용 rate_memo)
+        timings: 주어지면 요청 소요 시간(초)을 기록 ~ 코인별 해외 오더북 조회 시간 합과 korean:{거래소} 일괄 조회 시간 (TaskPlanner용)
         """
-        def get_exchange_class(name):
-            # 예: 'upbit' -> 'UpbitExchange', 'bybit' -> 'BybitExchange'
-            class_name = name.lower().capitalize() + 'Exchange'
-            return globals().get(class_name)
+        if seed_grid is None:
+            seed_grid = DEFAULT_SEED_GRID
+        if depth is None:
+            depth = depth_controller
+        if memo is None:
+            memo = rate_memo
 
         if not tickers:
             return []
         
-        # 거래소별로 그룹화
+        # 거래소별로 그룹화 ~ 같은 (거래소, 코인) 오더북은 한 번만 조회하여 모든 거래소 조합이 공유
         korean_groups = {}  # {exchange_name: [coin_symbols]}
-        foreign_requests = []  # [(exchange_class, coin_symbol, original_index)]
-        
-        for i, (korean_ex, foreign_ex, coin_symbol) in enumerate(tickers):
+        foreign_requests = {}  # {(foreign_ex, coin_symbol): exchange_class}
+
+        for korean_ex, foreign_ex, coin_symbol in tickers:
             # 한국거래소 그룹화
-            if korean_ex not in korean_groups:
-                korean_groups[korean_ex] = []
-            korean_groups[korean_ex].append((coin_symbol, i))
-            
+            coin_symbols = korean_groups.setdefault(korean_ex, [])
+            if coin_symbol not in coin_symbols:
+                coin_symbols.append(coin_symbol)
+
             # 해외거래소 요청 준비
-            foreign_ex_class = get_exchange_class(foreign_ex)
-            if foreign_ex_class is None:
-                raise ValueError(f"Unknown foreign exchange: {foreign_ex}")
-            foreign_requests.append((foreign_ex_class, coin_symbol, i))
-        
+            if (foreign_ex, coin_symbol) not in foreign_requests:
+                foreign_ex_class = _get_exchange_class(foreign_ex)
+                if foreign_ex_class is None:
+                    raise ValueError(f"Unknown foreign exchange: {foreign_ex}")
+                foreign_requests[(foreign_ex, coin_symbol)] = foreign_ex_class
+
         # 한국거래소 배치 요청 준비
         korean_tasks = []
-        korean_task_metadata = []  # (korean_ex_name, indices)를 저장
-        
-        for korean_ex_name, coin_data in korean_groups.items():
-            korean_ex_class = get_exchange_class(korean_ex_name)
+        korean_task_metadata = []  # korean_ex_name을 저장
+
+        for korean_ex_name, coin_symbols in korean_groups.items():
+            korean_ex_class = _get_exchange_class(korean_ex_name)
             if korean_ex_class is None:
                 raise ValueError(f"Unknown Korean exchange: {korean_ex_name}")
-            
-            coin_symbols = [coin_symbol for coin_symbol, _ in coin_data]
-            indices = [idx for _, idx in coin_data]
-            
-            # 한국거래소는 한 번의 요청으로 여러 코인 처리
-            korean_tasks.append(korean_ex_class.get_ticker_orderbook(coin_symbols))
-            korean_task_metadata.append((korean_ex_name, indices))
-        
+
+            # 한국거래소는 한 번의 요청으로 여러 코인 처리 ~ 가장 깊은 호가가 필요한 코인 기준
+            korean_tasks.append(_timed(korean_ex_class.get_ticker_orderbook(
+                coin_symbols, depth.batch_depth(korean_ex_name, coin_symbols)
+            ), timings, f"{KOREAN_LATENCY_PREFIX}{korean_ex_name}"))
+            korean_task_metadata.append(korean_ex_name)
+
         # 해외거래소 요청 준비
         foreign_tasks = [
-            foreign_ex_class.get_ticker_orderbook(coin_symbol)
-            for foreign_ex_class, coin_symbol, _ in foreign_requests
+            _timed(foreign_ex_class.get_ticker_orderbook(coin_symbol, depth.depth(foreign_ex, coin_symbol)),
+                   timings, coin_symbol)
+            for (foreign_ex, coin_symbol), foreign_ex_class in foreign_requests.items()
         ]
-        
+
+        # 순환율 계산 시 해외거래소별 펀딩비 조회 (거래소당 1회)
+        funding_venues = {}  # {foreign_ex: exchange_class}
+        if net:
+            for (foreign_ex, _), foreign_ex_class in foreign_requests.items():
+                funding_venues.setdefault(foreign_ex, foreign_ex_class)
+        funding_tasks = [_get_funding_rates(foreign_ex_class) for foreign_ex_class in funding_venues.values()]
+
         # 한국거래소와 해외거래소 요청을 동시에 실행
-        all_results = await asyncio.gather(*korean_tasks, *foreign_tasks)
-        
+        all_results = await asyncio.gather(*korean_tasks, *foreign_tasks, *funding_tasks)
+
         # 결과를 한국거래소와 해외거래소로 분리
         korean_batch_results = all_results[:len(korean_tasks)]
-        foreign_orderbooks = all_results[len(korean_tasks):]
-        
-        # 한국거래소 결과 매핑
-        korean_results = {}  # {original_index: orderbook}
-        for batch_result, (korean_ex_name, indices) in zip(korean_batch_results, korean_task_metadata):
-            for orderbook, original_idx in zip(batch_result, indices):
-                korean_results[original_idx] = orderbook
-        
-        # 해외거래소 결과 매핑
-        foreign_results = {}
-        for (foreign_ex_class, coin_symbol, original_idx), orderbook in zip(foreign_requests, foreign_orderbooks):
-            foreign_results[original_idx] = orderbook
-        
-        # 환율 계산
+        foreign_orderbooks = all_results[len(korean_tasks):len(korean_tasks) + len(foreign_tasks)]
+        funding_rates = {
+            venue: rates
+            for venue, rates in zip(funding_venues, all_results[len(korean_tasks) + len(foreign_tasks):])
+        }
+
+        # 한국거래소 결과 매핑 {(korean_ex, coin_symbol): orderbook}
+        korean_results = {}
+        for batch_result, korean_ex_name in zip(korean_batch_results, korean_task_metadata):
+            for orderbook in batch_result:
+                korean_results[(korean_ex_name, orderbook.ticker)] = orderbook
+
+        # 해외거래소 결과 매핑 {(foreign_ex, coin_symbol): orderbook}
+        foreign_results = dict(zip(foreign_requests.keys(), foreign_orderbooks))
+
+        # 계산 대상 조합 (한국 오더북 응답이 없는 조합은 제외)
+        pairs = []  # [(korean_ex, foreign_ex, coin_symbol, korean_ob, foreign_ob, net_factors)]
+        for korean_ex, foreign_ex, coin_symbol in tickers:
+            korean_ob = korean_results.get((korean_ex, coin_symbol))
+            foreign_ob = foreign_results[(foreign_ex, coin_symbol)]
+            if korean_ob is None:
+                logger.warning(f"[{korean_ex}] {coin_symbol} 오더북 응답이 없습니다.")
+                continue
+
+            net_factors = None
+            if net:
+                net_factors = pair_net_factors(korean_ex, foreign_ex, funding_rates[foreign_ex].get(coin_symbol, 0.0))
+            pairs.append((korean_ex, foreign_ex, coin_symbol, korean_ob, foreign_ob, net_factors))
+
+        # 두 오더북이 모두 이전과 같으면 메모된 결과를 재사용
+        memo_keys = [
+            memo.key(korean_ex, korean_ob, foreign_ex, foreign_ob, seed_grid.version, net_factors)
+            for korean_ex, foreign_ex, _, korean_ob, foreign_ob, net_factors in pairs
+        ]
+        evaluated = [memo.get(key) for key in memo_keys]
+        missed = [i for i, value in enumerate(evaluated) if value is None]
+
+        # 환율 계산 ~ 오더북 한 면당 누적합 배열을 한 번만 만들고 모든 시드를 일괄 해석
+        # executor가 주어지면 이벤트 루프 밖(스레드/프로세스 풀)에서 계산하여 다른 유저의 I/O 지연을 막음
+        if executor is None:
+            computed = [
+                calc_rate_ladder_with_liquidity(pairs[i][3], pairs[i][4], seed_grid.seeds, pairs[i][5])
+                for i in missed
+            ]
+        else:
+            loop = asyncio.get_running_loop()
+            computed = await asyncio.gather(*(
+                loop.run_in_executor(executor, calc_rate_ladder_with_liquidity,
+                                     pairs[i][3], pairs[i][4], seed_grid.seeds, pairs[i][5])
+                for i in missed
+            ))
+        for i, value in zip(missed, computed):
+            evaluated[i] = value
+            memo.put(memo_keys[i], value)
+
+        # 다음 사이클 조회 레벨 수 ~ 같은 오더북을 공유하는 조합 중 가장 깊은 요구치 기준
+        needed_levels = {}  # {(exchange_name, coin_symbol): (needed, orderbook)}
+
+        # ex_rates는 같은 태스크의 모든 유저가 공유하는 불변 RateLadder
         results = []
-        seeds = [i for i in range(1000000, 100_000_001, 1000000)] # KRW
-        
-        for i, (korean_ex, foreign_ex, coin_symbol) in enumerate(tickers):
-            korean_ob = korean_results[i]
-            foreign_ob = foreign_results[i]
-
-            # 오더북은 이미 거래소에서 정렬된 상태로 제공됨 (정렬 불필요)
-            # 각 레벨: {ask_price, bid_price, ask_size, bid_size}
-
-            ex_rates = []
-            for seed in seeds:
-                # === 포지션 진입 시 환율 계산 ===
-                # 한국거래소: 매수 (매도호가 사용)
-                available_size = 0
-                remaining_seed = seed
-                for unit in korean_ob["orderbook"]:
-                    ob_quote_volume = unit["ask_price"] * unit["ask_size"]
-                    if remaining_seed >= ob_quote_volume:
-                        available_size += unit["ask_size"]
-                        remaining_seed -= ob_quote_volume
-                    else:
-                        available_size += remaining_seed / unit["ask_price"]
-                        break
-                
-                # 해외거래소: 매도 (매수호가 사용)
-                remaining_size = available_size
-                quote_volume = 0
-                for unit in foreign_ob["orderbook"]:
-                    if remaining_size >= unit["bid_size"]:
-                        quote_volume += unit["bid_price"] * unit["bid_size"]
-                        remaining_size -= unit["bid_size"]
-                    else:
-                        quote_volume += unit["bid_price"] * remaining_size
-                        break
-                
-                if available_size == 0 or quote_volume == 0:
-                    entry_exchange_rate = None
-                else:
-                    entry_exchange_rate = Decimal(str(seed)) / Decimal(str(quote_volume))
-                    entry_exchange_rate = entry_exchange_rate.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    entry_exchange_rate = float(entry_exchange_rate)
-
-                # === 포지션 종료 시 환율 계산 ===
-                # 한국거래소: 매도 (매수호가 사용)
-                available_size = 0
-                remaining_size_exit = seed
-                for unit in korean_ob["orderbook"]:
-                    if remaining_size_exit >= unit["bid_size"] * unit["bid_price"]:
-                        available_size += unit["bid_size"]
-                        remaining_size_exit -= unit["bid_size"] * unit["bid_price"]
-                    else:
-                        available_size += remaining_size_exit / unit["bid_price"]
-                        break
-
-                # 해외거래소: 매수 (매도호가 사용)
-                exit_fr_funds = 0
-                remaining_size_exit_fr = available_size
-                for unit in foreign_ob["orderbook"]:
-                    if remaining_size_exit_fr >= unit["ask_size"]:
-                        exit_fr_funds += unit["ask_price"] * unit["ask_size"]
-                        remaining_size_exit_fr -= unit["ask_size"]
-                    else:
-                        exit_fr_funds += unit["ask_price"] * remaining_size_exit_fr
-                        break
-                
-                if exit_fr_funds == 0:
-                    exit_exchange_rate = None
-                else:
-                    exit_exchange_rate = Decimal(str(seed)) / Decimal(str(exit_fr_funds))
-                    exit_exchange_rate = exit_exchange_rate.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    exit_exchange_rate = float(exit_exchange_rate)
-
-                ex_rates.append({
-                    'seed': seed,
-                    'entry_ex_rate': entry_exchange_rate,
-                    'exit_ex_rate': exit_exchange_rate
-                })
-                
+        for (korean_ex, foreign_ex, coin_symbol, korean_ob, foreign_ob, _), (ex_rates, liquidity) in zip(pairs, evaluated):
+            for key, needed, orderbook in (((korean_ex, coin_symbol), liquidity['korean_levels'], korean_ob),
+                                           ((foreign_ex, coin_symbol), liquidity['foreign_levels'], foreign_ob)):
+                needed_levels[key] = (max(needed_levels.get(key, (0,))[0], needed), orderbook)
+
             results.append({
-                "name": korean_ob["ticker"],
+                "name": korean_ob.ticker,
                 "korean_ex": korean_ex,
                 "foreign_ex": foreign_ex,
-                "ex_rates": ex_rates
+                "ex_rates": ex_rates,
+                "liquidity": {
+                    "entry_ceiling": liquidity['entry_ceiling'],
+                    "exit_ceiling": liquidity['exit_ceiling']
+                }
             })
+
+        max_seed = float(seed_grid.seeds[-1]) if len(seed_grid) else None
+        for (venue, coin_symbol), (needed, orderbook) in needed_levels.items():
+            depth.observe(venue, coin_symbol, needed, min(len(orderbook.ask_prices), len(orderbook.bid_prices)), max_seed)
         
         return results
 
+    @staticmethod
+    async def recheck_rate(pair: tuple[str, str], coin: str, seed: float, side: str) -> float | None:
+        """
+        주문 직전 환율 재확인용 fast path.
+        한 티커의 오더북만 조회하여 시드 하나, 방향 하나의 환율만 계산합니다.
+
+        Args:
+            pair: (korean_ex, foreign_ex) 거래소 이름 튜플
+            coin: 코인 심볼
+            seed: 시드금액 (KRW) ~ 유저의 실제 entry_seed
+            side: 'entry' (한국 ask / 해외 bid) 또는 'exit' (한국 bid / 해외 ask)
+
+        Returns:
+            float | None: 재확인 환율, 계산 불가 시 None
+        """
+        korean_ex, foreign_ex = pair
+        korean_ex_class = _get_exchange_class(korean_ex)
+        if korean_ex_class is None:
+            raise ValueError(f"Unknown Korean exchange: {korean_ex}")
+        foreign_ex_class = _get_exchange_class(foreign_ex)
+        if foreign_ex_class is None:
+            raise ValueError(f"Unknown foreign exchange: {foreign_ex}")
+
+        # 이 시드에 필요한 레벨 수만 조회 (메인 계산 레벨 수 이하) ~ 피드 오더북/캐시는 더 깊은 오더북도 그대로 사용
+        # 추정이 부족해 호가창이 소진되면 메인 계산과 같은 레벨 수로 한 번 더 조회
+        depths = [
+            (depth_controller.seed_depth(korean_ex, coin, seed), depth_controller.seed_depth(foreign_ex, coin, seed)),
+            (depth_controller.depth(korean_ex, coin), depth_controller.depth(foreign_ex, coin)),
+        ]
+        rate = None
+        for i, (korean_depth, foreign_depth) in enumerate(depths):
+            if i and (korean_depth, foreign_depth) == depths[0]:
+                break
+            korean_obs, foreign_ob = await asyncio.gather(
+                korean_ex_class.get_ticker_orderbook([coin], korean_depth),
+                foreign_ex_class.get_ticker_orderbook(coin, foreign_depth)
+            )
+            if not korean_obs:
+                return None
+
+            # 메인 계산 이후 오더북이 바뀌지 않은 경우(저유동성 티커) 같은 재확인을 반복하지 않음
+            key = rate_memo.key(korean_ex, korean_obs[0], foreign_ex, foreign_ob, 'recheck', seed, side)
+            cached = rate_memo.get(key)
+            if cached is not None:
+                rate = cached[0]
+            else:
+                rate = calc_side_rate(korean_obs[0], foreign_ob, seed, side)
+                rate_memo.put(key, (rate,))
+            if rate is not None:
+                break
+        return rate
+
     @staticmethod
     async def exit_position(korean_ex: KoreanExchange, foreign_ex: ForeignExchange, ticker: str, size: float):
         '''
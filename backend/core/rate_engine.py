@@ -0,0 +1,371 @@
+"""
+호가창 누적합(prefix-sum) 기반 환율 계산 엔진.
+
+호가창 한 면(ask 또는 bid)마다 누적 체결금액/누적 수량 배열을 한 번만 만들어두고,
+모든 시드금액을 np.searchsorted 한 번으로 동시에 해석합니다.
+레벨을 시드마다 순회하던 기존 방식(시드 100개 x 4면)을 대체합니다.
+"""
+from bisect import bisect_left
+import numpy as np
+from backend.exchanges.orderbook import OrderbookSnapshot
+
+# 기본 시드 그리드 (KRW) : 100만원 ~ 1억원, 100만원 단위
+DEFAULT_SEEDS = np.arange(1_000_000, 100_000_001, 1_000_000, dtype=np.float64)
+
+
+class DepthLadder:
+    """
+    호가창 한 면의 누적합 배열.
+
+    cum_quote[i], cum_size[i]는 0 ~ i-1 레벨을 모두 체결했을 때의 누적 체결금액/수량이며,
+    맨 앞에 0을 포함하므로 길이는 레벨 수 + 1 입니다.
+    """
+    __slots__ = ("prices", "cum_quote", "cum_size")
+
+    def __init__(self, prices, sizes):
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        self.prices = prices
+        self.cum_quote = np.concatenate(([0.0], np.cumsum(prices * sizes)))
+        self.cum_size = np.concatenate(([0.0], np.cumsum(sizes)))
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def total_quote(self) -> float:
+        return float(self.cum_quote[-1])
+
+    @property
+    def total_size(self) -> float:
+        return float(self.cum_size[-1])
+
+    def size_for_quote(self, quotes):
+        """
+        quotes(체결금액)만큼 호가창을 소진할 때 체결되는 수량을 계산합니다.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (체결수량, 호가창 소진 여부)
+        """
+        quotes = np.asarray(quotes, dtype=np.float64)
+        n = len(self.prices)
+        if n == 0:
+            return np.zeros_like(quotes), quotes > 0
+        # 완전히 소진되는 레벨 수
+        k = np.searchsorted(self.cum_quote[1:], quotes, side="right")
+        # 누적 체결금액과 정확히 같으면 마지막 레벨까지 체결된 것으로 봄 (소진 아님)
+        exhausted = quotes > self.cum_quote[-1]
+        level = np.minimum(k, n - 1)
+        partial = np.where(exhausted, 0.0, (quotes - self.cum_quote[k]) / self.prices[level])
+        return self.cum_size[k] + partial, exhausted
+
+    def quote_for_size(self, sizes):
+        """
+        sizes(수량)만큼 호가창을 소진할 때 필요한 체결금액을 계산합니다.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (체결금액, 호가창 소진 여부)
+        """
+        sizes = np.asarray(sizes, dtype=np.float64)
+        n = len(self.prices)
+        if n == 0:
+            return np.zeros_like(sizes), sizes > 0
+        k = np.searchsorted(self.cum_size[1:], sizes, side="right")
+        exhausted = sizes > self.cum_size[-1]
+        level = np.minimum(k, n - 1)
+        partial = np.where(exhausted, 0.0, (sizes - self.cum_size[k]) * self.prices[level])
+        return self.cum_quote[k] + partial, exhausted
+
+    def levels_for_quote(self, quote: float) -> int:
+        """
+        quote(체결금액)를 채우기 위해 필요한 호가 레벨 수.
+        호가창이 소진되면 레벨 수 + 1 을 반환합니다.
+        """
+        if quote <= 0:
+            return 0
+        return int(np.searchsorted(self.cum_quote[1:], quote, side="left")) + 1
+
+    def levels_for_size(self, size: float) -> int:
+        """
+        size(수량)를 채우기 위해 필요한 호가 레벨 수.
+        호가창이 소진되면 레벨 수 + 1 을 반환합니다.
+        """
+        if size <= 0:
+            return 0
+        return int(np.searchsorted(self.cum_size[1:], size, side="left")) + 1
+
+
+def _side_arrays(orderbook, side: str):
+    """
+    오더북에서 한 면의 가격/수량 배열을 추출합니다.
+    OrderbookSnapshot은 배열을 그대로 사용하고, 레거시 dict 오더북은 레벨을 순회하여 변환합니다.
+    """
+    if isinstance(orderbook, OrderbookSnapshot):
+        return orderbook.side(side)
+    units = orderbook["orderbook"]
+    prices = np.fromiter((unit[f"{side}_price"] for unit in units), dtype=np.float64, count=len(units))
+    sizes = np.fromiter((unit[f"{side}_size"] for unit in units), dtype=np.float64, count=len(units))
+    return prices, sizes
+
+
+def round_rates(seeds, quotes, valid) -> np.ndarray:
+    """
+    seed / quote 환율을 소수점 2째자리에서 반올림(ROUND_HALF_UP)합니다.
+    계산할 수 없는 시드의 환율은 NaN 입니다.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.floor(np.asarray(seeds) / quotes * 100 + 0.5) / 100
+    return np.where(valid, rates, np.nan)
+
+
+class RateLadder:
+    """
+    시드 오름차순으로 정렬된 진입/종료 환율 배열 (불변).
+
+    한 티커의 계산 결과를 같은 태스크의 모든 유저가 공유하며,
+    lookup(seed)은 이분탐색으로 seed 이상인 첫 번째 시드의 환율을 찾습니다.
+    계산할 수 없는 환율은 배열에 NaN으로, dict 변환 시 None으로 표현됩니다.
+    수수료/펀딩비 반영 순환율(net_entry_rates, net_exit_rates)은 계산한 경우에만 포함됩니다.
+    """
+    __slots__ = ("seeds", "entry_rates", "exit_rates", "net_entry_rates", "net_exit_rates", "_seed_list")
+
+    def __init__(self, seeds, entry_rates, exit_rates, net_entry_rates=None, net_exit_rates=None):
+        arrays = {
+            "seeds": np.asarray(seeds, dtype=np.int64),
+            "entry_rates": np.asarray(entry_rates, dtype=np.float64),
+            "exit_rates": np.asarray(exit_rates, dtype=np.float64),
+            "net_entry_rates": None if net_entry_rates is None else np.asarray(net_entry_rates, dtype=np.float64),
+            "net_exit_rates": None if net_exit_rates is None else np.asarray(net_exit_rates, dtype=np.float64),
+        }
+        for name, array in arrays.items():
+            if array is not None:
+                array.setflags(write=False)
+            object.__setattr__(self, name, array)
+        object.__setattr__(self, "_seed_list", arrays["seeds"].tolist())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RateLadder is immutable")
+
+    def __reduce__(self):
+        return (RateLadder, (self.seeds, self.entry_rates, self.exit_rates, self.net_entry_rates, self.net_exit_rates))
+
+    def __len__(self):
+        return len(self._seed_list)
+
+    @property
+    def has_net(self) -> bool:
+        return self.net_entry_rates is not None
+
+    def __getitem__(self, index: int) -> dict:
+        item = {
+            'seed': self._seed_list[index],
+            'entry_ex_rate': _nan_to_none(float(self.entry_rates[index])),
+            'exit_ex_rate': _nan_to_none(float(self.exit_rates[index]))
+        }
+        if self.has_net:
+            item['net_entry_ex_rate'] = _nan_to_none(float(self.net_entry_rates[index]))
+            item['net_exit_ex_rate'] = _nan_to_none(float(self.net_exit_rates[index]))
+        return item
+
+    def __iter__(self):
+        for index in range(len(self._seed_list)):
+            yield self[index]
+
+    def __repr__(self):
+        return f"RateLadder(size={len(self)}, net={self.has_net})"
+
+    def lookup(self, seed: float) -> dict | None:
+        """
+        seed 이상인 첫 번째 시드의 환율 정보를 반환합니다. 없으면 None.
+
+        Returns:
+            dict | None: {'seed', 'entry_ex_rate', 'exit_ex_rate'} (+ 'net_entry_ex_rate', 'net_exit_ex_rate')
+        """
+        index = bisect_left(self._seed_list, seed)
+        if index >= len(self._seed_list):
+            return None
+        return self[index]
+
+    def to_list(self) -> list[dict]:
+        columns = [self._seed_list, self.entry_rates.tolist(), self.exit_rates.tolist()]
+        keys = ['seed', 'entry_ex_rate', 'exit_ex_rate']
+        if self.has_net:
+            columns += [self.net_entry_rates.tolist(), self.net_exit_rates.tolist()]
+            keys += ['net_entry_ex_rate', 'net_exit_ex_rate']
+        return [
+            {key: _nan_to_none(value) for key, value in zip(keys, row)}
+            for row in zip(*columns)
+        ]
+
+
+def _nan_to_none(value):
+    return None if value != value else value
+
+
+def json_default(obj):
+    """
+    json.dumps(default=...)용 변환 함수 ~ RateLadder를 기존 ex_rates 리스트 형태로 직렬화
+    """
+    if isinstance(obj, RateLadder):
+        return obj.to_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _pair_ladders(korean_ob, foreign_ob):
+    """
+    한국/해외 오더북 두 개로 (한국 ask, 한국 bid, 해외 bid, 해외 ask) 누적합 배열을 만듭니다.
+    """
+    return (
+        DepthLadder(*_side_arrays(korean_ob, "ask")),
+        DepthLadder(*_side_arrays(korean_ob, "bid")),
+        DepthLadder(*_side_arrays(foreign_ob, "bid")),
+        DepthLadder(*_side_arrays(foreign_ob, "ask")),
+    )
+
+
+def _rate_ladder(kr_ask: DepthLadder, kr_bid: DepthLadder, fr_bid: DepthLadder, fr_ask: DepthLadder, seeds,
+                 net_factors: tuple[float, float] | None = None) -> RateLadder:
+    seeds = np.asarray(seeds, dtype=np.float64)
+
+    # === 포지션 진입 시 환율 계산 ===
+    entry_size, kr_exhausted = kr_ask.size_for_quote(seeds)
+    entry_quote, fr_exhausted = fr_bid.quote_for_size(entry_size)
+    entry_valid = (entry_size > 0) & (entry_quote > 0) & ~kr_exhausted & ~fr_exhausted
+
+    # === 포지션 종료 시 환율 계산 ===
+    exit_size, kr_exhausted = kr_bid.size_for_quote(seeds)
+    exit_quote, fr_exhausted = fr_ask.quote_for_size(exit_size)
+    exit_valid = (exit_quote > 0) & ~kr_exhausted & ~fr_exhausted
+
+    net_entry_rates = net_exit_rates = None
+    if net_factors is not None:
+        # 순환율 = 원시 환율 x 계수 ~ 반올림 전 값에 계수를 적용
+        entry_factor, exit_factor = net_factors
+        net_entry_rates = round_rates(seeds * entry_factor, entry_quote, entry_valid)
+        net_exit_rates = round_rates(seeds * exit_factor, exit_quote, exit_valid)
+
+    return RateLadder(
+        seeds,
+        round_rates(seeds, entry_quote, entry_valid),
+        round_rates(seeds, exit_quote, exit_valid),
+        net_entry_rates,
+        net_exit_rates
+    )
+
+
+def _foreign_size_for_quote(ladder: DepthLadder, quote: float) -> float:
+    """
+    한국거래소 한 면에서 quote(체결금액)만큼 체결할 때의 수량 ~ 해외거래소 필요 레벨 수 계산용.
+    한국 호가창이 먼저 소진되어도 해외거래소 필요 깊이가 줄어들지 않도록, 남은 금액은 마지막 호가 가격으로 환산합니다.
+    """
+    sizes, exhausted = ladder.size_for_quote([quote])
+    size = float(sizes[0])
+    if exhausted[0] and len(ladder):
+        size += (quote - ladder.total_quote) / float(ladder.prices[-1])
+    return size
+
+
+def _liquidity(kr_ask: DepthLadder, kr_bid: DepthLadder, fr_bid: DepthLadder, fr_ask: DepthLadder, max_seed: float) -> dict:
+    # 진입 한도 : 한국 ask와 해외 bid 중 수량이 적은 쪽까지 체결했을 때의 한국 체결금액
+    entry_quote, _ = kr_ask.quote_for_size([min(kr_ask.total_size, fr_bid.total_size)])
+    exit_quote, _ = kr_bid.quote_for_size([min(kr_bid.total_size, fr_ask.total_size)])
+
+    # 최대 시드를 채우는 데 필요한 레벨 수 (소진 시 받은 레벨 수 + 1)
+    # 해외거래소 레벨 수는 한국 호가창 소진 여부와 별도로 최대 시드의 수량 기준으로 계산
+    entry_size = _foreign_size_for_quote(kr_ask, max_seed)
+    exit_size = _foreign_size_for_quote(kr_bid, max_seed)
+    return {
+        'entry_ceiling': float(entry_quote[0]),
+        'exit_ceiling': float(exit_quote[0]),
+        'korean_levels': max(kr_ask.levels_for_quote(max_seed), kr_bid.levels_for_quote(max_seed)),
+        'foreign_levels': max(fr_bid.levels_for_size(entry_size), fr_ask.levels_for_size(exit_size)),
+    }
+
+
+def calc_rate_ladder(korean_ob: OrderbookSnapshot, foreign_ob: OrderbookSnapshot, seeds=DEFAULT_SEEDS) -> RateLadder:
+    """
+    한국거래소/해외거래소 오더북으로 시드별 진입/종료 환율을 일괄 계산합니다.
+
+    진입: 한국거래소 매수(ask 소진) → 같은 수량만큼 해외거래소 매도(bid 소진)
+    종료: 한국거래소 매도(bid 소진) → 같은 수량만큼 해외거래소 매수(ask 소진)
+    어느 한쪽이라도 호가창이 모두 소진되면 해당 시드의 환율은 None 입니다.
+
+    Args:
+        korean_ob (OrderbookSnapshot): 한국거래소 오더북 (레거시 dict 오더북도 허용)
+        foreign_ob (OrderbookSnapshot): 해외거래소 오더북 (레거시 dict 오더북도 허용)
+        seeds: 오름차순 시드금액(KRW) 배열
+
+    Returns:
+        RateLadder: 시드별 진입/종료 환율
+    """
+    return _rate_ladder(*_pair_ladders(korean_ob, foreign_ob), seeds)
+
+
+def calc_rate_ladder_with_liquidity(korean_ob: OrderbookSnapshot, foreign_ob: OrderbookSnapshot, seeds=DEFAULT_SEEDS,
+                                    net_factors: tuple[float, float] | None = None) -> tuple[RateLadder, dict]:
+    """
+    calc_rate_ladder와 같은 누적합 배열로 티커의 체결 가능 한도(liquidity ceiling)도 함께 계산합니다.
+    net_factors(backend.core.costs.net_factors)를 주면 수수료/펀딩비 반영 순환율도 함께 계산합니다.
+
+    Returns:
+        tuple[RateLadder, dict]: (시드별 환율, 유동성 정보)
+            유동성 정보 : {
+                'entry_ceiling': 받은 호가창으로 진입 가능한 최대 시드금액 (KRW),
+                'exit_ceiling': 받은 호가창으로 종료 가능한 최대 시드금액 (KRW),
+                'korean_levels': 최대 시드를 채우는 데 필요한 한국거래소 호가 레벨 수,
+                'foreign_levels': 최대 시드를 채우는 데 필요한 해외거래소 호가 레벨 수
+            }
+            받은 호가창이 최대 시드를 채우지 못하면 레벨 수는 받은 레벨 수 + 1 입니다.
+    """
+    ladders = _pair_ladders(korean_ob, foreign_ob)
+    seeds = np.asarray(seeds, dtype=np.float64)
+    max_seed = float(seeds[-1]) if len(seeds) else 0.0
+    return _rate_ladder(*ladders, seeds, net_factors), _liquidity(*ladders, max_seed)
+
+
+def calc_ex_rates(korean_ob: OrderbookSnapshot, foreign_ob: OrderbookSnapshot, seeds=DEFAULT_SEEDS) -> list[dict]:
+    """
+    calc_rate_ladder 결과를 [{'seed', 'entry_ex_rate', 'exit_ex_rate'}, ...] 리스트로 반환합니다.
+    """
+    return calc_rate_ladder(korean_ob, foreign_ob, seeds).to_list()
+
+
+def calc_ex_rate(korean_ob: OrderbookSnapshot, foreign_ob: OrderbookSnapshot, seed: float) -> dict:
+    """
+    임의의 시드금액 하나에 대한 진입/종료 환율을 정확히 계산합니다.
+    그리드에 없는 실제 주문금액(entry_seed)의 환율이 필요할 때 사용합니다.
+
+    Returns:
+        dict: {'seed', 'entry_ex_rate', 'exit_ex_rate'}
+    """
+    return calc_rate_ladder(korean_ob, foreign_ob, [seed])[0]
+
+
+# 포지션 방향별로 필요한 오더북 면 : (한국거래소 면, 해외거래소 면)
+RATE_SIDES = {
+    'entry': ("ask", "bid"),
+    'exit': ("bid", "ask"),
+}
+
+
+def calc_side_rate(korean_ob: OrderbookSnapshot, foreign_ob: OrderbookSnapshot, seed: float, side: str) -> float | None:
+    """
+    시드 하나, 방향 하나(진입 또는 종료)의 환율만 계산합니다.
+    필요한 오더북 두 면만 누적합을 만들기 때문에 주문 직전 재확인에 사용합니다.
+
+    Args:
+        seed (float): 시드금액 (KRW)
+        side (str): 'entry' 또는 'exit'
+
+    Returns:
+        float | None: 환율, 호가창이 소진되어 계산할 수 없으면 None
+    """
+    if side not in RATE_SIDES:
+        raise ValueError("Invalid side: must be 'entry' or 'exit'")
+    kr_side, fr_side = RATE_SIDES[side]
+    seeds = np.asarray([seed], dtype=np.float64)
+    size, kr_exhausted = DepthLadder(*_side_arrays(korean_ob, kr_side)).size_for_quote(seeds)
+    quote, fr_exhausted = DepthLadder(*_side_arrays(foreign_ob, fr_side)).quote_for_size(size)
+    valid = (size > 0) & (quote > 0) & ~kr_exhausted & ~fr_exhausted
+    rate = float(round_rates(seeds, quote, valid)[0])
+    return None if rate != rate else rate
@@ -0,0 +1,68 @@
+import logging
+import os
+from cachetools import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class RateMemo:
+    """
+    오더북 타임스탬프 기반 환율 계산 결과 메모이제이션 (LRU).
+
+    키는 (한국거래소, 한국 오더북 ts, 한국 호가 수, 해외거래소, 해외 오더북 ts, 해외 호가 수, 코인, ...) 형태이며,
+    두 오더북이 모두 바뀌지 않았으면 이전 사이클(또는 같은 사이클의 메인 계산)의 결과를 그대로 반환합니다.
+    타임스탬프를 제공하지 않는 거래소의 오더북은 메모하지 않습니다.
+    호가 수를 키에 넣어, 타임스탬프가 같아도 더 깊게 다시 조회한 오더북(DepthController 증가)은 새로 계산합니다.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._cache = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(korean_ex: str, korean_ob, foreign_ex: str, foreign_ob, *extra):
+        """
+        메모 키를 생성합니다. 어느 한쪽 오더북이라도 타임스탬프가 없으면 None.
+        """
+        if korean_ob.timestamp is None or foreign_ob.timestamp is None:
+            return None
+        return (
+            korean_ex, korean_ob.timestamp, len(korean_ob.ask_prices), len(korean_ob.bid_prices),
+            foreign_ex, foreign_ob.timestamp, len(foreign_ob.ask_prices), len(foreign_ob.bid_prices),
+            korean_ob.ticker, *extra
+        )
+
+    def get(self, key):
+        if key is None:
+            self.misses += 1
+            return None
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key is not None:
+            self._cache[key] = value
+
+    def stats(self) -> dict:
+        """
+        누적 적중 통계 ~ {'hits', 'misses', 'hit_rate', 'size'}
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._cache)
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+
+rate_memo = RateMemo(int(os.getenv("RATE_MEMO_SIZE", 4096)))
@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 시드 그리드 모드
+# - linear : SEED_GRID_MIN ~ SEED_GRID_MAX, SEED_GRID_STEP 간격 (기존 100만원 단위 100개)
+# - log : SEED_GRID_MIN ~ SEED_GRID_MAX 구간을 SEED_GRID_COUNT개로 로그 분할 + 활성 전략들의 실제 진입시드
+# - strategies : 활성 전략들의 실제 진입시드(seed_amount / seed_division)만 계산
+SEED_GRID_MODES = ("linear", "log", "strategies")
+
+
+def seed_grid_mode() -> str:
+    """
+    SEED_GRID_MODE 환경변수 값 (알 수 없는 값이면 linear)
+    """
+    mode = os.getenv("SEED_GRID_MODE", "linear").lower()
+    if mode not in SEED_GRID_MODES:
+        logger.warning(f"Unknown SEED_GRID_MODE: {mode}, linear 모드로 대체합니다.")
+        return "linear"
+    return mode
+
+
+class SeedGrid:
+    """
+    환율을 계산할 시드금액(KRW) 목록.
+
+    시드는 중복 없이 오름차순으로 정렬된 읽기 전용 배열로 보관하며,
+    version은 시드 구성이 같으면 항상 같은 값이므로 캐시 키로 사용할 수 있습니다.
+    """
+    __slots__ = ("seeds", "version")
+
+    def __init__(self, seeds):
+        values = sorted({int(seed) for seed in seeds if seed and seed > 0})
+        self.seeds = np.asarray(values, dtype=np.float64)
+        self.seeds.setflags(write=False)
+        self.version = hashlib.sha1(",".join(map(str, values)).encode()).hexdigest()[:12]
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def __iter__(self):
+        return iter(self.seeds.astype(np.int64).tolist())
+
+    def __repr__(self):
+        return f"SeedGrid(size={len(self)}, version={self.version!r})"
+
+    @classmethod
+    def linear(cls, start: int = 1_000_000, stop: int = 100_000_000, step: int = 1_000_000):
+        """
+        start ~ stop(포함) 구간을 step 간격으로 나눈 그리드
+        """
+        return cls(range(start, stop + 1, step))
+
+    @classmethod
+    def log_spaced(cls, start: int = 1_000_000, stop: int = 100_000_000, count: int = 25, round_to: int = 10_000):
+        """
+        start ~ stop 구간을 로그 간격으로 count개 나눈 그리드.
+        소액 구간은 촘촘하게, 고액 구간은 듬성듬성하게 계산합니다.
+        """
+        seeds = np.geomspace(start, stop, num=count)
+        return cls(np.round(seeds / round_to) * round_to)
+
+    @classmethod
+    def from_strategies(cls, strategies):
+        """
+        활성 전략들의 실제 진입시드로 그리드를 만듭니다.
+
+        Args:
+            strategies: [{'seed_amount', 'seed_division'}, ...] 또는 (seed_amount, seed_division) 튜플 목록
+        """
+        seeds = []
+        for strategy in strategies:
+            if isinstance(strategy, dict):
+                seed_amount, seed_division = strategy.get('seed_amount'), strategy.get('seed_division')
+            else:
+                seed_amount, seed_division = strategy
+            if not seed_amount or not seed_division:
+                continue
+            # process_user의 entry_seed 계산식과 동일
+            seeds.append(int(seed_amount / seed_division))
+        return cls(seeds)
+
+    @classmethod
+    def from_env(cls, get_strategies=None):
+        """
+        환경변수 설정으로 그리드를 생성합니다.
+
+        Args:
+            get_strategies (callable | None): strategies/log 모드에서 활성 전략 목록을 반환하는 함수
+                (log 모드는 간격이 넓으므로 실제 진입시드를 그리드에 넣어 주문 금액 그대로의 환율을 계산)
+        """
+        mode = seed_grid_mode()
+        start = int(os.getenv("SEED_GRID_MIN", 1_000_000))
+        stop = int(os.getenv("SEED_GRID_MAX", 100_000_000))
+
+        strategy_grid = None
+        if mode in ("strategies", "log") and get_strategies is not None:
+            strategy_grid = cls.from_strategies(get_strategies())
+        if mode == "strategies" and strategy_grid is not None:
+            if len(strategy_grid):
+                return strategy_grid
+            # 활성 전략이 없으면 클라이언트 표시용으로 로그 그리드를 사용
+            mode = "log"
+
+        if mode == "log":
+            grid = cls.log_spaced(start, stop, int(os.getenv("SEED_GRID_COUNT", 25)))
+            if strategy_grid is not None and len(strategy_grid):
+                grid = cls([*grid, *strategy_grid])
+            return grid
+        return cls.linear(start, stop, int(os.getenv("SEED_GRID_STEP", 1_000_000)))
+
+
+DEFAULT_SEED_GRID = SeedGrid.linear()
@@ -0,0 +1,185 @@
+import bisect
+import hashlib
+import logging
+import os
+import socket
+import time
+
+from backend.utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+SHARD_QUEUE_PREFIX = "shard."
+# 코인을 워커별 큐에 고정 배정할지 여부 (스케줄러/마켓데이터 데몬/워커 공통)
+SHARDING_ENABLED = env_flag("SHARDING_ENABLED")
+
+
+def shard_queue(name: str | None = None) -> str:
+    """
+    워커 인스턴스 전용 큐 이름 ~ WORKER_SHARD(기본값: 호스트 이름) 기준
+    """
+    return f"{SHARD_QUEUE_PREFIX}{name or os.getenv('WORKER_SHARD') or socket.gethostname()}"
+
+
+def _hash(key: str) -> int:
+    # 파이썬 hash()는 프로세스마다 달라지므로 고정 해시 사용
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    일관된 해싱(consistent hashing) 링.
+
+    노드마다 replicas개의 가상 노드를 링에 배치하고, 키는 해시값 다음에 오는 가상 노드의 노드에 배정합니다.
+    노드가 추가/제거되어도 해당 노드 몫의 키만 옮겨가므로 나머지 워커의 배정(캐시/구독)은 유지됩니다.
+    """
+
+    def __init__(self, nodes=(), replicas: int = 100):
+        self.replicas = replicas
+        self.nodes = sorted(set(nodes))
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> str | None:
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+    def assign(self, tickers: list[tuple]) -> dict[str, list[tuple]]:
+        """
+        (korean_ex, foreign_ex, coin_symbol) 튜플을 코인 기준으로 노드에 배정합니다.
+        한 코인의 모든 거래소 조합은 같은 노드로 갑니다.
+
+        Returns:
+            dict: {노드: [tuple]}
+        """
+        assigned = {}
+        for ticker in tickers:
+            node = self.node_for(ticker[2])
+            assigned.setdefault(node, []).append(tuple(ticker))
+        return assigned
+
+
+class ShardDirectory:
+    """
+    Celery inspect API로 살아있는 워커의 샤드 큐(shard.*)와 큐별 동시 처리 수를 조회하여 링을 유지합니다.
+
+    조회 결과는 ttl초 동안 재사용하고, 샤드 구성이 바뀌면(워커 추가/종료) 링을 다시 만듭니다.
+    조회에 실패하거나 샤드가 하나도 없으면 기본 큐로 발행합니다. (모든 워커가 기본 큐도 구독)
+    ttl 사이에 워커가 종료되어도 작업이 주인 없는 큐에 쌓이지 않도록, 발행할 때마다 브로커에 샤드 큐의
+    consumer 수를 확인하여(passive declare) consumer가 없는 큐의 코인은 기본 큐로 보냅니다.
+    """
+
+    def __init__(self, app, ttl: float = 60.0, timeout: float = 1.0, replicas: int = 100):
+        self.app = app
+        self.ttl = ttl
+        self.timeout = timeout
+        self.replicas = replicas
+        self.ring = HashRing(replicas=replicas)
+        self._slots: dict[str, int] = {}  # {샤드 큐: 동시 처리 수}
+        self._checked_at = float("-inf")
+
+    def _inspect(self) -> dict[str, int] | None:
+        inspect = self.app.control.inspect(timeout=self.timeout)
+        active_queues = inspect.active_queues()
+        if not active_queues:
+            return None
+        stats = inspect.stats() or {}
+        shards = {}
+        for worker, queues in active_queues.items():
+            concurrency = int(stats.get(worker, {}).get("pool", {}).get("max-concurrency", 1))
+            for queue in queues:
+                name = queue.get("name", "")
+                if name.startswith(SHARD_QUEUE_PREFIX):
+                    shards[name] = shards.get(name, 0) + concurrency
+        return shards
+
+    def shards(self) -> dict[str, int]:
+        """
+        살아있는 샤드 큐와 큐별 동시 처리 수를 반환합니다.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.ttl:
+            return self._slots
+        self._checked_at = now
+        try:
+            shards = self._inspect()
+        except Exception as e:
+            logger.warning(f"Celery 샤드 큐 조회 실패: {e}")
+            shards = None
+        if shards is None:
+            # 응답이 없으면 마지막 구성의 워커가 살아있는지 알 수 없으므로 기본 큐로 발행
+            self._slots = {}
+            return self._slots
+        self.update(shards)
+        return self._slots
+
+    def update(self, shards: dict[str, int]):
+        if sorted(shards) != self.ring.nodes:
+            joined = sorted(set(shards) - set(self.ring.nodes))
+            left = sorted(set(self.ring.nodes) - set(shards))
+            logger.info(f"샤드 재배치: {len(shards)}개 샤드 (추가: {joined}, 제거: {left})")
+            self.ring = HashRing(shards, replicas=self.replicas)
+        self._slots = shards
+
+    def route(self, tickers: list[tuple]) -> list[tuple[str | None, int | None, list[tuple]]]:
+        """
+        티커를 샤드 큐별로 나눕니다.
+
+        Returns:
+            list: [(샤드 큐, 큐의 동시 처리 수, [tuple])] ~ 샤드가 없으면 [(None, None, tickers)]
+        """
+        shards = self.shards()
+        if not shards:
+            return [(None, None, list(tickers))]
+        live = self.live_queues(shards)
+        routes, orphaned = [], []
+        for queue, pairs in self.ring.assign(tickers).items():
+            if live is not None and queue not in live:
+                orphaned.extend(pairs)
+            else:
+                routes.append((queue, shards[queue], pairs))
+        if orphaned:
+            # 담당 워커가 종료됨 ~ 다음 조회 전까지 기본 큐로 발행
+            logger.warning(f"consumer가 없는 샤드 큐: {sorted(set(shards) - live)}, {len(orphaned)}개 조합을 기본 큐로 발행")
+            self.invalidate()
+            routes.append((None, None, orphaned))
+        return routes
+
+    def live_queues(self, queues) -> set[str] | None:
+        """
+        브로커에서 consumer가 있는 큐만 반환합니다. 확인할 수 없으면 None.
+        """
+        try:
+            live = set()
+            with self.app.connection_for_write() as conn:
+                for queue in queues:
+                    # 없는 큐를 passive declare하면 채널이 닫히므로 큐마다 새 채널 사용
+                    channel = conn.channel()
+                    try:
+                        _, _, consumers = channel.queue_declare(queue=queue, passive=True)
+                        if consumers:
+                            live.add(queue)
+                    except Exception:
+                        pass
+                    finally:
+                        try:
+                            channel.close()
+                        except Exception:
+                            pass
+            return live
+        except Exception as e:
+            logger.warning(f"샤드 큐 consumer 확인 실패: {e}")
+            return None
+
+    def invalidate(self):
+        """
+        다음 route()에서 샤드 구성을 다시 조회하도록 합니다. (발행 실패, 담당 워커 종료 시)
+        """
+        self._checked_at = float("-inf")
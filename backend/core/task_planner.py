@@ -0,0 +1,160 @@
+import heapq
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# 워커가 태스크 처리 후 요청별 소요 시간(초)을 기록하는 Redis 해시 키
+# 필드는 코인(해당 코인 해외거래소 오더북 조회 시간 합) 또는 korean:{거래소}(한국거래소 일괄 조회 시간)
+TASK_LATENCY_KEY = "task_latency"
+KOREAN_LATENCY_PREFIX = "korean:"
+
+
+def request_cost(pairs: list[tuple]) -> int:
+    """
+    한 코인의 (korean_ex, foreign_ex, coin_symbol) 목록에 대한 코인별 거래소 요청 수. (해외거래소 (거래소, 코인)마다 한 번)
+    한국거래소는 거래소당 한 번에 여러 코인을 조회하므로 코인이 아니라 태스크 단위로 셉니다. (TaskPlanner.overhead)
+    """
+    return len({(pair[1], pair[2]) for pair in pairs})
+
+
+class TaskPlanner:
+    """
+    스케줄러가 한 사이클의 티커를 Celery 태스크로 나누는 방법을 정합니다.
+
+    코인별 예상 처리 시간(워커가 기록한 코인별 해외 오더북 조회 시간의 지수이동평균, 없으면 요청 수 x request_seconds)으로
+    코인을 가장 한가한 태스크부터 채우는 방식(LPT)으로 나눕니다. 한국거래소 일괄 조회 시간은 태스크마다 한 번 더합니다. 태스크 수는 예상 최대 처리 시간이 deadline 안에
+    들어오는 가장 작은 값으로 정하여 브로커 메시지를 최소로 하되, 살아있는 워커 슬롯 수를 넘지 않습니다.
+    (슬롯보다 많은 태스크는 대기열에서 순서대로 처리되므로 사이클 시간을 줄이지 못함)
+    한 코인의 모든 거래소 조합은 항상 같은 태스크에 들어갑니다. (batch_tickers_by_coin과 동일)
+    """
+
+    def __init__(self, request_seconds: float = 0.15, deadline: float = 10.0, smoothing: float = 0.3):
+        self.request_seconds = request_seconds
+        self.deadline = deadline
+        self.smoothing = smoothing
+        self.latency: dict[str, float] = {}  # {coin_symbol: 예상 처리 시간(초)}
+        self.korean_latency: dict[str, float] = {}  # {한국거래소: 일괄 조회 예상 시간(초)}
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(TASK_PLANNER_REQUEST_SECONDS, TASK_PLANNER_DEADLINE, TASK_PLANNER_SMOOTHING)로 생성합니다.
+        """
+        return cls(
+            request_seconds=float(os.getenv("TASK_PLANNER_REQUEST_SECONDS", 0.15)),
+            deadline=float(os.getenv("TASK_PLANNER_DEADLINE", 10.0)),
+            smoothing=float(os.getenv("TASK_PLANNER_SMOOTHING", 0.3)),
+        )
+
+    def observe(self, latencies: dict[str, float]):
+        """
+        워커가 기록한 코인별/한국거래소별 처리 시간을 반영합니다.
+        """
+        for field, seconds in latencies.items():
+            seconds = float(seconds)
+            if field.startswith(KOREAN_LATENCY_PREFIX):
+                table, key = self.korean_latency, field[len(KOREAN_LATENCY_PREFIX):]
+            else:
+                table, key = self.latency, field
+            previous = table.get(key)
+            table[key] = seconds if previous is None else previous + self.smoothing * (seconds - previous)
+
+    def estimate(self, coin: str, pairs: list[tuple]) -> float:
+        """
+        코인 하나(의 모든 거래소 조합)의 예상 처리 시간(초)
+        """
+        seconds = self.latency.get(coin)
+        if seconds is None:
+            seconds = request_cost(pairs) * self.request_seconds
+        return seconds
+
+    def overhead(self, tickers: list[tuple]) -> float:
+        """
+        태스크마다 한 번씩 드는 한국거래소 일괄 조회 예상 시간(초)
+        """
+        return sum(self.korean_latency.get(venue, self.request_seconds) for venue in {ticker[0] for ticker in tickers})
+
+    @staticmethod
+    def _pack(coins: dict[str, list[tuple]], estimates: dict[str, float], count: int, overhead: float = 0.0):
+        # LPT ~ 오래 걸리는 코인부터 현재 예상 시간이 가장 작은 태스크에 배정
+        heap = [(overhead, index) for index in range(count)]
+        batches = [[] for _ in range(count)]
+        loads = [overhead] * count
+        for coin in sorted(coins, key=estimates.get, reverse=True):
+            load, index = heapq.heappop(heap)
+            batches[index].extend(coins[coin])
+            loads[index] = load + estimates[coin]
+            heapq.heappush(heap, (loads[index], index))
+        return batches, loads
+
+    def plan(self, tickers: list[tuple], slots: int) -> list[list[tuple]]:
+        """
+        티커를 태스크 단위로 나눕니다.
+
+        Args:
+            tickers: (korean_ex, foreign_ex, coin_symbol) 튜플 리스트
+            slots: 살아있는 워커의 동시 처리 수 합계
+
+        Returns:
+            list[list[tuple]]: 태스크별 티커 리스트 (예상 시간이 큰 태스크부터)
+        """
+        coins = {}  # {coin_symbol: [tuple]} ~ 입력 순서 유지
+        for ticker in tickers:
+            coins.setdefault(ticker[2], []).append(tuple(ticker))
+        if not coins:
+            return []
+
+        estimates = {coin: self.estimate(coin, pairs) for coin, pairs in coins.items()}
+        total = sum(estimates.values())
+        overhead = self.overhead(tickers)
+        limit = max(1, min(slots, len(coins)))
+        budget = self.deadline - overhead
+        count = max(1, min(limit, math.ceil(total / budget))) if budget > 0 else limit
+        while True:
+            batches, loads = self._pack(coins, estimates, count, overhead)
+            if max(loads) <= self.deadline or count >= limit:
+                break
+            count += 1
+
+        if max(loads) > self.deadline:
+            logger.warning(f"태스크 예상 처리 시간 {max(loads):.1f}초가 마감 {self.deadline}초를 넘습니다 "
+                           f"(워커 슬롯 {slots}개, 예상 합계 {total:.1f}초)")
+        logger.debug(f"태스크 계획: {count}개 태스크, 예상 최대 {max(loads):.2f}초, 합계 {total:.2f}초")
+        order = sorted(range(count), key=loads.__getitem__, reverse=True)
+        return [batches[index] for index in order]
+
+
+class WorkerCapacity:
+    """
+    Celery inspect API로 살아있는 워커의 동시 처리 수(슬롯) 합계를 조회합니다.
+    inspect는 브로드캐스트 후 응답을 기다리므로 ttl초 동안 결과를 재사용하고,
+    응답이 없으면 마지막 값(없으면 fallback)을 사용합니다.
+    """
+
+    def __init__(self, app, ttl: float = 60.0, timeout: float = 1.0, fallback: int = 1):
+        self.app = app
+        self.ttl = ttl
+        self.timeout = timeout
+        self.fallback = fallback
+        self._slots = None
+        self._checked_at = float("-inf")
+
+    def slots(self) -> int:
+        now = time.monotonic()
+        if self._slots is not None and now - self._checked_at < self.ttl:
+            return self._slots
+        self._checked_at = now
+        try:
+            stats = self.app.control.inspect(timeout=self.timeout).stats() or {}
+            slots = sum(int(worker.get("pool", {}).get("max-concurrency", 1)) for worker in stats.values())
+        except Exception as e:
+            logger.warning(f"Celery 워커 조회 실패: {e}")
+            slots = 0
+        if slots > 0:
+            if slots != self._slots:
+                logger.info(f"살아있는 Celery 워커 슬롯: {slots}")
+            self._slots = slots
+        return self._slots or self.fallback
@@ -0,0 +1,127 @@
+import logging
+import os
+import zlib
+
+logger = logging.getLogger(__name__)
+
+HOT, WARM, COLD = "hot", "warm", "cold"
+_RANK = {COLD: 0, WARM: 1, HOT: 2}
+# 워커가 계산한 거래소 조합별 최신 환율 ~ {korean_ex}:{foreign_ex}:{coin} -> {entry_ex_rate, exit_ex_rate, usdt_price}
+LATEST_RATE_KEY = "latest_ex_rate"
+
+
+def threshold_distance(user: dict, rate: dict) -> float | None:
+    """
+    최신 환율이 유저 전략의 진입/종료 조건까지 남은 거리(비율). 이미 조건을 만족하면 0.
+
+    커스텀 매매 모드는 entry_rate(진입환율 이하)/exit_rate(종료환율 이상),
+    자동 매매 모드는 테더 가격의 99%(진입)를 기준으로 합니다. (자동 모드 종료는 보유 포지션 기준이므로 포지션으로 판단)
+    """
+    entry_ex_rate = rate.get("entry_ex_rate")
+    exit_ex_rate = rate.get("exit_ex_rate")
+    distances = []
+    if user.get("trade_mode") == "custom":
+        if entry_ex_rate and user.get("entry_rate"):
+            entry_rate = float(user["entry_rate"])
+            distances.append((entry_ex_rate - entry_rate) / entry_rate)
+        if exit_ex_rate and user.get("exit_rate"):
+            exit_rate = float(user["exit_rate"])
+            distances.append((exit_rate - exit_ex_rate) / exit_rate)
+    elif entry_ex_rate and rate.get("usdt_price"):
+        entry_rate = float(rate["usdt_price"]) * 0.99
+        distances.append((entry_ex_rate - entry_rate) / entry_rate)
+    if not distances:
+        return None
+    return max(0.0, min(distances))
+
+
+def selects(user: dict, coin: str) -> bool:
+    """
+    유저 전략이 해당 코인을 거래 대상으로 하는지 여부 (자동 코인 모드는 전체 코인)
+    """
+    return user.get("coin_mode") != "custom" or coin in (user.get("selected_coins") or [])
+
+
+class CoinTiering:
+    """
+    코인을 전략 노출도에 따라 hot/warm/cold로 나누고, 등급별 주기로 계산 대상을 고릅니다.
+
+    - hot: 열린 포지션이 있거나, 최신 환율이 해당 코인을 거래하는 유저의 진입/종료 조건에 hot_band 이내로 근접
+    - cold: 어떤 활성 전략도 선택하지 않았고, 열린 포지션이 없고, 모든 유저 조건에서 warm_band보다 멀리 떨어짐
+    - warm: 그 외 (최신 환율이 아직 없는 코인 포함)
+
+    스케줄러 사이클마다 hot은 hot_every, warm은 warm_every, cold는 cold_every 사이클에 한 번 계산합니다.
+    같은 등급의 코인은 코인별 고정 오프셋으로 사이클에 고르게 나눠 특정 사이클에 몰리지 않게 합니다.
+    """
+
+    def __init__(self, hot_band: float = 0.003, warm_band: float = 0.015, hot_every: int = 1, warm_every: int = 2,
+                 cold_every: int = 10):
+        self.hot_band = hot_band
+        self.warm_band = warm_band
+        self.every = {HOT: max(1, hot_every), WARM: max(1, warm_every), COLD: max(1, cold_every)}
+        self.cycle = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(TIER_HOT_BAND, TIER_WARM_BAND, TIER_HOT_EVERY, TIER_WARM_EVERY, TIER_COLD_EVERY)로 생성합니다.
+        """
+        return cls(
+            hot_band=float(os.getenv("TIER_HOT_BAND", 0.003)),
+            warm_band=float(os.getenv("TIER_WARM_BAND", 0.015)),
+            hot_every=int(os.getenv("TIER_HOT_EVERY", 1)),
+            warm_every=int(os.getenv("TIER_WARM_EVERY", 2)),
+            cold_every=int(os.getenv("TIER_COLD_EVERY", 10)),
+        )
+
+    def classify(self, tickers: list[tuple], users_by_pair: dict[tuple[str, str], list[dict]],
+                 open_coins: set[str], latest_rates: dict[str, dict]) -> dict[str, str]:
+        """
+        코인별 등급을 반환합니다.
+
+        Args:
+            tickers: (korean_ex, foreign_ex, coin_symbol) 튜플 리스트
+            users_by_pair: {(korean_ex, foreign_ex): get_users_with_both_exchanges_running_autotrading 결과}
+            open_coins: 열린 포지션이 있는 코인
+            latest_rates: {'{korean_ex}:{foreign_ex}:{coin}': 최신 환율}
+
+        Returns:
+            dict: {coin_symbol: 'hot' | 'warm' | 'cold'}
+        """
+        tiers = {}
+        for korean_ex, foreign_ex, coin in tickers:
+            if coin in open_coins:
+                tier = HOT
+            else:
+                users = [user for user in users_by_pair.get((korean_ex, foreign_ex), []) if selects(user, coin)]
+                rate = latest_rates.get(f"{korean_ex}:{foreign_ex}:{coin}")
+                distances = [] if rate is None else [
+                    d for d in (threshold_distance(user, rate) for user in users) if d is not None
+                ]
+                nearest = min(distances, default=None)
+                if nearest is not None and nearest <= self.hot_band:
+                    tier = HOT
+                elif rate is None or users or (nearest is not None and nearest <= self.warm_band):
+                    tier = WARM
+                else:
+                    tier = COLD
+            # 거래소 조합 중 가장 높은 등급
+            if _RANK[tier] > _RANK.get(tiers.get(coin), -1):
+                tiers[coin] = tier
+        return tiers
+
+    def due(self, coin: str, tier: str, cycle: int) -> bool:
+        every = self.every[tier]
+        return (cycle + zlib.crc32(coin.encode())) % every == 0
+
+    def select(self, tickers: list[tuple], tiers: dict[str, str]) -> list[tuple]:
+        """
+        이번 사이클에 계산할 티커를 고르고 사이클을 하나 진행합니다.
+        """
+        cycle = self.cycle
+        self.cycle += 1
+        selected = [ticker for ticker in tickers if self.due(ticker[2], tiers.get(ticker[2], WARM), cycle)]
+        counts = {tier: sum(1 for value in tiers.values() if value == tier) for tier in (HOT, WARM, COLD)}
+        logger.info(f"코인 등급 hot={counts[HOT]}, warm={counts[WARM]}, cold={counts[COLD]} "
+                    f"~ 이번 사이클 {len({t[2] for t in selected})}개 코인 계산")
+        return selected
@@ -0,0 +1,123 @@
+import logging
+import os
+import select
+import threading
+import time
+from typing import Callable
+
+import psycopg2
+import psycopg2.extensions
+
+from backend.utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+# upsert_tickers가 티커가 바뀐 트랜잭션에서 보내는 알림 채널
+TICKER_UNIVERSE_CHANNEL = "ticker_universe"
+# 다른 프로세스의 티커 갱신 알림을 LISTEN할지 여부 (스케줄러/마켓데이터 데몬 공통)
+UNIVERSE_LISTEN = env_flag("UNIVERSE_LISTEN", True)
+
+
+class TickerUniverse:
+    """
+    공통 진입가능 티커(거래 유니버스)를 메모리에 인덱싱해 두는 캐시.
+
+    fetch(get_common_tickers_from_db)는 invalidate()가 호출되었거나 max_age초가 지났을 때만 다시 실행합니다.
+    upsert_tickers가 실제로 티커를 바꾸면 같은 프로세스에서는 invalidate()를, 다른 프로세스에서는
+    Postgres LISTEN/NOTIFY(listen())로 알림을 받아 다음 get()에서 다시 읽습니다.
+    max_age는 알림을 놓쳤을 때의 안전장치입니다. 다시 읽은 결과가 비어 있으면(DB 에러 포함) 이전 유니버스를 유지합니다.
+    """
+
+    def __init__(self, fetch: Callable[[], list[tuple]], max_age: float = 600.0):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.tickers: tuple[tuple, ...] = ()
+        self.by_coin: dict[str, tuple[tuple, ...]] = {}  # {코인: (korean_ex, foreign_ex, coin) 튜플들}
+        self.coins: tuple[str, ...] = ()
+        self.version = 0
+        self._loaded_at = float("-inf")
+        self._stale = True
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, fetch: Callable[[], list[tuple]]):
+        """
+        환경변수(UNIVERSE_MAX_AGE)로 생성합니다.
+        """
+        return cls(fetch, max_age=float(os.getenv("UNIVERSE_MAX_AGE", 600.0)))
+
+    def invalidate(self):
+        """
+        다음 get()에서 유니버스를 다시 읽도록 표시합니다.
+        """
+        self._stale = True
+
+    def load(self, tickers: list[tuple]):
+        """
+        티커 목록으로 인덱스를 만듭니다.
+        """
+        tickers = tuple(sorted({tuple(ticker) for ticker in tickers}))
+        by_coin = {}
+        for ticker in tickers:
+            by_coin.setdefault(ticker[2], []).append(ticker)
+        if tickers != self.tickers:
+            self.version += 1
+            logger.info(f"거래 유니버스 갱신: {len(tickers)}개 티커, {len(by_coin)}개 코인 (v{self.version})")
+        self.tickers = tickers
+        self.by_coin = {coin: tuple(pairs) for coin, pairs in by_coin.items()}
+        self.coins = tuple(sorted(by_coin))
+
+    def get(self) -> list[tuple]:
+        """
+        (korean_ex, foreign_ex, coin_symbol) 튜플 리스트를 반환합니다. 필요할 때만 다시 읽습니다.
+        """
+        with self._lock:
+            if self._stale or time.monotonic() - self._loaded_at >= self.max_age:
+                # fetch 도중 들어온 알림을 잃지 않도록 먼저 해제
+                self._stale = False
+                tickers = self.fetch()
+                if tickers:
+                    self.load(tickers)
+                    self._loaded_at = time.monotonic()
+                elif self.tickers:
+                    logger.warning("거래 유니버스를 읽지 못했습니다. 이전 유니버스를 사용합니다.")
+                else:
+                    # 아직 한 번도 못 읽었으면 다음 호출에서 다시 시도
+                    self._stale = True
+            return list(self.tickers)
+
+    def listen(self, dsn: str, channel: str = TICKER_UNIVERSE_CHANNEL, retry_interval: float = 5.0) -> threading.Thread:
+        """
+        별도 데몬 스레드에서 Postgres 채널을 LISTEN하고 알림이 오면 invalidate()합니다.
+        연결이 끊기면 retry_interval초 뒤 다시 연결하며, 그동안 놓친 변경이 있을 수 있으므로 재연결 시에도 invalidate()합니다.
+        """
+        def run():
+            connected = False
+            while True:
+                conn = None
+                try:
+                    conn = psycopg2.connect(dsn)
+                    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                    with conn.cursor() as cursor:
+                        cursor.execute(f"LISTEN {channel}")
+                    if connected:
+                        self.invalidate()
+                    connected = True
+                    logger.info(f"거래 유니버스 변경 알림 대기: {channel}")
+                    while True:
+                        if select.select([conn], [], [], 60) == ([], [], []):
+                            continue
+                        conn.poll()
+                        if conn.notifies:
+                            conn.notifies.clear()
+                            self.invalidate()
+                except Exception as e:
+                    logger.warning(f"거래 유니버스 LISTEN 연결 끊김, {retry_interval}초 후 재연결: {e}")
+                finally:
+                    if conn is not None:
+                        conn.close()
+                time.sleep(retry_interval)
+
+        thread = threading.Thread(target=run, name="ticker-universe-listener", daemon=True)
+        thread.start()
+        return thread
@@ -1,4 +1,5 @@
 from .upbit import UpbitExchange
 from .bybit import BybitExchange
 from .gateio import GateioExchange
-from .bithumb import BithumbExchange
\ No newline at end of file
+from .bithumb import BithumbExchange
+from .binance import BinanceExchange
\ No newline at end of file
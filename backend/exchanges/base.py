@@ -1,9 +1,38 @@
 from abc import ABC
 from typing import Any, List
+from .http import http_clients
 
 class Exchange(ABC):
     name = None  # 또는 기본값을 문자열로 지정할 수 있습니다.
     server_url = None  # 또는 기본값을 문자열로 지정할 수 있습니다.
+    # 실시간 오더북 피드 (backend.exchanges.feed.OrderbookFeed) ~ 설정되면 get_ticker_orderbook이 REST 대신 사용
+    orderbook_feed = None
+    # 프로세스 공용 HTTP 세션 레지스트리 (backend.exchanges.http.HttpClientRegistry)
+    http = http_clients
+
+    @classmethod
+    def http_session(cls):
+        """
+        현재 이벤트 루프의 이 거래소 공용 aiohttp 세션을 반환합니다. (keep-alive 연결 재사용, 닫지 말 것)
+        """
+        return cls.http.session(cls.name)
+
+    @classmethod
+    def http_timeout(cls, kind: str):
+        """
+        엔드포인트 종류(market/account/order)별 요청 타임아웃을 반환합니다.
+        """
+        return cls.http.timeout(kind)
+
+    @classmethod
+    def feed_orderbook(cls, ticker: str, depth: int):
+        """
+        실시간 피드의 오더북을 반환합니다.
+        피드가 없거나, 피드보다 깊은 호가를 요청했거나(DepthController 증가), 오래되었거나 동기화 전이면 None.
+        """
+        if cls.orderbook_feed is None or not cls.orderbook_feed.covers(depth):
+            return None
+        return cls.orderbook_feed.get(ticker)
 
     @classmethod
     async def get_tickers(cls) -> List[Any]:
@@ -28,8 +57,38 @@ class Exchange(ABC):
         return {}
     
 class KoreanExchange(Exchange):
-    pass
+    @classmethod
+    async def fetch_ticker_orderbook(cls, tickers: list[str], count: int) -> list:
+        """
+        REST API로 여러 티커의 주문서를 한 번에 조회합니다. (OrderbookSnapshot 리스트)
+        """
+        return []
+
+    @classmethod
+    async def feed_or_fetch_orderbooks(cls, tickers: list[str], count: int) -> list:
+        """
+        실시간 피드의 오더북을 우선 사용하고, 피드에 없는 티커만 fetch_ticker_orderbook으로 한 번에 조회합니다.
+        피드보다 깊은 호가를 요청하면 모든 티커를 REST로 조회합니다.
+        """
+        if cls.orderbook_feed is None or not cls.orderbook_feed.covers(count):
+            return await cls.fetch_ticker_orderbook(tickers, count)
+
+        cached = {ticker: cls.orderbook_feed.get(ticker) for ticker in tickers}
+        missing = [ticker for ticker, orderbook in cached.items() if orderbook is None]
+        if missing:
+            for orderbook in await cls.fetch_ticker_orderbook(missing, count):
+                cached[orderbook.ticker] = orderbook
+        return [cached[ticker] for ticker in tickers if cached.get(ticker) is not None]
+
 class ForeignExchange(Exchange):
+    @classmethod
+    async def get_funding_rates(cls) -> dict[str, float]:
+        """
+        무기한 선물 티커별 현재 펀딩비를 반환합니다. (예: {"BTC": 0.0001})
+        펀딩비가 없는 거래소는 빈 딕셔너리를 반환합니다.
+        """
+        return {}
+
     async def get_position_info(self, ticker: str) -> dict:
         return {}
 
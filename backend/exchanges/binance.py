@@ -1,66 +1,94 @@
 import asyncio
+import bisect
 import logging
-import os
-from .base import Exchange
+import weakref
+from .base import ForeignExchange
+from .orderbook import OrderbookSnapshot
+from .orderbook_cache import orderbook_cache
 
 from binance import AsyncClient
 from binance.exceptions import BinanceAPIException
 
 logger = logging.getLogger(__name__)
 
-class BinanceExchange(Exchange):
+# USDⓈ-M 선물 오더북 REST 조회에 허용되는 limit 값
+FUTURES_DEPTH_LIMITS = (5, 10, 20, 50, 100, 500, 1000)
+
+class BinanceExchange(ForeignExchange):
     """
-    python-binance AsyncClient 기반 Binance API 비동기 래퍼 클래스 (현물 USDT 마켓 기준)
+    python-binance AsyncClient 기반 Binance API 비동기 래퍼 클래스 (USDⓈ-M 무기한 선물 USDT 마켓 기준)
+
+    AsyncClient는 이벤트 루프마다 하나만 만들어 모든 REST 호출이 공유합니다.
     """
     name = "binance"
+    # {event_loop: AsyncClient} ~ 루프가 사라지면 함께 정리
+    _clients = weakref.WeakKeyDictionary()
 
     def __init__(self, api_key: str = '', secret_key: str = ''):
         self.api_key = api_key
         self.secret_key = secret_key
 
     @classmethod
-    async def get_tickers(cls) -> list[str]: 
+    async def get_client(cls) -> AsyncClient:
+        """
+        현재 이벤트 루프의 공용 AsyncClient를 반환합니다. (없으면 생성)
+        """
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None:
+            client = await AsyncClient.create()
+            cls._clients[loop] = client
+        return client
+
+    @classmethod
+    async def close_client(cls):
+        """
+        현재 이벤트 루프의 공용 AsyncClient를 닫습니다.
         """
-        Binance에서 USDT 마켓 티커 목록을 가져옵니다.
+        client = cls._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close_connection()
+
+    @classmethod
+    async def get_tickers(cls) -> list[str]:
+        """
+        Binance에서 거래 중인 USDT 무기한 선물 티커 목록을 가져옵니다.
         Returns:
             list[str]: USDT 마켓 티커 리스트 (USDT 접미사 제거)
         """
         try:
-            client = await AsyncClient.create()
-            tickers = await client.get_all_tickers()
-            usdt_tickers = filter(lambda x: x['symbol'].endswith('USDT'), tickers)
-            processed = map(lambda x: x['symbol'].replace('USDT', ''), usdt_tickers)
-            return list(processed)
+            client = await cls.get_client()
+            info = await client.futures_exchange_info()
+            return [
+                symbol['baseAsset']
+                for symbol in info.get('symbols', [])
+                if symbol.get('quoteAsset') == 'USDT'
+                and symbol.get('contractType') == 'PERPETUAL'
+                and symbol.get('status') == 'TRADING'
+            ]
         except BinanceAPIException as e:
             logger.error("Binance API error: %s", e)
             raise
 
     @classmethod
-    async def get_ticker_orderbook(cls, ticker: str):
+    @orderbook_cache.cached("limit")
+    async def get_ticker_orderbook(cls, ticker: str, limit: int = 100):
         """
-        Binance에서 특정 티커의 오더북을 조회합니다.
+        Binance에서 특정 티커의 선물 오더북을 조회합니다.
+        실시간 피드가 있으면 메모리 오더북을 사용하고, 없거나 동기화 전이면 REST로 조회합니다.
         Args:
             ticker (str): 티커 이름 (예: 'BTC')
+            limit (int): 조회할 호가 개수 (허용값 중 limit 이상인 가장 작은 값으로 조회)
         Returns:
-            dict: 표준화된 오더북 정보
+            OrderbookSnapshot: 표준화된 오더북 스냅샷
         """
+        snapshot = cls.feed_orderbook(ticker, limit)
+        if snapshot is not None:
+            return snapshot
         try:
-            client = await AsyncClient.create()
-            ob = await client.get_order_book(symbol=f"{ticker}USDT")
-            orderbook = {
-                "ticker": ticker,
-                "timestamp": ob.get("lastUpdateId"),
-                "orderbook": [
-                    {
-                        "ask_price": float(ask[0]),
-                        "ask_size": float(ask[1]),
-                        "bid_price": float(bid[0]),
-                        "bid_size": float(bid[1])
-                    }
-                    for ask, bid in zip(ob["asks"], ob["bids"])
-                ]
-            }
-            return orderbook
+            client = await cls.get_client()
+            ob = await client.futures_order_book(symbol=f"{ticker}USDT", limit=futures_depth_limit(limit))
+            return OrderbookSnapshot.from_levels(ticker, ob.get("E", ob.get("lastUpdateId")), ob["asks"], ob["bids"])
         except BinanceAPIException as e:
             logger.error("Binance API error: %s", e)
             raise
@@ -68,7 +96,7 @@ class BinanceExchange(Exchange):
     @classmethod
     async def get_ticker_candles(cls, ticker: str, interval: str = "1m", limit: int = 200):
         """
-        Binance에서 특정 티커의 캔들 데이터를 조회합니다.
+        Binance에서 특정 티커의 선물 캔들 데이터를 조회합니다.
         Args:
             ticker (str): 티커 이름 (예: 'BTC')
             interval (str): 캔들 간격 (예: '1m', '5m', ...)
@@ -77,8 +105,8 @@ class BinanceExchange(Exchange):
             list[dict]: 표준화된 캔들 데이터 리스트
         """
         try:
-            client = await AsyncClient.create()
-            klines = await client.get_klines(symbol=f"{ticker}USDT", interval=interval, limit=limit)
+            client = await cls.get_client()
+            klines = await client.futures_klines(symbol=f"{ticker}USDT", interval=interval, limit=limit)
             candles = [
                 {
                     "timestamp": int(item[0] / 1000),
@@ -94,4 +122,11 @@ class BinanceExchange(Exchange):
         except BinanceAPIException as e:
             logger.error("Binance API error: %s", e)
             raise
-        
\ No newline at end of file
+
+
+def futures_depth_limit(limit: int) -> int:
+    """
+    선물 오더북 REST limit 허용값 중 limit 이상인 가장 작은 값 (최대 1000)
+    """
+    index = bisect.bisect_left(FUTURES_DEPTH_LIMITS, limit)
+    return FUTURES_DEPTH_LIMITS[min(index, len(FUTURES_DEPTH_LIMITS) - 1)]
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from .binance import BinanceExchange
+from .feed import OrderbookStream
+from .payloads import loads
+
+logger = logging.getLogger(__name__)
+
+
+class BinanceOrderbookStream(OrderbookStream):
+    """
+    Binance USDⓈ-M 선물 diff-depth WebSocket 스트림.
+
+    거래소 문서의 로컬 오더북 관리 절차를 따릅니다.
+    1. {symbol}@depth 스트림을 구독하고 이벤트를 버퍼링
+    2. REST 스냅샷(lastUpdateId) 조회
+    3. u < lastUpdateId 인 이벤트는 버림
+    4. 첫 이벤트는 U <= lastUpdateId <= u 를 만족해야 함
+    5. 이후 이벤트의 pu는 직전 이벤트의 u와 같아야 하며, 다르면 스냅샷부터 다시 동기화
+    """
+    name = "binance"
+    url = "wss://fstream.binance.com/ws"
+    # 구독 요청 1회당 최대 스트림 수
+    max_params = 50
+    # 동기화 전 티커당 최대 버퍼 이벤트 수
+    max_buffer = 1000
+    # 스냅샷 동기화 실패 후 재시도 대기 시간(초) ~ 실패할 때마다 두 배, 최대 max_retry_delay
+    retry_delay = 1.0
+    max_retry_delay = 60.0
+
+    def __init__(self, speed: str = "100ms", snapshot_limit: int = 500, max_age: float = 2.0):
+        super().__init__(max_age)
+        self.speed = speed
+        self.snapshot_limit = snapshot_limit
+        self.levels = snapshot_limit
+        self._buffers: dict[str, list[dict]] = {}
+        # 스냅샷 적용 후 첫 이벤트를 기다리는 티커 (U <= lastUpdateId <= u 검사 대상)
+        self._awaiting_first: set[str] = set()
+        self._syncing: set[str] = set()
+        # 동기화 실패 티커 ~ {티커: 재시도 가능 시각}, {티커: 다음 실패 시 대기 시간}
+        self._retry_at: dict[str, float] = {}
+        self._retry_delays: dict[str, float] = {}
+        self._request_id = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(BINANCE_WS_SPEED: 100ms/250ms/500ms, BINANCE_DEPTH_SNAPSHOT_LIMIT, ORDERBOOK_FEED_MAX_AGE)로 생성합니다.
+        """
+        return cls(
+            speed=os.getenv("BINANCE_WS_SPEED", "100ms"),
+            snapshot_limit=int(os.getenv("BINANCE_DEPTH_SNAPSHOT_LIMIT", 500)),
+            max_age=float(os.getenv("ORDERBOOK_FEED_MAX_AGE", 2.0)),
+        )
+
+    def stream_name(self, ticker: str) -> str:
+        return f"{ticker.lower()}usdt@depth@{self.speed}"
+
+    def handle_message(self, data):
+        event = loads(data)
+        if event.get("e") != "depthUpdate":
+            return None
+
+        ticker = event["s"][:-len("USDT")]
+        book = self._book(ticker)
+
+        if not book.synced:
+            # 스냅샷 대기 중 ~ 버퍼링
+            buffer = self._buffers.setdefault(ticker, [])
+            buffer.append(event)
+            if len(buffer) > self.max_buffer:
+                del buffer[0]
+            # 스냅샷 동기화가 실패한 티커는 대기 시간이 지나면 다시 동기화 요청
+            retry_at = self._retry_at.get(ticker)
+            if retry_at is not None and ticker not in self._syncing and time.monotonic() >= retry_at:
+                del self._retry_at[ticker]
+                return [ticker]
+            return None
+
+        if ticker in self._awaiting_first:
+            if event["u"] < book.update_id:
+                return None
+            if event["U"] > book.update_id:
+                return self._resync(ticker, event)
+            self._awaiting_first.discard(ticker)
+        elif event["pu"] != book.update_id:
+            return self._resync(ticker, event)
+
+        book.apply_delta(event["a"], event["b"], event["E"], event["u"])
+        return None
+
+    def _resync(self, ticker: str, event: dict):
+        self._book(ticker).invalidate()
+        self._awaiting_first.discard(ticker)
+        self._buffers[ticker] = [event]
+        return [ticker]
+
+    def apply_depth_snapshot(self, ticker: str, snapshot: dict) -> bool:
+        """
+        REST 스냅샷에 버퍼링된 이벤트를 이어 붙여 오더북을 동기화합니다. (self._lock 보유 상태로 호출)
+
+        Returns:
+            bool: 동기화 성공 여부 ~ 실패하면 스냅샷을 다시 조회해야 함
+        """
+        last_update_id = snapshot["lastUpdateId"]
+        events = [event for event in self._buffers.pop(ticker, []) if event["u"] >= last_update_id]
+        if events and events[0]["U"] > last_update_id:
+            # 스냅샷이 버퍼보다 오래됨
+            self._buffers[ticker] = events
+            return False
+
+        book = self._book(ticker)
+        book.apply_snapshot(snapshot["asks"], snapshot["bids"], snapshot.get("E"), last_update_id)
+        for i, event in enumerate(events):
+            if i > 0 and event["pu"] != book.update_id:
+                book.invalidate()
+                self._buffers[ticker] = events[i:]
+                return False
+            book.apply_delta(event["a"], event["b"], event["E"], event["u"])
+        if events:
+            self._awaiting_first.discard(ticker)
+        else:
+            self._awaiting_first.add(ticker)
+        return True
+
+    async def _sync(self, ticker: str):
+        """
+        REST 스냅샷으로 한 티커를 동기화합니다. (공용 AsyncClient 사용)
+        """
+        try:
+            for _ in range(3):
+                client = await BinanceExchange.get_client()
+                snapshot = await client.futures_order_book(symbol=f"{ticker}USDT", limit=self.snapshot_limit)
+                with self._lock:
+                    if self.apply_depth_snapshot(ticker, snapshot):
+                        self._retry_at.pop(ticker, None)
+                        self._retry_delays.pop(ticker, None)
+                        return
+                await asyncio.sleep(0.5)
+            delay = self._schedule_retry(ticker)
+            logger.warning(f"[binance] {ticker} 오더북 동기화 실패, {delay:.0f}초 후 재시도합니다.")
+        except Exception as e:
+            self._schedule_retry(ticker)
+            logger.error(f"[binance] {ticker} 오더북 스냅샷 조회 실패: {e}")
+        finally:
+            self._syncing.discard(ticker)
+
+    def _schedule_retry(self, ticker: str) -> float:
+        """
+        동기화 실패 티커의 재시도 시각을 기록하고 대기 시간을 반환합니다. (재시도는 해당 티커의 다음 이벤트 수신 시 요청)
+        """
+        delay = self._retry_delays.get(ticker, self.retry_delay)
+        self._retry_at[ticker] = time.monotonic() + delay
+        self._retry_delays[ticker] = min(delay * 2, self.max_retry_delay)
+        return delay
+
+    def _schedule_sync(self, tickers):
+        for ticker in tickers:
+            if ticker not in self._syncing:
+                self._syncing.add(ticker)
+                asyncio.create_task(self._sync(ticker))
+
+    async def send_subscribe(self, ws, tickers):
+        streams = [self.stream_name(ticker) for ticker in tickers]
+        for i in range(0, len(streams), self.max_params):
+            self._request_id += 1
+            await ws.send_str(json.dumps({"method": "SUBSCRIBE", "params": streams[i:i + self.max_params], "id": self._request_id}))
+            # 연결당 초당 메시지 수 제한
+            await asyncio.sleep(0.2)
+        # 구독 직후 이벤트가 버퍼링되기 시작하도록 잠시 대기 후 스냅샷 조회
+        await asyncio.sleep(1)
+        self._schedule_sync(tickers)
+
+    async def send_unsubscribe(self, ws, tickers):
+        streams = [self.stream_name(ticker) for ticker in tickers]
+        for i in range(0, len(streams), self.max_params):
+            self._request_id += 1
+            await ws.send_str(json.dumps({"method": "UNSUBSCRIBE", "params": streams[i:i + self.max_params], "id": self._request_id}))
+            await asyncio.sleep(0.2)
+
+    def _forget(self, tickers):
+        for ticker in tickers:
+            self._buffers.pop(ticker, None)
+            self._awaiting_first.discard(ticker)
+            self._retry_at.pop(ticker, None)
+            self._retry_delays.pop(ticker, None)
+
+    async def send_resync(self, ws, tickers):
+        # diff-depth는 재구독 없이 REST 스냅샷만 다시 조회
+        self._schedule_sync(tickers)
+
+    async def _main(self):
+        try:
+            await super()._main()
+        finally:
+            # 피드 루프에서 만든 스냅샷 조회용 공용 AsyncClient 정리 (aiohttp 세션 누수 방지)
+            try:
+                await BinanceExchange.close_client()
+            except Exception as e:
+                logger.warning(f"[binance] AsyncClient 정리 실패: {e}")
+
+    async def _run_feed(self):
+        try:
+            await super()._run_feed()
+        finally:
+            with self._lock:
+                self._buffers.clear()
+                self._awaiting_first.clear()
+                self._retry_at.clear()
+                self._retry_delays.clear()
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+import time
+from .bithumb import BithumbExchange
+from .feed import LocalBook, OrderbookFeed
+
+logger = logging.getLogger(__name__)
+
+
+class BithumbOrderbookPoller(OrderbookFeed):
+    """
+    Bithumb 오더북 백그라운드 REST 폴러. (Bithumb은 오더북 WebSocket 미제공)
+
+    /v1/orderbook 요청 1회에 최대 markets_per_call개 마켓을 묶어서 조회하고,
+    요청은 초당 requests_per_sec회로 균등하게 나누어 보내므로 순간적으로 요청이 몰리지 않습니다.
+    활성 전략 티커(hot)는 hot_interval, 나머지는 cold_interval 주기로 갱신하며,
+    마켓별로 마지막으로 성공한 오더북과 경과 시간(age)을 보관합니다.
+    """
+    name = "bithumb"
+
+    def __init__(self, markets_per_call: int = 30, requests_per_sec: float = 5.0,
+                 hot_interval: float = 0.5, cold_interval: float = 3.0, count: int = 30, max_age: float = 5.0):
+        super().__init__(max_age)
+        self.markets_per_call = markets_per_call
+        self.requests_per_sec = requests_per_sec
+        self.hot_interval = hot_interval
+        self.cold_interval = cold_interval
+        self.count = count
+        self.levels = count
+        self._hot: set[str] | None = set()
+        self._due: dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(BITHUMB_POLL_MARKETS, BITHUMB_POLL_RPS, BITHUMB_POLL_HOT_INTERVAL,
+        BITHUMB_POLL_COLD_INTERVAL, BITHUMB_POLL_MAX_AGE)로 생성합니다.
+        """
+        return cls(
+            markets_per_call=int(os.getenv("BITHUMB_POLL_MARKETS", 30)),
+            requests_per_sec=float(os.getenv("BITHUMB_POLL_RPS", 5)),
+            hot_interval=float(os.getenv("BITHUMB_POLL_HOT_INTERVAL", 0.5)),
+            cold_interval=float(os.getenv("BITHUMB_POLL_COLD_INTERVAL", 3)),
+            max_age=float(os.getenv("BITHUMB_POLL_MAX_AGE", 5)),
+        )
+
+    def freshness(self, book: LocalBook) -> float:
+        # 폴링은 마켓마다 받은 시각이 다르므로 마켓별 수신 시각 기준
+        return book.received_at
+
+    def set_hot(self, tickers):
+        """
+        자주 갱신할 티커(활성 전략 티커)를 지정합니다. None이면 전체 티커를 hot으로 취급합니다.
+        """
+        with self._lock:
+            self._hot = None if tickers is None else set(tickers)
+
+    def _forget(self, tickers):
+        for ticker in tickers:
+            self._due.pop(ticker, None)
+
+    def interval(self, ticker: str) -> float:
+        return self.hot_interval if self._hot is None or ticker in self._hot else self.cold_interval
+
+    def next_batch(self, now: float) -> list[str]:
+        """
+        이번 요청에 묶을 마켓 ~ 갱신 시각이 지난 마켓을 오래된 순으로 채우고,
+        남는 자리는 곧 갱신할 마켓으로 채웁니다. (요청 1회 비용은 마켓 수와 무관)
+        """
+        with self._lock:
+            for ticker in self._tickers:
+                self._due.setdefault(ticker, 0.0)
+            self._pending.clear()
+            ordered = sorted(self._due, key=self._due.get)
+            if not ordered or self._due[ordered[0]] > now:
+                return []
+            return ordered[:self.markets_per_call]
+
+    def _store(self, batch: list[str], orderbooks, now: float):
+        with self._lock:
+            # 응답에 없는 마켓(상장폐지 등)이 계속 앞자리를 차지하지 않도록 요청한 마켓 모두 다음 갱신 시각 설정
+            for ticker in batch:
+                self._due[ticker] = now + self.interval(ticker)
+            for orderbook in orderbooks:
+                self._book(orderbook.ticker).load(orderbook)
+
+    async def _run_feed(self):
+        period = 1 / self.requests_per_sec
+        backoff = 0
+        logger.info(f"[bithumb] 오더북 폴러 시작 (요청당 {self.markets_per_call}마켓, 초당 {self.requests_per_sec}회)")
+        while not self._stopping:
+            started = time.monotonic()
+            batch = self.next_batch(started)
+            if batch:
+                try:
+                    orderbooks = await BithumbExchange.fetch_ticker_orderbook(batch, self.count)
+                    self._store(batch, orderbooks, time.monotonic())
+                    self.last_message_at = time.monotonic()
+                    backoff = 0
+                except Exception as e:
+                    # 요청 실패(429 포함) 시 다음 요청을 점점 늦춤 ~ 마지막 성공 오더북은 유지
+                    backoff = min(backoff * 2 or period, 10)
+                    logger.warning(f"[bithumb] 오더북 폴링 실패, {backoff:.2f}초 대기: {e}")
+            # 요청 간격을 균등하게 유지 ~ 새 구독 요청이 와도 앞당기지 않음
+            delay = period + backoff - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def _invalidate_all(self):
+        # 폴러는 연결 상태가 없으므로 마지막 성공 오더북을 유지 (age로 판단)
+        pass
@@ -7,6 +7,8 @@ import os
 from urllib.parse import urlencode
 import aiohttp
 from .base import ForeignExchange
+from .orderbook_cache import orderbook_cache
+from .payloads import bybit_orderbook
 import datetime
 from dotenv import load_dotenv
 
@@ -25,6 +27,9 @@ class BybitExchange(ForeignExchange):
     """
     name = "bybit"
     server_url = "https://api.bybit.com"
+    # 펀딩비 캐시 ~ (만료 시각, {티커: 펀딩비}), 다음 펀딩 정산 시각(최대 FUNDING_RATE_CACHE_TTL초)까지 재사용
+    funding_cache_ttl = float(os.getenv("FUNDING_RATE_CACHE_TTL", 3600))
+    _funding_cache: tuple[float, dict[str, float]] | None = None
 
     def __init__(self, api_key: str = "", secret_key: str = ""):
         self.api_key = api_key
@@ -58,21 +63,21 @@ class BybitExchange(ForeignExchange):
         try:
             url = f"{cls.server_url}/v5/market/instruments-info?category=linear&limit=1000"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-
-                    response = await res.json()
-                    with open('bybit_tickers.json', 'w') as f:
-                        f.write(pyjson.dumps(response, indent=2))
-                    if response.get("retCode") == 0:  # 성공 코드 확인
-                        return [
-                            (x['symbol'].replace('USDT', ''), x['symbol'].replace('USDT', ''))
-                            for x in response.get("result", {}).get("list", [])
-                            if x['symbol'].endswith('USDT')
-                        ]
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+
+                response = await res.json()
+                with open('bybit_tickers.json', 'w') as f:
+                    f.write(pyjson.dumps(response, indent=2))
+                if response.get("retCode") == 0:  # 성공 코드 확인
+                    return [
+                        (x['symbol'].replace('USDT', ''), x['symbol'].replace('USDT', ''))
+                        for x in response.get("result", {}).get("list", [])
+                        if x['symbol'].endswith('USDT')
+                    ]
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching tickers: {e}")
             raise
@@ -81,45 +86,34 @@ class BybitExchange(ForeignExchange):
             raise
         
     @classmethod
-    async def get_ticker_orderbook(cls, ticker: str):
+    @orderbook_cache.cached("limit")
+    async def get_ticker_orderbook(cls, ticker: str, limit: int = 500):
         """
         Bybit에서 특정 티커의 주문서를 가져옵니다.
 
         Args:
             ticker (str): 티커 이름 (예: 'BTC')
+            limit (int): 조회할 호가 개수 (1 ~ 500)
 
         Returns:
-            dict: 표준화된 주문서 정보
+            OrderbookSnapshot: 표준화된 주문서 스냅샷
 
         Raises:
             Exception: API 호출 실패 시 발생하는 예외
         """
+        # 실시간 피드가 있으면 메모리 오더북 사용 (오래되었거나 동기화 전이면 REST로 조회)
+        snapshot = cls.feed_orderbook(ticker, limit)
+        if snapshot is not None:
+            return snapshot
         try:
-            url = f"{cls.server_url}/v5/market/orderbook?category=linear&symbol={ticker}USDT&limit=500"
+            url = f"{cls.server_url}/v5/market/orderbook?category=linear&symbol={ticker}USDT&limit={limit}"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        orderbook_data = response["result"]
-                        standardized_orderbook = {
-                            "ticker": ticker,
-                            "timestamp": orderbook_data["ts"],
-                            "orderbook": [
-                                {
-                                    "ask_price": float(ask[0]),
-                                    "bid_price": float(bid[0]),
-                                    "ask_size": float(ask[1]),
-                                    "bid_size": float(bid[1])
-                                }
-                                for ask, bid in zip(orderbook_data["a"], orderbook_data["b"])
-                            ]
-                        }
-                        return standardized_orderbook
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+                # 응답 본문을 바로 배열 기반 스냅샷으로 변환
+                return bybit_orderbook(await res.read(), ticker)
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching orderbook for {ticker}: {e}")
             raise
@@ -127,6 +121,49 @@ class BybitExchange(ForeignExchange):
             logger.error(f"Unexpected error while fetching orderbook for {ticker}: {e}")
             raise
         
+    @classmethod
+    async def get_funding_rates(cls) -> dict[str, float]:
+        """
+        Bybit USDT 무기한 선물 전체 티커의 현재 펀딩비를 한 번에 가져옵니다.
+        다음 펀딩 정산 시각(nextFundingTime)까지는 캐시된 값을 반환합니다. (최대 funding_cache_ttl초)
+
+        Returns:
+            dict[str, float]: {티커: 펀딩비} (예: {"BTC": 0.0001})
+
+        Raises:
+            Exception: API 호출 실패 시 발생하는 예외
+        """
+        cached = cls._funding_cache
+        if cached is not None and time.time() < cached[0]:
+            return cached[1]
+        try:
+            url = f"{cls.server_url}/v5/market/tickers?category=linear"
+            headers = {"accept": "application/json"}
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    items = [
+                        x for x in response.get("result", {}).get("list", [])
+                        if x['symbol'].endswith('USDT') and x.get('fundingRate')
+                    ]
+                    rates = {x['symbol'][:-len('USDT')]: float(x['fundingRate']) for x in items}
+                    now = time.time()
+                    next_funding = [int(x['nextFundingTime']) / 1000 for x in items if x.get('nextFundingTime')]
+                    expires_at = min([now + cls.funding_cache_ttl, *(t for t in next_funding if t > now)])
+                    cls._funding_cache = (expires_at, rates)
+                    return rates
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error while fetching funding rates: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error while fetching funding rates: {e}")
+            raise
+
     @classmethod
     async def get_ticker_candles(cls, ticker: str, interval: str = "1m", to: int = 0, count: int = 200):
         """
@@ -162,27 +199,27 @@ class BybitExchange(ForeignExchange):
             if to != 0:
                 url += f"&end={to * 1000}"  # Bybit expects milliseconds
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        candles = response["result"]
-                        standardized_candles = [
-                            {
-                                "timestamp": float(candle[0]) / 1000,  # Bybit timestamp is in milliseconds
-                                "open": float(candle[1]),
-                                "high": float(candle[2]),
-                                "low": float(candle[3]),
-                                "close": float(candle[4]),
-                                "volume": float(candle[5])
-                            }
-                            for candle in candles['list']
-                        ]
-                        return standardized_candles
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    candles = response["result"]
+                    standardized_candles = [
+                        {
+                            "timestamp": float(candle[0]) / 1000,  # Bybit timestamp is in milliseconds
+                            "open": float(candle[1]),
+                            "high": float(candle[2]),
+                            "low": float(candle[3]),
+                            "close": float(candle[4]),
+                            "volume": float(candle[5])
+                        }
+                        for candle in candles['list']
+                    ]
+                    return standardized_candles
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching candles for {ticker}: {e}")
             raise
@@ -262,11 +299,11 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=body, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-                    return await res.json()
+            session = self.http_session()
+            async with session.post(url, json=body, headers=headers, timeout=self.http_timeout("order")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+                return await res.json()
         except aiohttp.ClientError as e:
             logger.error(f"Network error while placing order for {ticker}: {e}")
             raise
@@ -320,11 +357,11 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=body, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-                    return await res.json()
+            session = self.http_session()
+            async with session.post(url, json=body, headers=headers, timeout=self.http_timeout("order")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+                return await res.json()
         except aiohttp.ClientError as e:
             logger.error(f"Network error while closing position for {ticker}: {e}")
             raise
@@ -366,15 +403,15 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+            session = self.http_session()
+            async with session.get(url, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
 
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        return response["result"]
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    return response["result"]
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching position info for {ticker}: {e}")
             raise
@@ -394,17 +431,17 @@ class BybitExchange(ForeignExchange):
         """
         url = f"{self.server_url}/v5/market/instruments-info?category=linear&symbol={ticker}USDT"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as res:
-                    if res.status != 200:
-                        logger.error(f"Bybit lot size 조회 실패: {res.status} - {await res.text()}")
-                        return None
-                    data = await res.json()
-                    try:
-                        return float(data['result']['list'][0]['lotSizeFilter']['qtyStep'])
-                    except Exception as e:
-                        logger.error(f"Bybit lot size 파싱 실패: {e}")
-                        return None
+            session = self.http_session()
+            async with session.get(url, timeout=self.http_timeout("market")) as res:
+                if res.status != 200:
+                    logger.error(f"Bybit lot size 조회 실패: {res.status} - {await res.text()}")
+                    return None
+                data = await res.json()
+                try:
+                    return float(data['result']['list'][0]['lotSizeFilter']['qtyStep'])
+                except Exception as e:
+                    logger.error(f"Bybit lot size 파싱 실패: {e}")
+                    return None
         except Exception as e:
             logger.error(f"Bybit lot size 조회 중 예외 발생: {e}")
             return None
@@ -444,15 +481,15 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        return response.get("result", {}).get("list", [])
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+            session = self.http_session()
+            async with session.get(url, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    return response.get("result", {}).get("list", [])
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching orders for {ticker}: {e}")
             raise
@@ -495,15 +532,15 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        return response.get("result", {}).get("list", [])[0]
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+            session = self.http_session()
+            async with session.get(url, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    return response.get("result", {}).get("list", [])[0]
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching orders for {order_id}: {e}")
             raise
@@ -542,15 +579,15 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        return float(response["result"]["list"][0].get('totalAvailableBalance', 0.0))
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+            session = self.http_session()
+            async with session.get(url, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    return float(response["result"]["list"][0].get('totalAvailableBalance', 0.0))
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching available balance: {e}")
             raise
@@ -593,23 +630,23 @@ class BybitExchange(ForeignExchange):
                 "X-BAPI-TIMESTAMP": timestamp,
                 "X-BAPI-RECV-WINDOW": recv_window
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-                    data = await res.json()
-                    if data.get("retCode") != 0:
-                        raise Exception(f"Bybit API Error: {data.get('retMsg')}")
-                    result = []
-                    for coin_info in data.get("result", {}).get("rows", []):
-                        for chain in coin_info.get('chains', []):
-                            result.append({
-                                "coin": coin_info.get("name"),
-                                "chain": chain.get("chainType"),
-                                "deposit_yn": chain.get("chainDeposit"),
-                                "withdraw_yn": chain.get("chainWithdraw"),
-                            })
-                    return result
+            session = self.http_session()
+            async with session.get(url, params=params, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+                data = await res.json()
+                if data.get("retCode") != 0:
+                    raise Exception(f"Bybit API Error: {data.get('retMsg')}")
+                result = []
+                for coin_info in data.get("result", {}).get("rows", []):
+                    for chain in coin_info.get('chains', []):
+                        result.append({
+                            "coin": coin_info.get("name"),
+                            "chain": chain.get("chainType"),
+                            "deposit_yn": chain.get("chainDeposit"),
+                            "withdraw_yn": chain.get("chainWithdraw"),
+                        })
+                return result
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching coin deposit/withdraw info: {e}")
             raise
@@ -686,11 +723,11 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=body, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
-                    return await res.json()
+            session = self.http_session()
+            async with session.post(url, json=body, headers=headers, timeout=self.http_timeout("order")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+                return await res.json()
         except aiohttp.ClientError as e:
             logger.error(f"Network error while placing order for {ticker}: {e}")
             raise
@@ -766,15 +803,15 @@ class BybitExchange(ForeignExchange):
             headers["X-BAPI-TIMESTAMP"] = timestamp
             headers["X-BAPI-RECV-WINDOW"] = recv_window
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
+            session = self.http_session()
+            async with session.get(url, headers=headers, timeout=self.http_timeout("order")) as res:
+                if res.status != 200:
+                    raise Exception(f"Bybit API Error: {res.status} - {await res.text()}")
 
-                    response = await res.json()
-                    if response.get("retCode") == 0:
-                        return response.get("result", {})
-                    raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+                response = await res.json()
+                if response.get("retCode") == 0:
+                    return response.get("result", {})
+                raise Exception(f"Bybit API Error: {response.get('retMsg')}")
         except aiohttp.ClientError as e:
             logger.error("Network error while fetching closed PnL for %s: %s", ticker, e)
             raise
@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+from .feed import OrderbookStream
+from .payloads import loads
+
+logger = logging.getLogger(__name__)
+
+
+class BybitOrderbookStream(OrderbookStream):
+    """
+    Bybit USDT 무기한(linear) 오더북 WebSocket 스트림.
+
+    orderbook.{depth}.{SYMBOL}USDT 토픽을 구독하여 snapshot + delta 메시지를 메모리 오더북에 반영합니다.
+    delta의 업데이트 ID(u)가 연속되지 않으면 해당 토픽을 재구독하여 새 스냅샷으로 재동기화하며,
+    u=1 스냅샷(거래소 서비스 재시작)도 그대로 새 스냅샷으로 처리합니다.
+    """
+    name = "bybit"
+    url = "wss://stream.bybit.com/v5/public/linear"
+    # 구독 요청 1회당 최대 토픽 수
+    max_args = 10
+
+    def __init__(self, depth: int = 200, max_age: float = 2.0):
+        super().__init__(max_age)
+        self.depth = depth
+        self.levels = depth
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(BYBIT_WS_DEPTH: 1/50/200/500, ORDERBOOK_FEED_MAX_AGE)로 생성합니다.
+        """
+        return cls(
+            depth=int(os.getenv("BYBIT_WS_DEPTH", 200)),
+            max_age=float(os.getenv("ORDERBOOK_FEED_MAX_AGE", 2.0)),
+        )
+
+    def topic(self, ticker: str) -> str:
+        return f"orderbook.{self.depth}.{ticker}USDT"
+
+    def handle_message(self, data):
+        message = loads(data)
+        topic = message.get("topic")
+        if not topic or not topic.startswith("orderbook."):
+            if message.get("op") == "subscribe" and not message.get("success", True):
+                logger.error(f"[bybit] 오더북 구독 실패: {message.get('ret_msg')}")
+            return None
+
+        payload = message["data"]
+        ticker = payload["s"][:-len("USDT")]
+        book = self._book(ticker)
+        update_id = payload.get("u")
+
+        if message.get("type") == "snapshot":
+            book.apply_snapshot(payload["a"], payload["b"], message.get("ts"), update_id)
+            return None
+
+        if not book.synced:
+            # 재동기화 스냅샷 대기 중
+            return None
+        if book.update_id is not None and update_id is not None:
+            if update_id <= book.update_id:
+                return None
+            if update_id != book.update_id + 1:
+                book.invalidate()
+                return [ticker]
+        book.apply_delta(payload["a"], payload["b"], message.get("ts"), update_id)
+        return None
+
+    async def send_subscribe(self, ws, tickers):
+        topics = [self.topic(ticker) for ticker in tickers]
+        for i in range(0, len(topics), self.max_args):
+            await ws.send_str(json.dumps({"op": "subscribe", "args": topics[i:i + self.max_args]}))
+
+    async def send_unsubscribe(self, ws, tickers):
+        topics = [self.topic(ticker) for ticker in tickers]
+        for i in range(0, len(topics), self.max_args):
+            await ws.send_str(json.dumps({"op": "unsubscribe", "args": topics[i:i + self.max_args]}))
+
+    async def send_resync(self, ws, tickers):
+        await self.send_unsubscribe(ws, tickers)
+        await self.send_subscribe(ws, tickers)
+
+    async def send_ping(self, ws):
+        await ws.send_str(json.dumps({"op": "ping"}))
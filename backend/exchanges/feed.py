@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import threading
+import time
+import aiohttp
+import numpy as np
+from .http import http_clients
+from .orderbook import OrderbookSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBook:
+    """
+    스트림으로 받은 스냅샷/델타를 반영하는 메모리 오더북 (한 티커).
+
+    가격별 수량을 dict로 보관하고, OrderbookSnapshot은 마지막 변경 이후 처음 읽을 때 한 번만 만듭니다.
+    수량이 0인 레벨은 삭제합니다.
+    """
+    __slots__ = ("asks", "bids", "timestamp", "update_id", "synced", "received_at", "_snapshot")
+
+    def __init__(self):
+        self.asks: dict[float, float] = {}
+        self.bids: dict[float, float] = {}
+        self.timestamp = None
+        self.update_id = None
+        self.synced = False
+        self.received_at = 0.0
+        self._snapshot = None
+
+    def apply_snapshot(self, asks, bids, timestamp=None, update_id=None):
+        """
+        오더북 전체를 교체합니다. ([[price, size], ...], 문자열 허용)
+        """
+        self.asks = {float(price): float(size) for price, size in asks if float(size) > 0}
+        self.bids = {float(price): float(size) for price, size in bids if float(size) > 0}
+        self.synced = True
+        self._touch(timestamp, update_id)
+
+    def apply_delta(self, asks, bids, timestamp=None, update_id=None):
+        """
+        변경된 레벨만 반영합니다. 수량 0은 레벨 삭제입니다.
+        """
+        for levels, side in ((asks, self.asks), (bids, self.bids)):
+            for price, size in levels:
+                price, size = float(price), float(size)
+                if size > 0:
+                    side[price] = size
+                else:
+                    side.pop(price, None)
+        self._touch(timestamp, update_id)
+
+    def load(self, snapshot: OrderbookSnapshot):
+        """
+        완성된 스냅샷으로 교체합니다. (델타 없이 매번 전체 오더북을 받는 REST 폴링용)
+        """
+        self.asks, self.bids = {}, {}
+        self.synced = True
+        self._touch(snapshot.timestamp, None)
+        self._snapshot = snapshot
+
+    def invalidate(self):
+        """
+        시퀀스 누락 등으로 재동기화가 필요할 때 호출 ~ 다음 스냅샷 전까지 읽기 불가
+        """
+        self.synced = False
+        self._snapshot = None
+
+    def _touch(self, timestamp, update_id):
+        self.timestamp = timestamp
+        self.update_id = update_id
+        self.received_at = time.monotonic()
+        self._snapshot = None
+
+    def snapshot(self, ticker: str) -> OrderbookSnapshot:
+        if self._snapshot is None:
+            ask_prices = np.fromiter(sorted(self.asks), dtype=np.float64, count=len(self.asks))
+            bid_prices = np.fromiter(sorted(self.bids, reverse=True), dtype=np.float64, count=len(self.bids))
+            self._snapshot = OrderbookSnapshot(
+                ticker,
+                self.timestamp,
+                ask_prices,
+                np.fromiter((self.asks[price] for price in ask_prices.tolist()), dtype=np.float64, count=len(ask_prices)),
+                bid_prices,
+                np.fromiter((self.bids[price] for price in bid_prices.tolist()), dtype=np.float64, count=len(bid_prices)),
+            )
+        return self._snapshot
+
+
+class OrderbookFeed:
+    """
+    백그라운드 스레드(전용 이벤트 루프)에서 오더북을 계속 갱신하고,
+    다른 스레드에서는 get(ticker)으로 네트워크 대기 없이 최신 오더북을 읽는 피드의 공통 클래스.
+
+    get()은 피드가 max_age(초) 이내에 갱신되지 않았거나 아직 동기화되지 않은 티커에 대해 None을 반환하며,
+    처음 요청된 티커는 자동으로 구독 대상에 추가합니다. (호출부는 None이면 REST로 조회)
+    하위 클래스는 _run_feed()를 구현하고, 피드가 유지하는 최대 호가 레벨 수를 levels에 둡니다. (None이면 제한 없음)
+    """
+    name = None
+    levels = None
+
+    def __init__(self, max_age: float = 2.0):
+        self.max_age = max_age
+        self._books: dict[str, LocalBook] = {}
+        self._tickers: set[str] = set()
+        self._pending: set[str] = set()
+        self._removed: set[str] = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._wakeup = None
+        self._stopping = False
+        self.last_message_at = 0.0
+
+    # ===== 읽기 (다른 스레드) =====
+
+    def covers(self, count: int) -> bool:
+        """
+        count 레벨 요청을 피드 오더북으로 처리할 수 있는지 여부 ~ 더 깊게 요청하면 호출부가 REST로 조회
+        """
+        return self.levels is None or count <= self.levels
+
+    def get(self, ticker: str, max_age: float | None = None) -> OrderbookSnapshot | None:
+        """
+        메모리 오더북을 스냅샷으로 반환합니다. 오래되었거나 동기화 전이면 None.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            book = self._books.get(ticker)
+            if book is None or not book.synced:
+                if ticker not in self._tickers:
+                    self._request_subscribe([ticker])
+                return None
+            if time.monotonic() - self.freshness(book) > max_age:
+                return None
+            return book.snapshot(ticker)
+
+    def age(self, ticker: str) -> float | None:
+        """
+        티커 오더북이 마지막으로 갱신된 후 경과 시간(초), 없으면 None
+        """
+        with self._lock:
+            book = self._books.get(ticker)
+            if book is None or not book.synced:
+                return None
+            return time.monotonic() - book.received_at
+
+    def staleness(self, ticker: str) -> float | None:
+        """
+        get()의 staleness 판단 기준 시각(freshness)으로부터 경과 시간(초), 없으면 None
+        """
+        with self._lock:
+            book = self._books.get(ticker)
+            if book is None or not book.synced:
+                return None
+            return time.monotonic() - self.freshness(book)
+
+    def freshness(self, book: LocalBook) -> float:
+        """
+        staleness 판단 기준 시각 ~ 스트림은 변경이 있을 때만 push하므로 연결이 살아있으면 최신으로 간주
+        """
+        return self.last_message_at
+
+    # ===== 구독 관리 =====
+
+    def tickers(self) -> list[str]:
+        """
+        구독 중인 티커 목록
+        """
+        with self._lock:
+            return sorted(self._tickers)
+
+    def subscribe(self, tickers):
+        with self._lock:
+            self._request_subscribe(tickers)
+
+    def unsubscribe(self, tickers):
+        """
+        구독을 해제하고 메모리 오더북을 버립니다. (거래 유니버스에서 빠진 티커)
+        """
+        with self._lock:
+            removed = set(tickers) & self._tickers
+            if not removed:
+                return
+            self._tickers -= removed
+            self._pending -= removed
+            self._removed |= removed
+            for ticker in removed:
+                self._books.pop(ticker, None)
+            self._forget(removed)
+            if self._loop is not None and self._wakeup is not None:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _forget(self, tickers: set[str]):
+        """
+        구독 해제한 티커의 하위 클래스 상태를 정리합니다. (self._lock 보유 상태로 호출)
+        """
+
+    def _request_subscribe(self, tickers):
+        new = set(tickers) - self._tickers
+        if not new:
+            return
+        self._tickers |= new
+        self._pending |= new
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_pending(self) -> list[str]:
+        with self._lock:
+            pending = sorted(self._pending)
+            self._pending.clear()
+            return pending
+
+    def _take_removed(self) -> list[str]:
+        with self._lock:
+            removed = sorted(self._removed)
+            self._removed.clear()
+            return removed
+
+    def _book(self, ticker: str) -> LocalBook:
+        book = self._books.get(ticker)
+        if book is None:
+            book = self._books[ticker] = LocalBook()
+        return book
+
+    # ===== 실행 =====
+
+    def start(self, tickers=()):
+        """
+        백그라운드 스레드에서 피드를 시작합니다.
+        """
+        self.subscribe(tickers)
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stopping = False
+        self._thread = threading.Thread(target=self._thread_main, name=f"{self.name}-orderbook-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping = True
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _thread_main(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        backoff = 1
+        try:
+            while not self._stopping:
+                try:
+                    await self._run_feed()
+                    backoff = 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"[{self.name}] 오더북 피드 오류, {backoff}초 후 재연결: {e}")
+                self._invalidate_all()
+                if not self._stopping:
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30)
+        finally:
+            # 피드 루프에서 만든 공용 HTTP 세션 정리
+            await http_clients.close()
+
+    def _invalidate_all(self):
+        with self._lock:
+            for book in self._books.values():
+                book.invalidate()
+            # 재연결 시 전체 재구독 (해제할 구독은 새 연결에 없음)
+            self._pending = set(self._tickers)
+            self._removed.clear()
+
+    async def _run_feed(self):
+        raise NotImplementedError
+
+
+class OrderbookStream(OrderbookFeed):
+    """
+    WebSocket 오더북 스트림 공통 클래스.
+
+    연결 후 구독 대기열의 티커를 subscribe()하고, 수신 메시지를 handle_message()로 전달합니다.
+    handle_message는 네트워크 없이 호출 가능하도록 순수하게 구현합니다. (재구독이 필요한 티커 리스트 반환)
+    """
+    url = None
+    ping_interval = 20
+
+    async def _run_feed(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.url, heartbeat=None, autoping=True) as ws:
+                logger.info(f"[{self.name}] 오더북 스트림 연결")
+                receiver = asyncio.create_task(self._receive(ws))
+                try:
+                    while not self._stopping and not receiver.done():
+                        pending = self._take_pending()
+                        if pending:
+                            await self.send_subscribe(ws, pending)
+                        removed = self._take_removed()
+                        if removed:
+                            await self.send_unsubscribe(ws, removed)
+                        self._wakeup.clear()
+                        try:
+                            await asyncio.wait_for(self._wakeup.wait(), timeout=self.ping_interval)
+                        except asyncio.TimeoutError:
+                            await self.send_ping(ws)
+                finally:
+                    if not receiver.done():
+                        receiver.cancel()
+                    await asyncio.gather(receiver, return_exceptions=True)
+                if not receiver.cancelled():
+                    receiver.result()
+
+    async def _receive(self, ws):
+        try:
+            async for msg in ws:
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    self.last_message_at = time.monotonic()
+                    with self._lock:
+                        resync = self.handle_message(msg.data)
+                    if resync:
+                        logger.warning(f"[{self.name}] 시퀀스 누락, 재동기화: {resync}")
+                        await self.send_resync(ws, resync)
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+            raise ConnectionError(f"[{self.name}] 오더북 스트림 연결 종료")
+        finally:
+            # 구독 루프가 연결 종료를 바로 알 수 있도록 깨움
+            self._wakeup.set()
+
+    def handle_message(self, data) -> list[str] | None:
+        """
+        수신 메시지를 메모리 오더북에 반영합니다. (self._lock 보유 상태로 호출)
+
+        Returns:
+            list[str] | None: 시퀀스 누락으로 재동기화가 필요한 티커 리스트
+        """
+        raise NotImplementedError
+
+    async def send_subscribe(self, ws, tickers: list[str]):
+        raise NotImplementedError
+
+    async def send_unsubscribe(self, ws, tickers: list[str]):
+        raise NotImplementedError
+
+    async def send_resync(self, ws, tickers: list[str]):
+        """
+        재동기화 ~ 기본 동작은 다시 구독하여 새 스냅샷을 받음
+        """
+        await self.send_subscribe(ws, tickers)
+
+    async def send_ping(self, ws):
+        pass
@@ -0,0 +1,23 @@
+from .binance import BinanceExchange
+from .binance_stream import BinanceOrderbookStream
+from .bithumb import BithumbExchange
+from .bithumb_poller import BithumbOrderbookPoller
+from .bybit import BybitExchange
+from .bybit_stream import BybitOrderbookStream
+from .upbit import UpbitExchange
+from .upbit_stream import UpbitOrderbookStream
+
+# 실시간 오더북 피드를 지원하는 거래소 ~ {거래소 이름: (거래소 클래스, 피드 클래스)}
+ORDERBOOK_FEED_CLASS_MAP = {
+    "bybit": (BybitExchange, BybitOrderbookStream),
+    "upbit": (UpbitExchange, UpbitOrderbookStream),
+    "bithumb": (BithumbExchange, BithumbOrderbookPoller),
+    "binance": (BinanceExchange, BinanceOrderbookStream),
+}
+
+
+def feed_tickers(name: str, coins: list[str]) -> list[str]:
+    """
+    피드가 구독할 티커 목록 ~ Upbit은 테더 가격(get_usdt_ticker_ob_price)용 KRW-USDT도 함께 구독
+    """
+    return coins + ['USDT'] if name == 'upbit' else coins
@@ -3,6 +3,8 @@ import logging
 import aiohttp
 import dotenv
 from .base import Exchange
+from .orderbook_cache import orderbook_cache
+from .payloads import gateio_orderbook
 
 dotenv.load_dotenv()
 
@@ -38,12 +40,12 @@ class GateioExchange(Exchange):
         try:
             url = f"{cls.server_url}/futures/usdt/contracts/{ticker}_USDT"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
-                    ticker_data = await res.json()
-                    return ticker_data
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
+                ticker_data = await res.json()
+                return ticker_data
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching tickers: {e}")
             raise
@@ -61,15 +63,15 @@ class GateioExchange(Exchange):
         try:
             url = f"{cls.server_url}/futures/usdt/contracts"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
-                    tickers = await res.json()
-                    # 예시: USDT 마켓만 필터링
-                    usdt_tickers = filter(lambda x: x['name'].endswith('_USDT'), tickers)
-                    processed_tickers = map(lambda x: x['name'].replace('_USDT', ''), usdt_tickers)
-                    return list(processed_tickers)
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
+                tickers = await res.json()
+                # 예시: USDT 마켓만 필터링
+                usdt_tickers = filter(lambda x: x['name'].endswith('_USDT'), tickers)
+                processed_tickers = map(lambda x: x['name'].replace('_USDT', ''), usdt_tickers)
+                return list(processed_tickers)
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching tickers: {e}")
             raise
@@ -78,33 +80,26 @@ class GateioExchange(Exchange):
             raise
 
     @classmethod
-    async def get_ticker_orderbook(cls, ticker: str):
+    @orderbook_cache.cached("limit")
+    async def get_ticker_orderbook(cls, ticker: str, limit: int | None = None):
         """
         Gate.io에서 특정 티커의 주문서 조회
+        Args:
+            limit (int | None): 조회할 호가 개수 (None이면 거래소 기본값)
         Returns:
-            dict: 표준화된 주문서 정보
+            OrderbookSnapshot: 표준화된 주문서 스냅샷
         """
         try:
             url = f"{cls.server_url}/spot/order_book?currency_pair={ticker}_USDT"
+            if limit:
+                url += f"&limit={limit}"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
-                    orderbook_data = await res.json()
-                    standardized_orderbook = {
-                        "ticker": ticker,
-                        "timestamp": orderbook_data.get("update_time", None),
-                        "orderbook": [
-                            {
-                                "ask_price": float(orderbook_data["asks"][0][0]) if orderbook_data["asks"] else None,
-                                "bid_price": float(orderbook_data["bids"][0][0]) if orderbook_data["bids"] else None,
-                                "ask_size": float(orderbook_data["asks"][0][1]) if orderbook_data["asks"] else None,
-                                "bid_size": float(orderbook_data["bids"][0][1]) if orderbook_data["bids"] else None,
-                            }
-                        ]
-                    }
-                    return standardized_orderbook
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
+                # 응답 본문을 바로 배열 기반 스냅샷으로 변환
+                return gateio_orderbook(await res.read(), ticker)
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching orderbook for {ticker}: {e}")
             raise
@@ -121,8 +116,8 @@ class GateioExchange(Exchange):
         """
         try:
             orderbook = await cls.get_ticker_orderbook(ticker)
-            if orderbook and orderbook["orderbook"]:
-                return {"ticker": ticker, "price": orderbook["orderbook"][0]["ask_price"]}
+            if orderbook and orderbook.best_ask is not None:
+                return {"ticker": ticker, "price": orderbook.best_ask}
             return {"ticker": ticker, "price": None}
         except Exception as e:
             logger.error(f"Error fetching ticker price for {ticker}: {e}")
@@ -144,22 +139,22 @@ class GateioExchange(Exchange):
             if to != 0:
                 url += f"&to={to}"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
-                    candles = await res.json()
-                    return [
-                        {
-                            "timestamp": int(candle['t']),
-                            "open": float(candle['o']),
-                            "close": float(candle['c']),
-                            "high": float(candle['h']),
-                            "low": float(candle['l']),
-                            "volume": float(candle['v'])
-                        }
-                        for candle in candles
-                    ]
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Gate.io API Error: {res.status} - {await res.text()}")
+                candles = await res.json()
+                return [
+                    {
+                        "timestamp": int(candle['t']),
+                        "open": float(candle['o']),
+                        "close": float(candle['c']),
+                        "high": float(candle['h']),
+                        "low": float(candle['l']),
+                        "volume": float(candle['v'])
+                    }
+                    for candle in candles
+                ]
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching candles for {ticker}: {e}")
             raise
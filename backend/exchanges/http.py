@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import os
+import weakref
+import aiohttp
+from .rate_limit import RateLimiter, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트 종류별 기본 타임아웃(초) ~ (total, connect)
+DEFAULT_TIMEOUTS = {
+    "market": (3.0, 1.0),    # 시세/오더북 등 공개 API
+    "account": (5.0, 1.0),   # 잔고/주문 조회 등 인증 API
+    "order": (5.0, 1.0),     # 주문/취소/레버리지 등 주문 경로
+}
+
+
+class HttpClientRegistry:
+    """
+    거래소별 공용 aiohttp 세션 레지스트리.
+
+    요청마다 ClientSession을 만들면 매번 DNS 조회와 TCP/TLS 핸드셰이크를 다시 하므로,
+    이벤트 루프(프로세스/피드 스레드)마다 거래소별 세션을 하나씩 만들어 keep-alive 연결을 재사용합니다.
+    세션은 해당 루프에서만 사용할 수 있으므로 {루프: {거래소: 세션}} 형태로 보관합니다.
+    limiter가 있으면 세션 middleware로 걸어 모든 요청이 거래소/엔드포인트 그룹별 요청 한도를 따르게 합니다.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, keepalive_timeout: float = 30.0,
+                 dns_ttl: int = 300, timeouts: dict[str, tuple[float, float]] | None = None,
+                 limiter: RateLimiter | None = rate_limiter):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.timeouts = {
+            kind: aiohttp.ClientTimeout(total=total, connect=connect)
+            for kind, (total, connect) in (timeouts or DEFAULT_TIMEOUTS).items()
+        }
+        self.limiter = limiter
+        self._sessions = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_TTL,
+        HTTP_TIMEOUT_MARKET, HTTP_TIMEOUT_ACCOUNT, HTTP_TIMEOUT_ORDER)로 생성합니다.
+        """
+        timeouts = {
+            kind: (float(os.getenv(f"HTTP_TIMEOUT_{kind.upper()}", total)), connect)
+            for kind, (total, connect) in DEFAULT_TIMEOUTS.items()
+        }
+        return cls(
+            limit=int(os.getenv("HTTP_POOL_LIMIT", 100)),
+            limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20)),
+            keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30)),
+            dns_ttl=int(os.getenv("HTTP_DNS_TTL", 300)),
+            timeouts=timeouts,
+        )
+
+    def session(self, venue: str) -> aiohttp.ClientSession:
+        """
+        현재 이벤트 루프에서 사용할 거래소 공용 세션을 반환합니다. (없거나 닫혔으면 생성)
+        코루틴 안에서 호출해야 합니다.
+        """
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.setdefault(loop, {})
+        session = sessions.get(venue)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_ttl,
+            )
+            middlewares = (self.limiter.middleware(venue),) if self.limiter is not None else ()
+            session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeouts["market"], middlewares=middlewares
+            )
+            sessions[venue] = session
+            logger.debug(f"[{venue}] HTTP 세션 생성")
+        return session
+
+    def timeout(self, kind: str) -> aiohttp.ClientTimeout:
+        """
+        엔드포인트 종류(market/account/order)별 타임아웃을 반환합니다.
+        """
+        return self.timeouts[kind]
+
+    async def close(self):
+        """
+        현재 이벤트 루프의 세션과 요청 한도 저장소 연결을 모두 닫습니다. (워커 종료/피드 스레드 종료 시 호출)
+        """
+        sessions = self._sessions.pop(asyncio.get_running_loop(), {})
+        for venue, session in sessions.items():
+            if not session.closed:
+                await session.close()
+        if sessions:
+            logger.info(f"HTTP 세션 종료: {', '.join(sessions)}")
+        if self.limiter is not None:
+            await self.limiter.close()
+
+
+http_clients = HttpClientRegistry.from_env()
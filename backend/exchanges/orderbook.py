@@ -0,0 +1,118 @@
+import itertools
+from operator import itemgetter
+import numpy as np
+
+# orderbook_units 한 레벨에서 (매도가, 매도량, 매수가, 매수량) 순으로 꺼냄
+_unit_fields = itemgetter("ask_price", "ask_size", "bid_price", "bid_size")
+
+
+class OrderbookSnapshot:
+    """
+    거래소 어댑터가 공통으로 반환하는 배열 기반 오더북 스냅샷.
+
+    매수/매도 호가를 레벨별 dict 대신 면(side)별 float64 가격/수량 배열로 보관합니다.
+    기존 호출부를 위해 snapshot["ticker"], snapshot["timestamp"], snapshot["orderbook"]
+    형태의 dict 접근을 지원하며, "orderbook" 레벨 리스트는 처음 접근할 때 한 번만 만들어집니다.
+
+    Attributes:
+        ticker (str): 티커 이름 (예: 'BTC')
+        timestamp (int | None): 거래소가 제공한 오더북 타임스탬프
+        ask_prices, ask_sizes (np.ndarray): 매도호가 가격/수량 (가격 오름차순)
+        bid_prices, bid_sizes (np.ndarray): 매수호가 가격/수량 (가격 내림차순)
+    """
+    __slots__ = ("ticker", "timestamp", "ask_prices", "ask_sizes", "bid_prices", "bid_sizes", "_levels")
+
+    def __init__(self, ticker: str, timestamp, ask_prices, ask_sizes, bid_prices, bid_sizes):
+        self.ticker = ticker
+        self.timestamp = timestamp
+        self.ask_prices = np.asarray(ask_prices, dtype=np.float64)
+        self.ask_sizes = np.asarray(ask_sizes, dtype=np.float64)
+        self.bid_prices = np.asarray(bid_prices, dtype=np.float64)
+        self.bid_sizes = np.asarray(bid_sizes, dtype=np.float64)
+        self._levels = None
+
+    @classmethod
+    def from_levels(cls, ticker: str, timestamp, asks, bids):
+        """
+        [[price, size], ...] 형태(문자열 허용)의 매도/매수 호가 배열로 스냅샷을 생성합니다.
+        매도/매수 호가의 레벨 수는 서로 달라도 됩니다.
+        """
+        # 레벨 리스트를 1차원으로 펼친 뒤 한 번에 변환 (중첩 리스트 변환보다 빠름)
+        asks = np.array(list(itertools.chain.from_iterable(asks)), dtype=np.float64).reshape(-1, 2)
+        bids = np.array(list(itertools.chain.from_iterable(bids)), dtype=np.float64).reshape(-1, 2)
+        return cls(ticker, timestamp, asks[:, 0], asks[:, 1], bids[:, 0], bids[:, 1])
+
+    @classmethod
+    def from_units(cls, ticker: str, timestamp, units: list[dict]):
+        """
+        Upbit/Bithumb의 orderbook_units([{ask_price, bid_price, ask_size, bid_size}, ...])로
+        스냅샷을 생성합니다.
+        """
+        # 레벨당 4개 값을 한 번에 꺼내 (n, 4) 배열로 변환
+        values = np.fromiter(
+            itertools.chain.from_iterable(map(_unit_fields, units)), dtype=np.float64, count=4 * len(units)
+        ).reshape(-1, 4)
+        return cls(ticker, timestamp, values[:, 0], values[:, 1], values[:, 2], values[:, 3])
+
+    def side(self, side: str):
+        """
+        한 면의 (가격, 수량) 배열을 반환합니다.
+
+        Args:
+            side (str): "ask" 또는 "bid"
+        """
+        if side == "ask":
+            return self.ask_prices, self.ask_sizes
+        if side == "bid":
+            return self.bid_prices, self.bid_sizes
+        raise ValueError("Invalid side: must be 'ask' or 'bid'")
+
+    @property
+    def best_ask(self) -> float | None:
+        return float(self.ask_prices[0]) if len(self.ask_prices) else None
+
+    @property
+    def best_bid(self) -> float | None:
+        return float(self.bid_prices[0]) if len(self.bid_prices) else None
+
+    @property
+    def levels(self) -> list[dict]:
+        """
+        기존 표준화 오더북과 동일한 레벨 dict 리스트 (지연 생성)
+        """
+        if self._levels is None:
+            self._levels = [
+                {
+                    "ask_price": ask_price,
+                    "bid_price": bid_price,
+                    "ask_size": ask_size,
+                    "bid_size": bid_size
+                }
+                for ask_price, ask_size, bid_price, bid_size in zip(
+                    self.ask_prices.tolist(), self.ask_sizes.tolist(),
+                    self.bid_prices.tolist(), self.bid_sizes.tolist()
+                )
+            ]
+        return self._levels
+
+    def to_dict(self) -> dict:
+        return {"ticker": self.ticker, "timestamp": self.timestamp, "orderbook": self.levels}
+
+    def __getitem__(self, key: str):
+        if key == "ticker":
+            return self.ticker
+        if key == "timestamp":
+            return self.timestamp
+        if key == "orderbook":
+            return self.levels
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return (f"OrderbookSnapshot(ticker={self.ticker!r}, timestamp={self.timestamp!r}, "
+                f"asks={len(self.ask_prices)}, bids={len(self.bid_prices)})")
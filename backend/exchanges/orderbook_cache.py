@@ -0,0 +1,182 @@
+import asyncio
+import functools
+import inspect
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class OrderbookCache:
+    """
+    거래소 어댑터의 get_ticker_orderbook 앞단에 두는 단기 오더북 캐시 (single-flight).
+
+    같은 (거래소, 티커) 요청이 동시에 들어오면 요청 깊이 이상으로 진행 중인 조회 하나를 함께 기다리고,
+    조회 결과는 ttl초 동안 재사용합니다. (신호가 몰릴 때 유저별 재확인이 같은 오더북을 중복 조회하지 않도록)
+    요청 깊이가 캐시된(또는 진행 중인) 조회 깊이 이하이면 더 깊은 오더북을 그대로 돌려줍니다.
+    조회가 실패하면 기다리던 요청 모두에 같은 예외가 전달되며 실패 결과는 캐시하지 않습니다.
+    ttl=0이면 결과 재사용 없이 동시 요청 병합만 합니다.
+    워커의 스레드 풀/피드 스레드 등 여러 스레드에서 함께 쓰므로 캐시 접근은 threading.Lock으로 보호합니다.
+    """
+
+    def __init__(self, ttl: float = 0.25, maxsize: int = 2048):
+        self.ttl = ttl
+        # {(거래소, 티커): (조회 깊이, 오더북)}
+        self._values = TTLCache(maxsize=maxsize, ttl=ttl, timer=time.monotonic) if ttl > 0 else None
+        # {event_loop: {(거래소, 티커): (조회 깊이, Future)}} ~ Future는 생성한 루프에서만 기다릴 수 있음
+        self._inflight = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.coalesced = 0
+        self.fetches = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(ORDERBOOK_CACHE_TTL, ORDERBOOK_CACHE_SIZE)로 생성합니다.
+        """
+        return cls(
+            ttl=float(os.getenv("ORDERBOOK_CACHE_TTL", 0.25)),
+            maxsize=int(os.getenv("ORDERBOOK_CACHE_SIZE", 2048)),
+        )
+
+    async def get_many(self, venue: str, tickers: list[str], depth, fetch) -> dict:
+        """
+        여러 티커의 오더북을 캐시 → 진행 중인 조회 → 새 조회 순으로 가져옵니다.
+
+        Args:
+            venue: 거래소 이름
+            tickers: 티커 리스트
+            depth: 조회 깊이 ~ 이 깊이 이상으로 조회한 오더북만 재사용 (None이면 제한 없음으로 취급)
+            fetch: 캐시에 없는 티커 리스트를 받아 {ticker: orderbook}을 반환하는 코루틴 함수
+
+        Returns:
+            dict: {ticker: orderbook} ~ 응답에 없는 티커는 제외
+        """
+        if depth is None:
+            # 깊이를 지정하지 않은 조회(거래소 최대/기본 깊이)는 어떤 깊이보다도 깊은 것으로 비교
+            depth = math.inf
+        loop = asyncio.get_running_loop()
+        found, waiting, missing = {}, {}, []
+        with self._lock:
+            inflight = self._inflight.setdefault(loop, {})
+            for ticker in dict.fromkeys(tickers):
+                key = (venue, ticker)
+                cached = self._values.get(key) if self._values is not None else None
+                pending = inflight.get(key)
+                if cached is not None and cached[0] >= depth:
+                    found[ticker] = cached[1]
+                    self.hits += 1
+                elif pending is not None and pending[0] >= depth:
+                    waiting[ticker] = pending[1]
+                    self.coalesced += 1
+                else:
+                    missing.append(ticker)
+
+            futures = {ticker: loop.create_future() for ticker in missing}
+            for ticker, future in futures.items():
+                inflight[(venue, ticker)] = (depth, future)
+            if missing:
+                self.fetches += 1
+
+        if missing:
+            try:
+                fetched = await fetch(missing)
+            except BaseException as e:
+                for future in futures.values():
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                        # 기다리는 요청이 없어도 미처리 예외 경고가 남지 않도록 조회 처리
+                        future.exception()
+                raise
+            finally:
+                with self._lock:
+                    for ticker, future in futures.items():
+                        # 그 사이 더 깊은 조회가 등록되었으면 그대로 둠
+                        if inflight.get((venue, ticker), (None, None))[1] is future:
+                            del inflight[(venue, ticker)]
+            with self._lock:
+                for ticker, future in futures.items():
+                    value = fetched.get(ticker)
+                    future.set_result(value)
+                    if value is None:
+                        continue
+                    found[ticker] = value
+                    if self._values is not None:
+                        cached = self._values.get((venue, ticker))
+                        if cached is None or depth >= cached[0]:
+                            self._values[(venue, ticker)] = (depth, value)
+
+        for ticker, future in waiting.items():
+            # 한 요청이 취소되어도 공유 조회는 취소되지 않도록 shield
+            value = await asyncio.shield(future)
+            if value is not None:
+                found[ticker] = value
+        return found
+
+    def cached(self, depth_arg: str, batch: bool = False):
+        """
+        어댑터의 get_ticker_orderbook classmethod에 캐시를 적용하는 데코레이터.
+
+        Args:
+            depth_arg: 조회 깊이 인자 이름 (예: 'count', 'limit')
+            batch: True이면 티커 리스트를 받아 오더북 리스트를 반환하는 한국거래소 형식,
+                   False이면 티커 하나를 받아 오더북 하나를 반환하는 해외거래소 형식
+        """
+        def decorator(func):
+            signature = inspect.signature(func)
+            ticker_arg = list(signature.parameters)[1]
+
+            @functools.wraps(func)
+            async def wrapper(cls, *args, **kwargs):
+                bound = signature.bind(cls, *args, **kwargs)
+                bound.apply_defaults()
+                depth = bound.arguments[depth_arg]
+
+                async def fetch(tickers):
+                    bound.arguments[ticker_arg] = tickers if batch else tickers[0]
+                    result = await func(*bound.args, **bound.kwargs)
+                    if batch:
+                        return {orderbook.ticker: orderbook for orderbook in result}
+                    return {tickers[0]: result}
+
+                if batch:
+                    tickers = bound.arguments[ticker_arg]
+                    found = await self.get_many(cls.name, tickers, depth, fetch)
+                    return [found[ticker] for ticker in dict.fromkeys(tickers) if ticker in found]
+                ticker = bound.arguments[ticker_arg]
+                return (await self.get_many(cls.name, [ticker], depth, fetch)).get(ticker)
+            return wrapper
+        return decorator
+
+    def clear(self):
+        if self._values is not None:
+            with self._lock:
+                self._values.clear()
+
+    def stats(self) -> dict:
+        """
+        누적 통계 ~ {'hits', 'coalesced', 'fetches', 'size'}
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'coalesced': self.coalesced,
+                'fetches': self.fetches,
+                'size': len(self._values) if self._values is not None else 0
+            }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.coalesced = 0
+        self.fetches = 0
+
+
+orderbook_cache = OrderbookCache.from_env()
@@ -0,0 +1,96 @@
+import json
+import numpy as np
+from .orderbook import OrderbookSnapshot
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 파싱
+    orjson = None
+
+
+def loads(raw: bytes | str):
+    """
+    응답/메시지 본문(bytes 또는 str)을 파싱합니다. orjson이 설치되어 있으면 orjson 사용
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _split_levels(raw: bytes, keys: tuple[bytes, ...]):
+    """
+    응답 본문에서 [["가격", "수량"], ...] 형태의 호가 배열 구간을 잘라내 바로 float 배열로 변환합니다.
+    레벨마다 파이썬 리스트/문자열을 만들지 않도록 따옴표와 괄호를 지운 평탄한 숫자 배열 하나로 파싱하고,
+    나머지 본문(호가 배열 자리는 [])은 작은 dict로 따로 파싱합니다.
+
+    Returns:
+        tuple[dict, list[np.ndarray]] | None: (나머지 본문, 키별 (n, 2) 배열), 형식이 예상과 다르면 None
+    """
+    parts, levels, position = [], [], 0
+    for key in keys:
+        start = raw.find(key, position)
+        if start < 0 or raw.find(key, start + 1) >= 0:
+            return None
+        start += len(key)
+        end = start + 2 if raw.startswith(b"[]", start) else raw.find(b"]]", start) + 2
+        if end < 2:
+            return None
+        numbers = raw[start:end].translate(None, b'"[]')
+        levels.append(np.array(loads(b"[" + numbers + b"]"), dtype=np.float64).reshape(-1, 2))
+        parts += [raw[position:start], b"[]"]
+        position = end
+    parts.append(raw[position:])
+    return loads(b"".join(parts)), levels
+
+
+def _snapshot(ticker: str, timestamp, asks: np.ndarray, bids: np.ndarray) -> OrderbookSnapshot:
+    return OrderbookSnapshot(ticker, timestamp, asks[:, 0], asks[:, 1], bids[:, 0], bids[:, 1])
+
+
+def units_orderbooks(raw: bytes) -> list[OrderbookSnapshot]:
+    """
+    Upbit/Bithumb /v1/orderbook 응답 본문을 오더북 스냅샷 리스트로 변환합니다.
+    """
+    return [
+        OrderbookSnapshot.from_units(
+            orderbook_data["market"].replace("KRW-", ""),
+            orderbook_data["timestamp"],
+            orderbook_data["orderbook_units"]
+        )
+        for orderbook_data in loads(raw)
+    ]
+
+
+def bybit_orderbook(raw: bytes, ticker: str) -> OrderbookSnapshot:
+    """
+    Bybit /v5/market/orderbook 응답 본문을 오더북 스냅샷으로 변환합니다.
+
+    Raises:
+        Exception: retCode가 0이 아닌 경우
+    """
+    split = _split_levels(raw, (b'"a":', b'"b":'))
+    if split is None:
+        # 예상과 다른 형식 ~ 일반 파싱
+        response = loads(raw)
+        if response.get("retCode") != 0:
+            raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+        orderbook_data = response["result"]
+        return OrderbookSnapshot.from_levels(ticker, orderbook_data["ts"], orderbook_data["a"], orderbook_data["b"])
+    response, (asks, bids) = split
+    if response.get("retCode") != 0:
+        raise Exception(f"Bybit API Error: {response.get('retMsg')}")
+    return _snapshot(ticker, response["result"]["ts"], asks, bids)
+
+
+def gateio_orderbook(raw: bytes, ticker: str) -> OrderbookSnapshot:
+    """
+    Gate.io /spot/order_book 응답 본문을 오더북 스냅샷으로 변환합니다.
+    """
+    split = _split_levels(raw, (b'"asks":', b'"bids":'))
+    if split is None:
+        orderbook_data = loads(raw)
+        return OrderbookSnapshot.from_levels(
+            ticker, orderbook_data.get("update_time", None), orderbook_data["asks"], orderbook_data["bids"]
+        )
+    orderbook_data, (asks, bids) = split
+    return _snapshot(ticker, orderbook_data.get("update_time", None), asks, bids)
@@ -0,0 +1,479 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import weakref
+import dotenv
+import redis.asyncio as aioredis
+from backend.utils.env import env_flag
+
+dotenv.load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 거래소/엔드포인트 그룹별 기본 한도 ~ (초당 요청 수, 버스트 허용량), 각 거래소 공개 한도 기준
+DEFAULT_LIMITS = {
+    "upbit": {
+        # 시세 조회 ~ 그룹마다 별도로 초당 10회
+        "market": (10, 10),
+        "candle": (10, 10),
+        "ticker": (10, 10),
+        "orderbook": (10, 10),
+        "trade": (10, 10),
+        "exchange": (30, 30),    # 계좌/주문 조회/입출금 (default 그룹 초당 30회)
+        "order": (8, 8),         # 주문 생성/취소 (초당 8회)
+    },
+    "bithumb": {
+        "quotation": (150, 150),
+        "exchange": (140, 140),
+        "order": (140, 140),
+    },
+    "bybit": {
+        "quotation": (120, 120),  # IP당 5초 600회
+        "exchange": (50, 50),     # 포지션/주문/잔고 조회
+        "order": (10, 10),        # 주문 생성/레버리지 변경
+        "wallet": (5, 5),         # 자산(입출금) 조회
+    },
+    "gateio": {
+        "quotation": (20, 20),    # 공개 API 10초 200회
+    },
+}
+
+# (HTTP 메서드 또는 None, 경로 접두사, 그룹) ~ 위에서부터 처음 일치하는 규칙 사용, 없으면 DEFAULT_GROUPS
+GROUP_RULES = {
+    "upbit": [
+        ("POST", "/v1/orders", "order"),
+        ("DELETE", "/v1/order", "order"),
+        (None, "/v1/market", "market"),
+        (None, "/v1/orderbook", "orderbook"),
+        (None, "/v1/candles", "candle"),
+        (None, "/v1/ticker", "ticker"),
+        (None, "/v1/trades", "trade"),
+    ],
+    "bithumb": [
+        ("POST", "/v1/orders", "order"),
+        ("DELETE", "/v1/order", "order"),
+        (None, "/v1/market", "quotation"),
+        (None, "/v1/orderbook", "quotation"),
+        (None, "/v1/candles", "quotation"),
+        (None, "/v1/ticker", "quotation"),
+        (None, "/v1/trades", "quotation"),
+    ],
+    "bybit": [
+        (None, "/v5/market", "quotation"),
+        (None, "/v5/order/create", "order"),
+        (None, "/v5/order/cancel", "order"),
+        (None, "/v5/position/set-leverage", "order"),
+        (None, "/v5/asset", "wallet"),
+    ],
+    "gateio": [],
+}
+DEFAULT_GROUPS = {
+    "upbit": "exchange",
+    "bithumb": "exchange",
+    "bybit": "exchange",
+    "gateio": "quotation",  # 공개 API만 사용
+}
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷.
+
+    acquire는 토큰을 먼저 예약(잔량이 음수가 될 수 있음)한 뒤 부족분만큼 기다리므로 대기 순서대로 간격이 벌어집니다.
+    피드 스레드(별도 이벤트 루프)와 같은 버킷을 공유하므로 상태는 threading.Lock으로 보호합니다.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()  # 이 시각 이후부터 충전 (차단 중이면 미래 시각)
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def blocked_for(self) -> float:
+        """
+        차단(헤더/429 백오프)이 풀릴 때까지 남은 시간(초)
+        """
+        with self._lock:
+            return max(0.0, self._updated - time.monotonic())
+
+    def reserve(self) -> float:
+        """
+        토큰 하나를 예약하고 보내기 전에 기다려야 할 시간(초)을 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            deficit = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(0.0, self._updated - now) + deficit
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, remaining: float, reset_in: float = 1.0):
+        """
+        응답 헤더의 남은 요청 수로 잔량을 줄입니다. (같은 IP의 다른 프로세스가 쓴 몫 반영)
+        남은 요청이 없으면 reset_in초 동안 충전을 멈춥니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, remaining)
+            self._failures = 0
+            if remaining <= 0:
+                self._updated = max(self._updated, now + reset_in)
+
+    def penalize(self, delay: float | None = None, base: float = 0.5, max_delay: float = 60.0) -> float:
+        """
+        429 등 한도 초과 응답 후 delay초(없으면 연속 실패 횟수에 따른 지수 백오프) 동안 요청을 멈춥니다.
+
+        Returns:
+            float: 적용한 대기 시간(초)
+        """
+        with self._lock:
+            if delay is None:
+                delay = min(max_delay, base * (2 ** self._failures))
+            self._failures += 1
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + delay)
+            return delay
+
+
+# GCRA(Generic Cell Rate Algorithm) ~ 키 하나(TAT: 다음 요청의 이론적 도착 시각)로 토큰 버킷과 같은 동작
+# ARGV: rate, burst, op(acquire|update|block), value(남은 요청 수 또는 차단 시간), reset_in
+# acquire는 요청 하나를 예약하고 기다려야 할 시간(초)을 반환. 시각은 Redis TIME 기준이라 프로세스 간 시계 차이 영향 없음
+GCRA_SCRIPT = """
+local interval = 1 / tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local op = ARGV[3]
+local value = tonumber(ARGV[4])
+local reset_in = tonumber(ARGV[5])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local wait = 0
+if op == 'acquire' then
+    tat = tat + interval
+    wait = math.max(0, tat - burst * interval - now)
+else
+    local floor
+    if op == 'update' and value > 0 then
+        floor = now + (burst - value) * interval
+    elseif op == 'update' then
+        floor = now + reset_in + burst * interval
+    else
+        floor = now + value + burst * interval
+    end
+    tat = math.max(tat, floor)
+end
+redis.call('SET', KEYS[1], string.format('%.6f', tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+return string.format('%.6f', wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    같은 송신 IP(egress)를 쓰는 프로세스들이 함께 쓰는 Redis 요청 한도 상태.
+
+    거래소는 IP 단위로 요청 수를 세므로 Celery 자식 프로세스, 스케줄러, FastAPI 워커가
+    (egress, 거래소, 그룹)마다 GCRA 키 하나를 Lua 스크립트로 원자적으로 갱신하여 한 예산을 나눠 씁니다.
+    Redis 연결은 이벤트 루프마다 만들고, 장애 시 retry_interval초 동안은 조회하지 않고 None을 반환하여
+    각 프로세스의 로컬 버킷으로 동작하게 합니다.
+    """
+
+    def __init__(self, url: str, egress: str, prefix: str = "ratelimit", retry_interval: float = 5.0,
+                 timeout: float = 0.2):
+        self.url = url
+        self.egress = egress
+        self.prefix = prefix
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+        self._clients = weakref.WeakKeyDictionary()  # {event_loop: (client, script)}
+        self._down_until = 0.0
+
+    def key(self, venue: str, group: str) -> str:
+        return f"{self.prefix}:{self.egress}:{venue}:{group}"
+
+    def _script(self):
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            client = aioredis.from_url(self.url, socket_timeout=self.timeout, socket_connect_timeout=self.timeout)
+            entry = self._clients[loop] = (client, client.register_script(GCRA_SCRIPT))
+        return entry[1]
+
+    async def eval(self, key: str, rate: float, capacity: float, op: str, value: float = 0.0,
+                   reset_in: float = 0.0) -> float | None:
+        """
+        GCRA 스크립트를 실행합니다.
+
+        Returns:
+            float | None: acquire면 대기 시간(초), Redis를 사용할 수 없으면 None
+        """
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            wait = await self._script()(keys=[key], args=[rate, capacity, op, value, reset_in])
+            return float(wait)
+        except (aioredis.RedisError, OSError, asyncio.TimeoutError) as e:
+            self._down_until = time.monotonic() + self.retry_interval
+            logger.warning(f"공유 요청 한도 저장소 사용 불가, {self.retry_interval}초간 로컬 한도 사용: {e}")
+            return None
+
+    async def close(self):
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].aclose()
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    RedisBucketStore에 상태를 두는 토큰 버킷. Redis를 쓸 수 없을 때는 로컬 토큰 버킷으로 동작합니다.
+
+    헤더 보정과 429 백오프는 로컬 버킷에 즉시 반영하고 공유 상태에는 백그라운드로 기록하므로,
+    응답 처리 경로가 Redis 왕복을 기다리지 않습니다.
+    """
+
+    def __init__(self, store: RedisBucketStore, key: str, rate: float, capacity: float | None = None):
+        super().__init__(rate, capacity)
+        self.store = store
+        self.key = key
+        self._pending = set()
+
+    async def acquire(self):
+        delay = await self.store.eval(self.key, self.rate, self.capacity, "acquire")
+        if delay is None:
+            delay = self.reserve()
+        else:
+            # 이 프로세스가 받은 429 백오프는 공유 상태 기록 전에도 지킴
+            delay = max(delay, self.blocked_for())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _publish(self, op: str, value: float, reset_in: float = 0.0):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.store.eval(self.key, self.rate, self.capacity, op, value, reset_in))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def update(self, remaining: float, reset_in: float = 1.0):
+        super().update(remaining, reset_in)
+        self._publish("update", remaining, reset_in)
+
+    def penalize(self, delay: float | None = None, base: float = 0.5, max_delay: float = 60.0) -> float:
+        delay = super().penalize(delay, base, max_delay)
+        self._publish("block", delay)
+        return delay
+
+
+def _parse_remaining_req(headers) -> tuple[float, float, str | None] | None:
+    """
+    Upbit/Bithumb Remaining-Req 헤더 (예: 'group=default; min=1799; sec=29') ~ 초 단위 창과 헤더의 그룹 이름
+    """
+    value = headers.get("Remaining-Req")
+    if not value:
+        return None
+    fields = dict(
+        part.strip().split("=", 1) for part in value.split(";") if "=" in part
+    )
+    if "sec" not in fields:
+        return None
+    return float(fields["sec"]), 1.0, fields.get("group")
+
+
+def _parse_reset_timestamp(remaining: str | None, reset: str | None) -> tuple[float, float, None] | None:
+    if remaining is None:
+        return None
+    reset_in = 1.0
+    if reset:
+        reset_at = float(reset)
+        if reset_at > 1e11:  # 밀리초
+            reset_at /= 1000
+        reset_in = max(0.0, reset_at - time.time())
+    return float(remaining), reset_in, None
+
+
+HEADER_PARSERS = {
+    "upbit": _parse_remaining_req,
+    "bithumb": _parse_remaining_req,
+    "bybit": lambda headers: _parse_reset_timestamp(
+        headers.get("X-Bapi-Limit-Status"), headers.get("X-Bapi-Limit-Reset-Timestamp")
+    ),
+    "gateio": lambda headers: _parse_reset_timestamp(
+        headers.get("X-Gate-RateLimit-Requests-Remain"), headers.get("X-Gate-RateLimit-Reset-Timestamp")
+    ),
+}
+# 헤더의 group 필드로 보정할 버킷을 고르는 거래소 ~ {헤더 그룹 이름: 버킷 그룹}, 없는 이름은 그대로 사용
+# 헤더가 요청과 다른 그룹(예: candles)의 잔량을 알려줘도 해당 그룹 버킷만 보정
+HEADER_GROUPS = {
+    "upbit": {"default": "exchange", "candles": "candle", "trades": "trade"},
+}
+# UID 기준 헤더(비공개 엔드포인트에만 붙음)를 주는 거래소 ~ IP 기준 quotation 버킷에는 적용하지 않음
+UID_HEADER_VENUES = {"bybit"}
+
+
+class RateLimiter:
+    """
+    거래소/엔드포인트 그룹(quotation, exchange, order, wallet)별 토큰 버킷 모음.
+    Upbit 시세 조회는 거래소 문서대로 market/candle/ticker/orderbook/trade 그룹마다 별도 버킷을 씁니다.
+
+    공용 HTTP 세션(HttpClientRegistry)의 client middleware로 걸려 있어, 어댑터의 모든 REST 요청은
+    보내기 전에 해당 그룹 버킷에서 토큰을 받고, 응답 헤더의 남은 요청 수로 버킷을 보정합니다.
+    429(Upbit 418 포함) 응답을 받으면 Retry-After 또는 지수 백오프만큼 그룹 전체를 멈춥니다.
+    대기 시간도 요청 타임아웃에 포함되므로, 한도를 넘는 요청은 늦게 보내지지 않고 타임아웃으로 실패합니다.
+    store가 있으면 같은 송신 IP를 쓰는 프로세스들이 버킷 상태를 공유합니다.
+    """
+
+    def __init__(self, limits: dict[str, dict[str, tuple[float, float]]] | None = None, enabled: bool = True,
+                 max_backoff: float = 60.0, store: RedisBucketStore | None = None):
+        self.limits = limits or DEFAULT_LIMITS
+        self.enabled = enabled
+        self.max_backoff = max_backoff
+        self.store = store
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(RATE_LIMIT_ENABLED, RATE_LIMIT_MAX_BACKOFF, RATE_LIMIT_<거래소>_<그룹>='초당요청수[/버스트]')로 생성합니다.
+        예: RATE_LIMIT_UPBIT_EXCHANGE=25/25
+
+        RATE_LIMIT_REDIS_URL이 있으면 (호스트 로컬 Redis 권장) 버킷 상태를 프로세스 간에 공유합니다.
+        RATE_LIMIT_EGRESS_ID(기본값: 호스트 이름)가 같은 프로세스끼리 한 예산을 쓰므로,
+        NAT 등으로 송신 IP를 공유하는 호스트는 같은 값을 지정합니다.
+        """
+        limits = {}
+        for venue, groups in DEFAULT_LIMITS.items():
+            limits[venue] = {}
+            for group, (rate, capacity) in groups.items():
+                value = os.getenv(f"RATE_LIMIT_{venue.upper()}_{group.upper()}")
+                if value:
+                    rate, _, burst = value.partition("/")
+                    rate = float(rate)
+                    capacity = float(burst) if burst else rate
+                limits[venue][group] = (rate, capacity)
+        redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+        store = None
+        if redis_url:
+            store = RedisBucketStore(redis_url, egress=os.getenv("RATE_LIMIT_EGRESS_ID") or socket.gethostname())
+        return cls(
+            limits=limits,
+            enabled=env_flag("RATE_LIMIT_ENABLED", True),
+            max_backoff=float(os.getenv("RATE_LIMIT_MAX_BACKOFF", 60)),
+            store=store,
+        )
+
+    def group(self, venue: str, method: str, path: str) -> str:
+        """
+        요청의 엔드포인트 그룹을 반환합니다.
+        """
+        for rule_method, prefix, group in GROUP_RULES.get(venue, []):
+            if (rule_method is None or rule_method == method) and path.startswith(prefix):
+                return group
+        return DEFAULT_GROUPS.get(venue, "exchange")
+
+    def bucket(self, venue: str, group: str) -> TokenBucket | None:
+        """
+        (거래소, 그룹) 버킷을 반환합니다. 한도가 정의되지 않은 그룹이면 None.
+        """
+        key = (venue, group)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limit = self.limits.get(venue, {}).get(group)
+            if limit is None:
+                return None
+            if self.store is not None:
+                bucket = SharedTokenBucket(self.store, self.store.key(venue, group), *limit)
+            else:
+                bucket = TokenBucket(*limit)
+            with self._lock:
+                bucket = self._buckets.setdefault(key, bucket)
+        return bucket
+
+    async def acquire(self, venue: str, group: str):
+        if not self.enabled:
+            return
+        bucket = self.bucket(venue, group)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def observe(self, venue: str, group: str, status: int, headers):
+        """
+        응답 상태와 헤더로 버킷을 보정합니다.
+        """
+        bucket = self.bucket(venue, group)
+        if bucket is None:
+            return
+        if status in (429, 418):
+            retry_after = headers.get("Retry-After")
+            try:
+                delay = min(float(retry_after), self.max_backoff) if retry_after else None
+            except ValueError:
+                delay = None
+            delay = bucket.penalize(delay, max_delay=self.max_backoff)
+            logger.warning(f"[{venue}] {group} 요청 한도 초과 (HTTP {status}), {delay:.2f}초 대기")
+            return
+        parser = HEADER_PARSERS.get(venue)
+        try:
+            parsed = parser(headers) if parser is not None else None
+        except (ValueError, TypeError) as e:
+            logger.debug(f"[{venue}] rate limit header parse failed: {e}")
+            return
+        if parsed is None:
+            return
+        remaining, reset_in, header_group = parsed
+        if venue in HEADER_GROUPS:
+            if header_group is None:
+                return
+            aliases = HEADER_GROUPS[venue]
+            target = aliases.get(header_group, header_group)
+            if target != group:
+                bucket = self.bucket(venue, target)
+                if bucket is None:
+                    return
+        elif venue in UID_HEADER_VENUES and group == "quotation":
+            return
+        bucket.update(remaining, reset_in)
+
+    def middleware(self, venue: str):
+        """
+        거래소 세션에 거는 aiohttp client middleware를 반환합니다.
+        """
+        async def rate_limit_middleware(request, handler):
+            if not self.enabled:
+                return await handler(request)
+            group = self.group(venue, request.method, request.url.path)
+            await self.acquire(venue, group)
+            response = await handler(request)
+            self.observe(venue, group, response.status, response.headers)
+            return response
+        return rate_limit_middleware
+
+    async def close(self):
+        """
+        현재 이벤트 루프의 공유 저장소 연결을 닫습니다.
+        """
+        if self.store is not None:
+            await self.store.close()
+
+
+rate_limiter = RateLimiter.from_env()
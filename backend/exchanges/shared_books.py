@@ -0,0 +1,337 @@
+import logging
+import mmap
+import os
+import time
+import numpy as np
+from .orderbook import OrderbookSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"KIMPBOOK"
+VERSION = 2
+HEADER_SIZE = 64
+KEY_SIZE = 32
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("slots", "<u4"),
+    ("levels", "<u4"),
+    ("used", "<u4"),
+    ("heartbeat", "<f8"),
+    ("pid", "<u8"),
+    ("generation", "<u8"),
+])
+
+
+def slot_dtype(levels: int) -> np.dtype:
+    """
+    오더북 한 개를 담는 슬롯 레이아웃 ~ book은 [ask_prices, ask_sizes, bid_prices, bid_sizes] x levels
+    """
+    return np.dtype([
+        ("seq", "<u8"),
+        ("timestamp", "<f8"),
+        ("received_at", "<f8"),
+        ("n_asks", "<u4"),
+        ("n_bids", "<u4"),
+        ("key", f"S{KEY_SIZE}"),
+        ("book", "<f8", (4, levels)),
+    ])
+
+
+class SharedBookStore:
+    """
+    마켓데이터 데몬이 쓰고 워커가 읽는 공유 메모리(mmap) 오더북 테이블.
+
+    파일(기본 /dev/shm 아래) 하나에 헤더와 고정 크기 슬롯 배열을 두고, (거래소, 티커)마다 슬롯 하나를 배정합니다.
+    슬롯마다 seqlock(seq가 홀수면 쓰는 중)으로 보호하므로 쓰기 프로세스는 잠금 없이 갱신하고,
+    읽기 프로세스는 매핑된 배열에서 직접 복사한 뒤 seq가 그대로인지 확인하여 찢어진 읽기를 버립니다.
+    슬롯 배정은 데몬만 합니다. 새 슬롯은 키를 쓴 뒤에 used 카운트를 증가시키고,
+    유니버스에서 빠진 티커의 슬롯은 remove()로 비워 다음 배정에 재사용합니다.
+    슬롯을 비우거나 재사용하면 generation을 증가시켜 읽기 프로세스가 인덱스를 다시 만들도록 하며,
+    읽기 프로세스는 읽은 슬롯의 키가 요청한 키와 같은지도 확인합니다.
+    """
+
+    def __init__(self, path: str, mm: mmap.mmap, writable: bool):
+        self.path = path
+        self._mm = mm
+        self.writable = writable
+        self._header = np.ndarray((), dtype=HEADER_DTYPE, buffer=mm, offset=0)
+        self.slots = int(self._header["slots"])
+        self.levels = int(self._header["levels"])
+        self._slots = np.ndarray((self.slots,), dtype=slot_dtype(self.levels), buffer=mm, offset=HEADER_SIZE)
+        self._index: dict[tuple[str, str], int] = {}
+        self._indexed = 0
+        self._generation = int(self._header["generation"])
+        self._free: list[int] = []  # 비운 슬롯 (데몬)
+
+    @classmethod
+    def create(cls, path: str, slots: int = 1024, levels: int = 200):
+        """
+        새 공유 메모리 파일을 만들고 쓰기용으로 엽니다.
+        기존 파일을 연 읽기 프로세스가 섞이지 않도록 임시 파일을 만든 뒤 rename으로 교체합니다.
+        """
+        size = HEADER_SIZE + slots * slot_dtype(levels).itemsize
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.truncate(size)
+        with open(tmp_path, "r+b") as file:
+            mm = mmap.mmap(file.fileno(), size)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=mm, offset=0)
+        header["version"] = VERSION
+        header["slots"] = slots
+        header["levels"] = levels
+        header["pid"] = os.getpid()
+        header["heartbeat"] = time.time()
+        header["magic"] = MAGIC
+        os.replace(tmp_path, path)
+        return cls(path, mm, writable=True)
+
+    @classmethod
+    def open(cls, path: str):
+        """
+        데몬이 만든 공유 메모리 파일을 읽기용으로 엽니다. 없거나 형식이 다르면 None.
+        """
+        try:
+            with open(path, "rb") as file:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=mm, offset=0)
+        valid = bytes(header["magic"]) == MAGIC and int(header["version"]) == VERSION
+        del header
+        if not valid:
+            logger.warning(f"공유 오더북 파일 형식이 다릅니다: {path}")
+            mm.close()
+            return None
+        return cls(path, mm, writable=False)
+
+    # ===== 데몬 상태 =====
+
+    def heartbeat(self):
+        self._header["heartbeat"] = time.time()
+
+    def heartbeat_age(self) -> float:
+        """
+        데몬이 마지막으로 heartbeat를 기록한 후 경과 시간(초)
+        """
+        return time.time() - float(self._header["heartbeat"])
+
+    # ===== 쓰기 (데몬) =====
+
+    def _slot(self, venue: str, ticker: str, assign: bool = False) -> int | None:
+        key = (venue, ticker)
+        generation = int(self._header["generation"])
+        if generation != self._generation:
+            # 다른 프로세스가 슬롯을 비우거나 재사용함 ~ 처음부터 다시 인덱싱
+            self._index.clear()
+            self._indexed = 0
+            self._generation = generation
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        used = int(self._header["used"])
+        if used != self._indexed:
+            # 다른 프로세스가 새로 배정한 슬롯 반영
+            for i in range(self._indexed, used):
+                name = bytes(self._slots[i]["key"]).decode()
+                if not name:
+                    continue
+                slot_venue, _, slot_ticker = name.partition(":")
+                self._index[(slot_venue, slot_ticker)] = i
+            self._indexed = used
+            index = self._index.get(key)
+        if index is not None or not assign:
+            return index
+        if self._free:
+            index = self._free.pop()
+            self._slots[index]["key"] = f"{venue}:{ticker}".encode()[:KEY_SIZE]
+            self._bump_generation()
+            self._index[key] = index
+            return index
+        if used >= self.slots:
+            logger.error(f"공유 오더북 슬롯 부족 ({self.slots}개), {venue}:{ticker} 생략")
+            return None
+        self._slots[used]["key"] = f"{venue}:{ticker}".encode()[:KEY_SIZE]
+        self._header["used"] = used + 1
+        self._index[key] = used
+        self._indexed = used + 1
+        return used
+
+    def write(self, venue: str, ticker: str, snapshot: OrderbookSnapshot, received_at: float | None = None):
+        """
+        오더북 스냅샷을 슬롯에 기록합니다. (levels를 넘는 호가는 잘림)
+        """
+        index = self._slot(venue, ticker, assign=True)
+        if index is None:
+            return
+        slot = self._slots[index]
+        n_asks = min(len(snapshot.ask_prices), self.levels)
+        n_bids = min(len(snapshot.bid_prices), self.levels)
+        seq = int(slot["seq"])
+        # seqlock ~ 홀수 seq 동안은 읽기 프로세스가 결과를 버림
+        slot["seq"] = seq + 1
+        slot["timestamp"] = np.nan if snapshot.timestamp is None else snapshot.timestamp
+        slot["received_at"] = time.time() if received_at is None else received_at
+        slot["n_asks"] = n_asks
+        slot["n_bids"] = n_bids
+        book = slot["book"]
+        book[0, :n_asks] = snapshot.ask_prices[:n_asks]
+        book[1, :n_asks] = snapshot.ask_sizes[:n_asks]
+        book[2, :n_bids] = snapshot.bid_prices[:n_bids]
+        book[3, :n_bids] = snapshot.bid_sizes[:n_bids]
+        slot["seq"] = seq + 2
+
+    def remove(self, venue: str, ticker: str):
+        """
+        슬롯을 비워 다음 배정에 재사용합니다. (거래 유니버스에서 빠진 티커)
+        """
+        index = self._slot(venue, ticker)
+        if index is None:
+            return
+        slot = self._slots[index]
+        seq = int(slot["seq"])
+        slot["seq"] = seq + 1
+        slot["key"] = b""
+        slot["n_asks"] = 0
+        slot["n_bids"] = 0
+        # seq 0 = 기록 전 ~ 재사용 전까지 읽기 프로세스는 None을 받음
+        slot["seq"] = 0
+        del self._index[(venue, ticker)]
+        self._free.append(index)
+        self._bump_generation()
+
+    def _bump_generation(self):
+        self._generation = int(self._header["generation"]) + 1
+        self._header["generation"] = self._generation
+
+    def touch(self, venue: str, ticker: str, received_at: float):
+        """
+        오더북 변화 없이 수신 시각만 갱신합니다. (스트림 연결이 살아있는 동안 변화 없는 오더북도 최신으로 취급)
+        """
+        index = self._slot(venue, ticker)
+        if index is None:
+            return
+        slot = self._slots[index]
+        seq = int(slot["seq"])
+        slot["seq"] = seq + 1
+        slot["received_at"] = received_at
+        slot["seq"] = seq + 2
+
+    # ===== 읽기 (워커) =====
+
+    def read(self, venue: str, ticker: str, retries: int = 8) -> tuple[OrderbookSnapshot, float] | None:
+        """
+        슬롯의 오더북을 (스냅샷, 수신 시각)으로 반환합니다. 슬롯이 없거나 계속 쓰는 중이면 None.
+        """
+        index = self._slot(venue, ticker)
+        if index is None:
+            return None
+        slot = self._slots[index]
+        expected = f"{venue}:{ticker}".encode()[:KEY_SIZE]
+        for _ in range(retries):
+            seq = int(slot["seq"])
+            if seq == 0:
+                return None
+            if seq & 1:
+                continue
+            timestamp = float(slot["timestamp"])
+            received_at = float(slot["received_at"])
+            n_asks = int(slot["n_asks"])
+            n_bids = int(slot["n_bids"])
+            book = slot["book"]
+            ask_prices, ask_sizes = book[0, :n_asks].copy(), book[1, :n_asks].copy()
+            bid_prices, bid_sizes = book[2, :n_bids].copy(), book[3, :n_bids].copy()
+            key = bytes(slot["key"])
+            if int(slot["seq"]) != seq:
+                continue
+            if key != expected:
+                # 인덱싱 후 슬롯이 비워지거나 다른 티커에 재사용됨
+                self._index.pop((venue, ticker), None)
+                return None
+            timestamp = None if np.isnan(timestamp) else int(timestamp)
+            return OrderbookSnapshot(ticker, timestamp, ask_prices, ask_sizes, bid_prices, bid_sizes), received_at
+        return None
+
+    def close(self):
+        # 매핑을 참조하는 배열을 먼저 해제해야 mmap을 닫을 수 있음
+        self._header = self._slots = None
+        self._mm.close()
+
+
+class SharedBookFeed:
+    """
+    공유 메모리 오더북을 거래소 어댑터의 orderbook_feed로 노출하는 읽기 전용 피드.
+
+    데몬의 heartbeat가 끊겼거나 오더북이 max_age초보다 오래되었으면 None을 반환하여
+    어댑터가 REST로 직접 조회하도록 합니다. 데몬이 재시작되어 파일이 교체되면 다시 엽니다.
+    levels는 데몬이 띄운 원본 피드의 최대 호가 레벨 수입니다. (슬롯 레벨 수와 함께 covers() 판단에 사용)
+    """
+
+    def __init__(self, path: str, venue: str, max_age: float = 2.0, heartbeat_timeout: float = 3.0,
+                 reopen_interval: float = 5.0, levels: int | None = None):
+        self.path = path
+        self.name = venue
+        self.levels = levels
+        self.max_age = max_age
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reopen_interval = reopen_interval
+        self._store = None
+        self._opened_at = 0.0
+
+    @classmethod
+    def from_env(cls, venue: str, levels: int | None = None):
+        """
+        환경변수(MARKETDATA_SHM_PATH, ORDERBOOK_FEED_MAX_AGE, MARKETDATA_HEARTBEAT_TIMEOUT)로 생성합니다.
+        """
+        return cls(
+            path=os.getenv("MARKETDATA_SHM_PATH", "/dev/shm/kimp_orderbooks"),
+            venue=venue,
+            max_age=float(os.getenv("ORDERBOOK_FEED_MAX_AGE", 2.0)),
+            heartbeat_timeout=float(os.getenv("MARKETDATA_HEARTBEAT_TIMEOUT", 3.0)),
+            levels=levels,
+        )
+
+    def covers(self, count: int) -> bool:
+        """
+        count 레벨 요청을 공유 메모리 오더북으로 처리할 수 있는지 여부
+        """
+        store = self._store
+        if store is not None and count > store.levels:
+            return False
+        return self.levels is None or count <= self.levels
+
+    def _get_store(self) -> SharedBookStore | None:
+        store = self._store
+        if store is not None and store.heartbeat_age() <= self.heartbeat_timeout:
+            return store
+        # 데몬 중단 또는 재시작 ~ 주기적으로 다시 열어봄
+        now = time.monotonic()
+        if now - self._opened_at < self.reopen_interval:
+            return None
+        self._opened_at = now
+        if store is not None:
+            store.close()
+        self._store = store = SharedBookStore.open(self.path)
+        if store is None or store.heartbeat_age() > self.heartbeat_timeout:
+            return None
+        logger.info(f"[{self.name}] 공유 메모리 오더북 연결: {self.path}")
+        return store
+
+    def get(self, ticker: str, max_age: float | None = None) -> OrderbookSnapshot | None:
+        store = self._get_store()
+        if store is None:
+            return None
+        found = store.read(self.name, ticker)
+        if found is None:
+            return None
+        snapshot, received_at = found
+        max_age = self.max_age if max_age is None else max_age
+        if time.time() - received_at > max_age:
+            return None
+        return snapshot
+
+    def stop(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -11,6 +11,8 @@ import uuid
 import hashlib
 from urllib.parse import urlencode, unquote
 from .base import Exchange, KoreanExchange
+from .orderbook_cache import orderbook_cache
+from .payloads import units_orderbooks
 
 dotenv.load_dotenv()
 
@@ -57,17 +59,17 @@ class UpbitExchange(KoreanExchange):
         try:
             url = f"{cls.server_url}/v1/market/all?is_details=true"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
-                    data = await res.json()
-                    # KRW-로 시작하는 티커만 필터링 후 (market, korean_name) 튜플로 반환
-                    result = [
-                        (item["market"].replace("KRW-", ""), item["korean_name"])
-                        for item in data if item["market"].startswith("KRW-")
-                    ]
-                    return result
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+                data = await res.json()
+                # KRW-로 시작하는 티커만 필터링 후 (market, korean_name) 튜플로 반환
+                result = [
+                    (item["market"].replace("KRW-", ""), item["korean_name"])
+                    for item in data if item["market"].startswith("KRW-")
+                ]
+                return result
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching tickers: {e}")
             raise
@@ -76,9 +78,11 @@ class UpbitExchange(KoreanExchange):
             raise
 
     @classmethod
+    @orderbook_cache.cached("count", batch=True)
     async def get_ticker_orderbook(cls, tickers: list[str], count: int = 100):
         """
         Upbit에서 여러 티커의 주문서를 한 번에 가져옵니다.
+        실시간 피드가 설정되어 있으면 메모리 오더북을 사용하고, 피드에 없는 티커만 REST로 조회합니다.
 
         Args:
             tickers (list[str]): 티커 이름 리스트 (예: ["BTC", "ETH"])
@@ -86,34 +90,28 @@ class UpbitExchange(KoreanExchange):
             count (int): 조회할 호가 개수
 
         Returns:
-            list[dict]: 각 티커의 표준화된 주문서 정보 리스트
+            list[OrderbookSnapshot]: 각 티커의 표준화된 주문서 스냅샷 리스트
+        """
+        return await cls.feed_or_fetch_orderbooks(tickers, count)
+
+    @classmethod
+    async def fetch_ticker_orderbook(cls, tickers: list[str], count: int = 100):
+        """
+        Upbit REST API(/v1/orderbook)로 여러 티커의 주문서를 한 번에 조회합니다.
+
+        Returns:
+            list[OrderbookSnapshot]: 각 티커의 표준화된 주문서 스냅샷 리스트
         """
         try:
             markets = ",".join([f"KRW-{ticker}" for ticker in tickers])
             url = f"{cls.server_url}/v1/orderbook?markets={markets}&count={count}"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.json()}")
-                    response = await res.json()
-                    result = []
-                    for orderbook_data in response:
-                        standardized_orderbook = {
-                            "ticker": orderbook_data["market"].replace("KRW-", ""),
-                            "timestamp": orderbook_data["timestamp"],
-                            "orderbook": [
-                                {
-                                    "ask_price": unit["ask_price"],
-                                    "bid_price": unit["bid_price"],
-                                    "ask_size": unit["ask_size"],
-                                    "bid_size": unit["bid_size"]
-                                }
-                                for unit in orderbook_data["orderbook_units"]
-                            ]
-                        }
-                        result.append(standardized_orderbook)
-                    return result
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+                # 응답 본문을 바로 배열 기반 스냅샷으로 변환
+                return units_orderbooks(await res.read())
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching orderbook for {tickers}: {e}")
             raise
@@ -134,9 +132,10 @@ class UpbitExchange(KoreanExchange):
             Exception: API 호출 실패 시 발생하는 예외
         """
         try:
-            orderbook = await cls.get_ticker_orderbook([ticker])
-            if orderbook and orderbook[0]["orderbook"]:
-                return {"ticker": ticker, "price": orderbook[0]["orderbook"][0]["ask_price"]}
+            # 최우선 호가만 필요 ~ 피드 오더북으로 처리 가능
+            orderbook = await cls.get_ticker_orderbook([ticker], 1)
+            if orderbook and orderbook[0].best_ask is not None:
+                return {"ticker": ticker, "price": orderbook[0].best_ask}
             return {"ticker": ticker, "price": None}
         except Exception as e:
             logger.error(f"Error fetching ticker price for {ticker}: {e}")
@@ -171,22 +170,22 @@ class UpbitExchange(KoreanExchange):
                 iso_to = datetime.fromtimestamp(to, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
                 url += f"&to={iso_to}"
             headers = {"accept": "application/json"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
-                    candles = await res.json()
-                    return [
-                        {
-                            "timestamp": int(datetime.strptime(candle["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()),
-                            "open": candle["opening_price"],
-                            "high": candle["high_price"],
-                            "low": candle["low_price"],
-                            "close": candle["trade_price"],
-                            "volume": candle["candle_acc_trade_volume"]
-                        }
-                        for candle in candles
-                    ]
+            session = cls.http_session()
+            async with session.get(url, headers=headers, timeout=cls.http_timeout("market")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+                candles = await res.json()
+                return [
+                    {
+                        "timestamp": int(datetime.strptime(candle["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()),
+                        "open": candle["opening_price"],
+                        "high": candle["high_price"],
+                        "low": candle["low_price"],
+                        "close": candle["trade_price"],
+                        "volume": candle["candle_acc_trade_volume"]
+                    }
+                    for candle in candles
+                ]
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching candles for {ticker}: {e}")
             raise
@@ -216,16 +215,16 @@ class UpbitExchange(KoreanExchange):
                 'Authorization': authorization,
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/v1/status/wallet", headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+            session = self.http_session()
+            async with session.get(f"{self.server_url}/v1/status/wallet", headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
                     
-                    processed_tickers = map(
-                        lambda x: (x["currency"], x["net_type"]),
-                        await res.json()
-                    )
-                    return list(processed_tickers)
+                processed_tickers = map(
+                    lambda x: (x["currency"], x["net_type"]),
+                    await res.json()
+                )
+                return list(processed_tickers)
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching deposit/withdrawal tickers: {e}")
             raise
@@ -252,14 +251,14 @@ class UpbitExchange(KoreanExchange):
             jwt_token = self._create_jwt(self.api_key, self.secret_key, query_string)
             headers = {"Authorization": f"Bearer {jwt_token}"}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/v1/withdraws/chance?{query_string}", headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+            session = self.http_session()
+            async with session.get(f"{self.server_url}/v1/withdraws/chance?{query_string}", headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
 
-                    data = await res.json()
-                    arr = data.get("currency", {}).get("wallet_support", {})
-                    return { 'deposit_yn' : arr.count('deposit'), 'withdraw_yn' : arr.count('withdraw')}
+                data = await res.json()
+                arr = data.get("currency", {}).get("wallet_support", {})
+                return { 'deposit_yn' : arr.count('deposit'), 'withdraw_yn' : arr.count('withdraw')}
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching deposit/withdrawal tickers: {e}")
             raise
@@ -322,11 +321,11 @@ class UpbitExchange(KoreanExchange):
                 'Content-Type': 'application/json'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.server_url}/v1/orders", json=obj, headers=headers) as res:
-                    if res.status != 201:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
-                    return await res.json()
+            session = self.http_session()
+            async with session.post(f"{self.server_url}/v1/orders", json=obj, headers=headers, timeout=self.http_timeout("order")) as res:
+                if res.status != 201:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+                return await res.json()
         except aiohttp.ClientError as e:
             logger.error(f"Network error while placing order for {ticker}: {e}")
             raise
@@ -369,11 +368,11 @@ class UpbitExchange(KoreanExchange):
                 'Content-Type': 'application/json'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/v1/order", params=params, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
-                    return await res.json()
+            session = self.http_session()
+            async with session.get(f"{self.server_url}/v1/order", params=params, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+                return await res.json()
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching accounts: {e}")
             raise
@@ -416,11 +415,11 @@ class UpbitExchange(KoreanExchange):
                 'Content-Type': 'application/json'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/v1/order", params=params, headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
-                    return await res.json()
+            session = self.http_session()
+            async with session.get(f"{self.server_url}/v1/order", params=params, headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+                return await res.json()
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching accounts: {e}")
             raise
@@ -450,16 +449,16 @@ class UpbitExchange(KoreanExchange):
                 'Authorization': authorization,
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.server_url}/v1/accounts", headers=headers) as res:
-                    if res.status != 200:
-                        raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
+            session = self.http_session()
+            async with session.get(f"{self.server_url}/v1/accounts", headers=headers, timeout=self.http_timeout("account")) as res:
+                if res.status != 200:
+                    raise Exception(f"Upbit API Error: {res.status} - {await res.text()}")
                     
-                    accounts = await res.json()
-                    for account in accounts:
-                        if account['currency'] == 'KRW':
-                            return float(account['balance'])
-                    return 0.0
+                accounts = await res.json()
+                for account in accounts:
+                    if account['currency'] == 'KRW':
+                        return float(account['balance'])
+                return 0.0
         except aiohttp.ClientError as e:
             logger.error(f"Network error while fetching available balance: {e}")
             raise
@@ -484,7 +483,7 @@ class UpbitExchange(KoreanExchange):
     async def get_full_ticker_info(self):
         """
         KRW 티커 목록, 네트워크, 입출금 가능여부를 모두 합성하여 반환
-        Upbit API limit: 30 requests/sec. This function batches deposit/withdraw info requests to avoid exceeding the limit.
+        입출금 정보 요청은 한 번에 보내고, 초당 요청 수는 공용 세션의 rate limiter(exchange 그룹)가 맞춥니다.
         Returns:
             list[dict]: [{ticker, display_name, net_type, deposit_yn, withdraw_yn}, ...]
         """
@@ -524,13 +523,5 @@ class UpbitExchange(KoreanExchange):
             if net_type:
                 tasks.append(fetch_depo_with_pos(ticker, display_name, net_type))
 
-        # Run tasks in batches of 30 per second
-        batch_size = 30
-        results = []
-        for i in range(0, len(tasks), batch_size):
-            batch = tasks[i:i+batch_size]
-            results.extend(await asyncio.gather(*batch))
-            if i + batch_size < len(tasks):
-                await asyncio.sleep(1)  # Wait 1 second between batches
-
-        return results
\ No newline at end of file
+        # 요청 간격은 공용 세션의 rate limiter가 거래소 한도에 맞춰 조절
+        return await asyncio.gather(*tasks)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+import uuid
+from .feed import OrderbookStream
+from .payloads import loads
+
+logger = logging.getLogger(__name__)
+
+
+class UpbitOrderbookStream(OrderbookStream):
+    """
+    Upbit 멀티 마켓 오더북 WebSocket 스트림.
+
+    연결 하나로 유니버스 전체 KRW 마켓(KRW-USDT 포함)의 orderbook 스트림을 구독합니다.
+    Upbit은 매 메시지마다 전체 호가(orderbook_units)를 보내므로 메시지마다 메모리 오더북을 교체하며,
+    같은 연결에서 새 구독 요청을 보내면 이전 구독이 대체되므로 구독 시 항상 전체 마켓을 다시 보냅니다.
+    """
+    name = "upbit"
+    url = "wss://api.upbit.com/websocket/v1"
+    # Upbit은 120초 동안 메시지가 없으면 연결을 종료
+    ping_interval = 60
+
+    def __init__(self, depth: int = 30, max_age: float = 2.0):
+        super().__init__(max_age)
+        self.depth = depth
+        self.levels = depth
+
+    @classmethod
+    def from_env(cls):
+        """
+        환경변수(UPBIT_WS_DEPTH: 1/5/15/30, ORDERBOOK_FEED_MAX_AGE)로 생성합니다.
+        """
+        return cls(
+            depth=int(os.getenv("UPBIT_WS_DEPTH", 30)),
+            max_age=float(os.getenv("ORDERBOOK_FEED_MAX_AGE", 2.0)),
+        )
+
+    def code(self, ticker: str) -> str:
+        return f"KRW-{ticker}.{self.depth}"
+
+    def handle_message(self, data):
+        message = loads(data)
+        if message.get("type") != "orderbook":
+            if "error" in message:
+                logger.error(f"[upbit] 오더북 구독 오류: {message['error']}")
+            return None
+
+        units = message["orderbook_units"]
+        self._book(message["code"].replace("KRW-", "")).apply_snapshot(
+            [(unit["ask_price"], unit["ask_size"]) for unit in units],
+            [(unit["bid_price"], unit["bid_size"]) for unit in units],
+            message.get("timestamp")
+        )
+        return None
+
+    async def send_subscribe(self, ws, tickers):
+        with self._lock:
+            codes = [self.code(ticker) for ticker in sorted(self._tickers)]
+        await ws.send_str(json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": "orderbook", "codes": codes},
+            {"format": "DEFAULT"}
+        ]))
+
+    async def send_unsubscribe(self, ws, tickers):
+        # 구독 요청은 코드 목록 전체를 대체하므로 남은 티커로 다시 요청
+        await self.send_subscribe(ws, [])
+
+    async def send_ping(self, ws):
+        await ws.send_str("PING")
@@ -0,0 +1,13 @@
+import os
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """
+    불리언 환경변수를 읽습니다. 1/true/yes/on(대소문자 무관)이면 True, 설정되지 않았으면 default.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUE_VALUES
@@ -13,4 +13,8 @@ result_expires = 60 * 60 * 24  # 결과 만료 시간 (24시간)
 task_reject_on_worker_lost = True # 작업이 실패한 경우 재시도
 broker_heartbeat = 10 # 브로커 하트비트 설정
 task_soft_time_limit = 5  # 작업 소프트 타임 리밋 설정
-worker_max_tasks_per_child=100 # worker 프로세스 메모리 누수 방지를 위한 최대 작업 수 설정
\ No newline at end of file
+worker_max_tasks_per_child=100 # worker 프로세스 메모리 누수 방지를 위한 최대 작업 수 설정
+# 환율 계산 실행 방식 ~ inline: 이벤트 루프에서 직접 계산, thread: 스레드 풀, process: 프로세스 풀
+# (process는 solo/threads 풀 워커에서만 사용 가능, prefork 자식 프로세스에서는 스레드 풀로 대체)
+rate_compute_executor = os.getenv('RATE_COMPUTE_EXECUTOR', 'inline')
+rate_compute_workers = int(os.getenv('RATE_COMPUTE_WORKERS', 2))  # 스레드/프로세스 풀 크기
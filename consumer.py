@@ -3,19 +3,36 @@ import json
 from pathlib import Path
 from async_lru import alru_cache
 import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
+import multiprocessing
 import logging
 import logging.config
 import time
+from billiard.process import current_process as billiard_current_process
 from celery import Celery
+from celery.signals import celeryd_after_setup, worker_process_init, worker_process_shutdown
 import redis
 from dotenv import load_dotenv
 import yaml
 from backend.core.ex_manager import exMgr
+from backend.core.rate_engine import json_default
+from backend.core.rate_memo import rate_memo
+from backend.core.seed_grid import seed_grid_mode
+from backend.core.sharding import SHARDING_ENABLED, shard_queue
+from backend.core.task_planner import TASK_LATENCY_KEY
+from backend.core.tiering import LATEST_RATE_KEY
 from backend.exchanges.base import ForeignExchange, KoreanExchange
+from backend.exchanges.binance import BinanceExchange
 from backend.exchanges.bithumb import BithumbExchange
+from backend.exchanges.bithumb_poller import BithumbOrderbookPoller
 from backend.exchanges.bybit import BybitExchange
+from backend.exchanges.feeds import ORDERBOOK_FEED_CLASS_MAP, feed_tickers
+from backend.exchanges.http import http_clients
+from backend.exchanges.orderbook_cache import orderbook_cache
+from backend.exchanges.shared_books import SharedBookFeed
 from backend.exchanges.upbit import UpbitExchange
+from backend.utils.env import env_flag
 from backend.utils.telegram import send_telegram, send_telegram_to_admin
 import gzip
 import base64
@@ -57,6 +74,9 @@ setup_logging()
 # 로거 생성
 logger = logging.getLogger(__name__)
 
+# 수수료/펀딩비 반영 순환율 계산 여부 ~ 켜면 진입/종료 판단을 순환율로 수행
+NET_RATES_ENABLED = env_flag("NET_RATES_ENABLED")
+
 # Redis 클라이언트 생성 (글로벌 네임스페이스)
 redis_host = os.getenv('REDIS_HOST')
 if redis_host is None:
@@ -105,6 +125,133 @@ EXCHANGE_CLASS_MAP = {
     # 필요시 추가
 }
 
+# 환율 계산용 스레드/프로세스 풀 ~ 워커 자식 프로세스마다 한 번만 생성
+_rate_executor = None
+
+def is_daemon_process() -> bool:
+    """
+    Celery prefork 자식 프로세스처럼 자식 프로세스를 만들 수 없는 데몬 프로세스인지 확인합니다.
+    """
+    return multiprocessing.current_process().daemon or billiard_current_process().daemon
+
+def get_rate_executor():
+    """
+    celeryconfig의 rate_compute_executor 설정에 맞는 풀을 반환합니다.
+    inline(기본값)이면 None을 반환하여 이벤트 루프에서 직접 계산합니다.
+    prefork 자식 프로세스(daemon)는 프로세스 풀을 만들 수 없으므로 process 설정이어도 스레드 풀을 사용합니다.
+    """
+    global _rate_executor
+    mode = app.conf.get('rate_compute_executor', 'inline')
+    if mode == 'inline':
+        return None
+    if _rate_executor is None:
+        workers = app.conf.get('rate_compute_workers', 2)
+        if mode == 'process' and is_daemon_process():
+            logger.warning("데몬 프로세스(prefork 자식)에서는 프로세스 풀을 만들 수 없어 스레드 풀로 계산합니다.")
+            mode = 'thread'
+        if mode == 'process':
+            _rate_executor = ProcessPoolExecutor(max_workers=workers)
+        elif mode == 'thread':
+            _rate_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rate')
+        else:
+            logger.warning(f"Unknown rate_compute_executor: {mode}, inline으로 계산합니다.")
+            return None
+        logger.info(f"환율 계산 {mode} 풀 생성 (workers={workers})")
+    return _rate_executor
+
+# 실시간 오더북 피드 ~ ORDERBOOK_FEEDS=bybit,upbit,bithumb,binance 처럼 콤마로 구분하여 켤 거래소 지정 (기본값: 사용 안 함)
+ORDERBOOK_FEEDS = [name.strip().lower() for name in os.getenv("ORDERBOOK_FEEDS", "").split(",") if name.strip()]
+
+# 호스트 공용 마켓데이터 데몬(marketdata.py)의 공유 메모리 파일 ~ 설정되면 워커는 자체 피드 대신 데몬의 오더북을 읽음
+MARKETDATA_SHM_PATH = os.getenv("MARKETDATA_SHM_PATH")
+
+@celeryd_after_setup.connect
+def add_shard_queue(sender, instance, **kwargs):
+    """
+    샤딩 사용 시 이 워커 인스턴스 전용 큐(shard.<WORKER_SHARD>)를 추가로 구독합니다.
+    스케줄러는 inspect로 살아있는 전용 큐를 찾아 일관된 해싱으로 코인을 배정합니다. (기본 큐도 계속 구독)
+    """
+    if SHARDING_ENABLED:
+        queue = shard_queue()
+        instance.app.amqp.queues.select_add(queue)
+        logger.info(f"샤드 전용 큐 구독: {queue}")
+
+@worker_process_init.connect
+def start_orderbook_feeds(**kwargs):
+    """
+    워커 자식 프로세스마다 설정된 실시간 오더북 피드를 시작합니다.
+    피드는 별도 스레드에서 동작하며, 공통 티커 전체를 미리 구독합니다.
+    샤딩 사용 시에는 이 워커로 배정되어 들어오는 코인만 작업 수신 시점에 구독합니다. (subscribe_orderbook_feeds)
+    마켓데이터 데몬을 사용하면 피드를 띄우지 않고 공유 메모리 오더북을 연결합니다. (데몬 중단 시 REST로 조회)
+    """
+    if MARKETDATA_SHM_PATH:
+        for name, (exchange_cls, feed_cls) in ORDERBOOK_FEED_CLASS_MAP.items():
+            # 데몬과 같은 환경변수로 원본 피드의 호가 레벨 수를 구함 (피드를 시작하지는 않음)
+            exchange_cls.orderbook_feed = SharedBookFeed.from_env(name, levels=feed_cls.from_env().levels)
+        logger.info(f"공유 메모리 오더북 사용: {MARKETDATA_SHM_PATH}")
+        return
+    if not ORDERBOOK_FEEDS:
+        return
+    coins = [] if SHARDING_ENABLED else sorted({coin for _, _, coin in exMgr.get_common_tickers_from_db()})
+    for name in ORDERBOOK_FEEDS:
+        if name not in ORDERBOOK_FEED_CLASS_MAP:
+            logger.warning(f"Unknown orderbook feed: {name}")
+            continue
+        exchange_cls, feed_cls = ORDERBOOK_FEED_CLASS_MAP[name]
+        exchange_cls.orderbook_feed = feed_cls.from_env().start(feed_tickers(name, coins))
+        logger.info(f"[{name}] 실시간 오더북 피드 시작 ({len(coins)}개 티커)")
+    refresh_feed_priorities(force=True)
+
+@worker_process_shutdown.connect
+def close_http_clients(**kwargs):
+    """
+    워커 자식 프로세스 종료 시 공용 HTTP 세션, 실시간 오더북 피드와 환율 계산 풀을 정리합니다.
+    """
+    global _rate_executor
+    if _rate_executor is not None:
+        _rate_executor.shutdown(wait=False, cancel_futures=True)
+        _rate_executor = None
+    for exchange_cls, _ in ORDERBOOK_FEED_CLASS_MAP.values():
+        if exchange_cls.orderbook_feed is not None:
+            exchange_cls.orderbook_feed.stop()
+    try:
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(http_clients.close())
+        loop.run_until_complete(BinanceExchange.close_client())
+    except Exception as e:
+        logger.warning(f"HTTP 세션 정리 실패: {e}")
+
+def subscribe_orderbook_feeds(data):
+    """
+    샤딩 사용 시 이 워커로 배정된 코인을 실시간 오더북 피드에 구독합니다. (이미 구독 중이면 무시)
+    """
+    if not SHARDING_ENABLED or MARKETDATA_SHM_PATH:
+        return
+    coins = sorted({ticker[2] for ticker in data})
+    for name in ORDERBOOK_FEEDS:
+        exchange_cls, _ = ORDERBOOK_FEED_CLASS_MAP.get(name, (None, None))
+        if exchange_cls is not None and exchange_cls.orderbook_feed is not None:
+            exchange_cls.orderbook_feed.subscribe(coins)
+
+# 활성 전략 코인 조회 주기 (초) ~ 태스크마다 DB를 조회하지 않도록 이 시간 동안은 마지막 결과를 유지
+FEED_PRIORITY_CACHE_TTL = float(os.getenv("FEED_PRIORITY_CACHE_TTL", 60))
+_feed_priorities_at = float("-inf")
+
+def refresh_feed_priorities(force: bool = False):
+    """
+    폴링 방식 피드(Bithumb)에 활성 전략 코인을 알려 더 자주 갱신하도록 합니다.
+    FEED_PRIORITY_CACHE_TTL초에 한 번만 조회합니다. (force=True이면 바로 조회)
+    """
+    global _feed_priorities_at
+    feed = BithumbExchange.orderbook_feed
+    if not isinstance(feed, BithumbOrderbookPoller):
+        return
+    now = time.monotonic()
+    if not force and now - _feed_priorities_at < FEED_PRIORITY_CACHE_TTL:
+        return
+    feed.set_hot(exMgr.get_active_strategy_coins())
+    _feed_priorities_at = now
+
 # 테더 가격 호출 api async 캐시설정
 @alru_cache(maxsize=10, ttl=1)
 async def get_usdt_ticker_ob_price():
@@ -204,14 +351,16 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
         entry_position_flag = False 
         exit_position_flag = False
 
-        # 사용자의 entry_seed 기준으로 ex_rates를 seed ascending 정렬 후 범위검색
-        ex_rates_sorted = sorted(item.get('ex_rates', []), key=lambda r: r.get('seed', 0))
-        ex_rate_info = None
-        for rate in ex_rates_sorted:
-            # entry_seed 이상인 첫 번째 시드를 선택 (기존: entry_seed < seed, 변경: entry_seed <= seed)
-            if entry_seed <= rate.get('seed', 0):
-                ex_rate_info = rate
-                break
+        # 사용자의 entry_seed 이상인 첫 번째 시드의 환율을 이분탐색 ~ strategies/log 그리드는 활성 전략의 entry_seed를 포함하므로 정확히 일치
+        ex_rate_info = item['ex_rates'].lookup(entry_seed)
+        if seed_grid_mode() != 'linear' and (not ex_rate_info or ex_rate_info['seed'] != entry_seed):
+            # 그리드 캐시 이후 생성된 전략 ~ 다음 사이클에 그리드를 다시 만들고, 이번에는 이 시드의 환율을 직접 계산
+            exMgr.invalidate_seed_grid()
+            entry_ex_rate, exit_ex_rate = await asyncio.gather(
+                exMgr.recheck_rate((korean_ex, foreign_ex), item['name'], entry_seed, 'entry'),
+                exMgr.recheck_rate((korean_ex, foreign_ex), item['name'], entry_seed, 'exit'),
+            )
+            ex_rate_info = {'seed': entry_seed, 'entry_ex_rate': entry_ex_rate, 'exit_ex_rate': exit_ex_rate}
 
         # 일치하는 시드머니에 대한 환율 정보가 없으면 다음 사용자로 넘어갑니다. ~ 범위 탐색으로 변경했기 때문에 없다면 말이 안됨.
         if not ex_rate_info:
@@ -220,7 +369,12 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
         
         current_entry_ex_rate = ex_rate_info['entry_ex_rate']
         current_exit_ex_rate = ex_rate_info['exit_ex_rate']
-        
+
+        # 방어로직 - 호가창 모두 소진되어도 주문금액이 남는 경우 제대로된 환율 계산 불가
+        if current_entry_ex_rate is None or current_exit_ex_rate is None:
+            logger.error(f"환율 계산에 실패했습니다. 호가창이 모두 소진되었을 수 있습니다. user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
+            return
+
         # 종료환율이 테더가격보다 4%이상 높으면, 텔레그램 알림을 보내자
         if current_exit_ex_rate >= usdt_price * 1.04 and current_entry_ex_rate >= usdt_price * 1.04:
             message += f'''
@@ -238,10 +392,17 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
             if telegram_notifications_enabled and telegram_chat_id:
                 await send_telegram(telegram_chat_id, message)
 
-        # 방어로직 - 호가창 모두 소진되어도 주문금액이 남는 경우 제대로된 환율 계산 불가
-        if current_entry_ex_rate is None or current_exit_ex_rate is None:
-            logger.error(f"환율 계산에 실패했습니다. 호가창이 모두 소진되었을 수 있습니다. user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
-            return
+        # 진입/종료 판단 환율 ~ 순환율 사용 시 수수료/펀딩비가 반영된 순환율로 비교
+        # 순환율이 없으면 수수료 포함 기준의 목표환율과 비교할 수 없으므로 건너뜀 (총환율로 대체하지 않음)
+        if NET_RATES_ENABLED:
+            decision_entry_ex_rate = ex_rate_info.get('net_entry_ex_rate')
+            decision_exit_ex_rate = ex_rate_info.get('net_exit_ex_rate')
+            if decision_entry_ex_rate is None or decision_exit_ex_rate is None:
+                logger.warning(f"순환율이 없어 진입/종료 판단을 건너뜁니다. user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
+                return
+        else:
+            decision_entry_ex_rate = current_entry_ex_rate
+            decision_exit_ex_rate = current_exit_ex_rate
 
         # 검증 1. 파라미터의 코인과 동일한 코인을 선택했는지 확인 ~ 자동모드이면 검증 안함
         if coin_mode == 'custom':
@@ -253,20 +414,20 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
         positionDB = None
         # 커스텀 모드인 경우, 목표환율 도달했는지 확인
         if trade_mode == 'custom':
-            if current_entry_ex_rate <= float(entry_rate):
+            if decision_entry_ex_rate <= float(entry_rate):
                 entry_position_flag = True
-            if current_exit_ex_rate >= float(exit_rate):
+            if decision_exit_ex_rate >= float(exit_rate):
                 exit_position_flag = True
         # todo : AI를 적용해서 더 개선할 수 있는 방안 고민    
         # 자동 모드인 경우, 진입환율 대비 1% 이상 상승했는지 확인 
         else:
-            if current_entry_ex_rate <= float(usdt_price) * 0.99:
+            if decision_entry_ex_rate <= float(usdt_price) * 0.99:
                 entry_position_flag = True
             else:
                 positionDB = exMgr.get_user_positions_for_settlement(user['id'], item['name'], korean_ex.upper(), foreign_ex.upper())
                 if positionDB:
                     avg_entry_rate = positionDB.get('avg_entry_rate', 0)
-                    if current_exit_ex_rate >= float(avg_entry_rate) * 1.02:
+                    if decision_exit_ex_rate >= float(avg_entry_rate) * 1.02:
                         exit_position_flag = True
                 
         # for mock test
@@ -316,29 +477,13 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
                 logger.error(f"포지션 정보 조회 실패 - user_id: {user['email']}, ticker: {item['name']}")
                 return
             
-            # 포지션 종료전 환율 재확인
-            recheck_data = [(korean_ex, foreign_ex, item['name'])]
-            recheck_result = await exMgr.calc_exrate_batch(recheck_data)
-            
-            if not recheck_result or len(recheck_result) == 0:
-                logger.error(f"환율 재확인 실패 - user: {user['email']}, ticker: {item['name']}")
-                return
-            
-            # 재확인한 환율 데이터에서 entry_seed에 맞는 환율 찾기
-            recheck_ex_rates = sorted(recheck_result[0].get('ex_rates', []), key=lambda r: r.get('seed', 0))
-            recheck_ex_rate_info = None
-            for rate in recheck_ex_rates:
-                # entry_seed 이상인 첫 번째 시드를 선택 (기존: entry_seed < seed, 변경: entry_seed <= seed)
-                if entry_seed <= rate.get('seed', 0):
-                    recheck_ex_rate_info = rate
-                    break
+            # 포지션 종료전 환율 재확인 ~ entry_seed 그대로, 종료 방향만 계산
+            rechecked_exit_ex_rate = await exMgr.recheck_rate((korean_ex, foreign_ex), item['name'], entry_seed, 'exit')
             
-            if not recheck_ex_rate_info or recheck_ex_rate_info['exit_ex_rate'] is None:
-                logger.error(f"환율 재확인 데이터 추출 실패 - user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
+            if rechecked_exit_ex_rate is None:
+                logger.error(f"환율 재확인 실패 - user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
                 return
             
-            rechecked_exit_ex_rate = recheck_ex_rate_info['exit_ex_rate']
-            
             # 환율 오차범위 검증 (0.5% 이내)
             rate_difference = abs(rechecked_exit_ex_rate - current_exit_ex_rate)
             rate_difference_percent = (rate_difference / current_exit_ex_rate) * 100
@@ -668,29 +813,13 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
                 if allow_average_down and current_entry_ex_rate > existing_positions.get('avg_entry_rate', 0):
                     return message
                 
-            # 포지션 실제 주문하기 전에 환율 재확인
-            recheck_data = [(korean_ex, foreign_ex, item['name'])]
-            recheck_result = await exMgr.calc_exrate_batch(recheck_data)
+            # 포지션 실제 주문하기 전에 환율 재확인 ~ entry_seed 그대로, 진입 방향만 계산
+            rechecked_entry_ex_rate = await exMgr.recheck_rate((korean_ex, foreign_ex), item['name'], entry_seed, 'entry')
             
-            if not recheck_result or len(recheck_result) == 0:
-                logger.error(f"환율 재확인 실패 - user: {user['email']}, ticker: {item['name']}")
+            if rechecked_entry_ex_rate is None:
+                logger.error(f"환율 재확인 실패 - user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
                 return
             
-            # 재확인한 환율 데이터에서 entry_seed에 맞는 환율 찾기
-            recheck_ex_rates = sorted(recheck_result[0].get('ex_rates', []), key=lambda r: r.get('seed', 0))
-            recheck_ex_rate_info = None
-            for rate in recheck_ex_rates:
-                # entry_seed 이상인 첫 번째 시드를 선택 (기존: entry_seed < seed, 변경: entry_seed <= seed)
-                if entry_seed <= rate.get('seed', 0):
-                    recheck_ex_rate_info = rate
-                    break
-            
-            if not recheck_ex_rate_info or recheck_ex_rate_info['entry_ex_rate'] is None:
-                logger.error(f"환율 재확인 데이터 추출 실패 - user: {user['email']}, ticker: {item['name']}, entry_seed: {entry_seed}")
-                return
-            
-            rechecked_entry_ex_rate = recheck_ex_rate_info['entry_ex_rate']
-            
             # 환율 오차범위 검증 (0.5% 이내)
             rate_difference = abs(rechecked_entry_ex_rate - current_entry_ex_rate)
             rate_difference_percent = (rate_difference / current_entry_ex_rate) * 100
@@ -1026,6 +1155,18 @@ async def process_user(user, item, korean_ex_cls, foreign_ex_cls, korean_ex, for
         logger.error(f"작업 처리 중 에러가 발생했습니다: {e}", exc_info=True)
     return "error"
 
+def record_task_latency(timings: dict[str, float]):
+    """
+    스케줄러 태스크 계획(TaskPlanner)용으로 calc_exrate_batch가 잰 요청 소요 시간을 기록합니다.
+    (코인별 해외 오더북 조회 시간, 한국거래소별 일괄 조회 시간)
+    """
+    if not timings:
+        return
+    try:
+        redis_client.hset(TASK_LATENCY_KEY, mapping={field: f"{seconds:.4f}" for field, seconds in timings.items()})
+    except Exception as e:
+        logger.warning(f"태스크 처리 시간 기록 실패: {e}")
+
 @app.task(name='producer.calculate_orderbook_exrate_task', ignore_result=True, soft_time_limit=30)
 def work_task(data, retry_count=0):
     """
@@ -1034,6 +1175,7 @@ def work_task(data, retry_count=0):
         data (list[tuple]): (upbit, bybit, coin_symbol) 형식의 튜플 리스트
     """
     start_time = time.time()
+    timings = {}
     logger.debug(f"수신된 데이터 : {data}")
 
     try:
@@ -1044,18 +1186,43 @@ def work_task(data, retry_count=0):
         if usdt_price == 0:
             raise ValueError("테더 가격이 0입니다. API 호출이 실패했을 수 있습니다.")
 
+        # 이번 사이클에 계산할 시드 그리드 (SEED_GRID_MODE)
+        seed_grid = exMgr.get_seed_grid()
+        subscribe_orderbook_feeds(data)
+        refresh_feed_priorities()
+
         try:
-            res = loop.run_until_complete(exMgr.calc_exrate_batch(data))
+            res = loop.run_until_complete(exMgr.calc_exrate_batch(
+                data, seed_grid, net=NET_RATES_ENABLED, executor=get_rate_executor(), timings=timings
+            ))
         except Exception as e:
             logger.error(f"exMgr.calc_exrate_batch 실행 중 에러 발생: {e}", exc_info=True)
             raise  # 예외를 상위 except로 전달
 
         if res:
             # redis pub/sub 메시지 발행: 데이터 gzip 압축 + base64 인코딩
-            raw_json = json.dumps({"results": res})
+            raw_json = json.dumps({"results": res}, default=json_default)
             compressed = gzip.compress(raw_json.encode('utf-8'))
             encoded = base64.b64encode(compressed).decode('utf-8')
             redis_client.publish('exchange_rate', encoded)
+
+            # 티커별 체결 가능 한도 저장 ~ {korean_ex}:{foreign_ex}:{coin} -> {entry_ceiling, exit_ceiling, timestamp}
+            now = int(time.time() * 1000)
+            redis_client.hset('liquidity_ceiling', mapping={
+                f"{item['korean_ex']}:{item['foreign_ex']}:{item['name']}": json.dumps({**item['liquidity'], "timestamp": now})
+                for item in res
+            })
+            # 코인 등급 분류(CoinTiering)용 최신 환율 저장 ~ 가장 작은 시드 기준
+            latest_rates = {}
+            for item in res:
+                rate = item['ex_rates'].lookup(0) or {}
+                latest_rates[f"{item['korean_ex']}:{item['foreign_ex']}:{item['name']}"] = json.dumps({
+                    'entry_ex_rate': rate.get('entry_ex_rate'),
+                    'exit_ex_rate': rate.get('exit_ex_rate'),
+                    'usdt_price': float(usdt_price),
+                    'timestamp': now
+                })
+            redis_client.hset(LATEST_RATE_KEY, mapping=latest_rates)
             # 티커별로 돌면서
             for item in res:
                 korean_ex = item.get('korean_ex')
@@ -1098,6 +1265,14 @@ def work_task(data, retry_count=0):
         # 작업 실행 시간 로그
         execution_time = time.time() - start_time
         logger.info(f"work_task 실행 시간: {execution_time:.2f}초")
+        record_task_latency(timings)
+        # 오더북이 바뀌지 않아 계산을 건너뛴 비율 (워커 프로세스 누적)
+        memo_stats = rate_memo.stats()
+        logger.info(f"환율 메모 적중률: {memo_stats['hit_rate']:.1%} "
+                    f"(hits={memo_stats['hits']}, misses={memo_stats['misses']}, size={memo_stats['size']})")
+        cache_stats = orderbook_cache.stats()
+        logger.info(f"오더북 캐시: hits={cache_stats['hits']}, coalesced={cache_stats['coalesced']}, "
+                    f"fetches={cache_stats['fetches']}, size={cache_stats['size']}")
 
     
 if __name__ == "__main__":
@@ -65,6 +65,9 @@ async def lifespan(_app: FastAPI):
     finally:
         # lifespan 종료 시 Redis pubsub listener도 종료
         task.cancel()
+        # 거래소 공용 HTTP 세션/공유 요청 한도 연결 정리
+        from backend.exchanges.http import http_clients
+        await http_clients.close()
         logger.info("애플리케이션 종료")
 
 # FastAPI 애플리케이션 생성
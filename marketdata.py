@@ -0,0 +1,241 @@
+import logging
+import logging.config
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import dotenv
+import yaml
+from celery import Celery, group
+from backend.core.book_trigger import TopOfBookTrigger
+from backend.core.ex_manager import batch_tickers_by_coin, exMgr
+from backend.core.sharding import SHARDING_ENABLED, ShardDirectory
+from backend.core.universe import UNIVERSE_LISTEN, TickerUniverse
+from backend.exchanges.bithumb_poller import BithumbOrderbookPoller
+from backend.exchanges.feeds import ORDERBOOK_FEED_CLASS_MAP, feed_tickers
+from backend.exchanges.shared_books import SharedBookStore
+from backend.utils.env import env_flag
+
+# 환경 변수 로드
+dotenv.load_dotenv()
+
+# YAML 파일 경로
+LOGGING_CONFIG_PATH = Path(__file__).resolve().parent / "celery_logging_config.yaml"
+
+# YAML 파일에서 로깅 설정 로드
+def setup_logging():
+    """
+    YAML 파일에서 로깅 설정을 로드합니다.
+    """
+    try:
+        with open(LOGGING_CONFIG_PATH, "r", encoding="utf-8") as file:
+            config = yaml.safe_load(file)
+            logging.config.dictConfig(config)
+    except FileNotFoundError as fnf_error:
+        print(f"Logging config file not found: {fnf_error}")
+        logging.basicConfig(level=logging.INFO)
+    except yaml.YAMLError as yaml_error:
+        print(f"Error parsing YAML logging config: {yaml_error}")
+        logging.basicConfig(level=logging.INFO)
+
+# 로거 생성
+logger = logging.getLogger(__name__)
+
+# 데몬이 연결을 유지할 거래소 (기본값: 실시간 피드를 지원하는 전체 거래소)
+MARKETDATA_FEEDS = [
+    name.strip().lower()
+    for name in os.getenv("MARKETDATA_FEEDS", ",".join(ORDERBOOK_FEED_CLASS_MAP)).split(",") if name.strip()
+]
+MARKETDATA_SHM_PATH = os.getenv("MARKETDATA_SHM_PATH", "/dev/shm/kimp_orderbooks")
+MARKETDATA_SLOTS = int(os.getenv("MARKETDATA_SLOTS", 2048))
+MARKETDATA_LEVELS = int(os.getenv("MARKETDATA_LEVELS", 200))
+# 공유 메모리 반영 주기(초)
+MARKETDATA_PUBLISH_INTERVAL = float(os.getenv("MARKETDATA_PUBLISH_INTERVAL", 0.05))
+# 공통 티커/활성 전략 코인 재조회 주기(초)
+MARKETDATA_REFRESH_INTERVAL = float(os.getenv("MARKETDATA_REFRESH_INTERVAL", 60))
+# 최우선 호가 변화 시 해당 코인만 즉시 재계산 (스케줄러의 30초 주기 작업은 그대로 유지)
+MARKETDATA_TRIGGER_ENABLED = env_flag("MARKETDATA_TRIGGER_ENABLED")
+MARKETDATA_TRIGGER_BATCH_SIZE = int(os.getenv("MARKETDATA_TRIGGER_BATCH_SIZE", 10))
+
+
+class CeleryDispatcher:
+    """
+    재계산할 (korean_ex, foreign_ex, coin_symbol) 목록을 스케줄러와 같은 Celery 작업으로 발행합니다.
+    발행은 별도 스레드에서 하므로 데몬의 공유 메모리 반영 주기를 막지 않습니다.
+    """
+
+    def __init__(self, batch_size: int = 10, expires: int = 10):
+        self.app = Celery('marketdata')
+        self.app.config_from_object('celeryconfig')
+        self.batch_size = batch_size
+        self.expires = expires
+        # 스케줄러와 같은 링으로 담당 워커의 전용 큐에 발행
+        self.shards = ShardDirectory(self.app) if SHARDING_ENABLED else None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="marketdata-dispatch")
+
+    def _publish(self, pairs: list[tuple]):
+        try:
+            routes = self.shards.route(pairs) if self.shards is not None else [(None, None, pairs)]
+            tasks = []
+            for queue, _, routed in routes:
+                for batch in batch_tickers_by_coin(routed, self.batch_size):
+                    task = self.app.signature('producer.calculate_orderbook_exrate_task', args=(batch,))
+                    tasks.append(task.set(queue=queue) if queue else task)
+            group(tasks).apply_async(retry=False, expires=self.expires)
+            logger.info(f"호가 변화 재계산 {len(tasks)}개 tasks 발행 ({len(pairs)}개 조합)")
+        except Exception as e:
+            logger.error(f"호가 변화 재계산 발행 실패: {e}")
+            if self.shards is not None:
+                self.shards.invalidate()
+
+    def __call__(self, pairs: list[tuple]):
+        self._executor.submit(self._publish, pairs)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class MarketDataDaemon:
+    """
+    호스트당 하나 실행하는 마켓데이터 데몬.
+
+    거래소 WebSocket/폴링 피드를 이 프로세스에서만 유지하고, 최신 오더북을 공유 메모리(SharedBookStore)에 기록합니다.
+    같은 호스트의 Celery 워커(MARKETDATA_SHM_PATH 설정)는 거래소에 직접 연결하지 않고 이 오더북을 읽으므로,
+    워커 수를 늘려도 거래소 연결/요청 수는 늘어나지 않습니다.
+
+    trigger가 있으면 기록하는 오더북의 최우선 호가 변화를 감시하여, 임계값 이상 움직인 코인의
+    거래소 조합만 dispatch로 바로 재계산을 요청합니다.
+    공통 티커는 universe(TickerUniverse)에서 읽으므로 티커가 바뀌었을 때(NOTIFY)만 DB를 다시 조회합니다.
+    """
+
+    def __init__(self, store: SharedBookStore, feed_names: list[str], trigger: TopOfBookTrigger | None = None,
+                 dispatch=None, universe: TickerUniverse | None = None):
+        self.store = store
+        self.trigger = trigger
+        self.dispatch = dispatch
+        self.universe = universe or TickerUniverse.from_env(exMgr.get_common_tickers_from_db)
+        self.feeds = {}
+        for name in feed_names:
+            if name not in ORDERBOOK_FEED_CLASS_MAP:
+                logger.warning(f"Unknown orderbook feed: {name}")
+                continue
+            _, feed_cls = ORDERBOOK_FEED_CLASS_MAP[name]
+            self.feeds[name] = feed_cls.from_env()
+        self._published = {}  # {(venue, ticker): 마지막으로 기록한 스냅샷}
+        self._stopping = threading.Event()
+
+    def refresh(self, start: bool = False):
+        """
+        공통 티커를 다시 읽어 피드 구독을 갱신하고, Bithumb 폴러에 활성 전략 코인을 알려줍니다.
+        유니버스에서 빠진 티커는 구독을 해제하고 공유 메모리 슬롯을 비웁니다.
+        """
+        self.universe.get()
+        coins = list(self.universe.coins)
+        for name, feed in self.feeds.items():
+            tickers = feed_tickers(name, coins)
+            if start:
+                feed.start(tickers)
+                logger.info(f"[{name}] 실시간 오더북 피드 시작 ({len(coins)}개 티커)")
+            else:
+                removed = sorted(set(feed.tickers()) - set(tickers))
+                if removed:
+                    self.remove(name, feed, removed)
+                feed.subscribe(tickers)
+            if isinstance(feed, BithumbOrderbookPoller):
+                feed.set_hot(exMgr.get_active_strategy_coins())
+
+    def remove(self, name: str, feed, tickers: list[str]):
+        """
+        피드 구독을 해제하고 공유 메모리 슬롯과 기록 상태를 정리합니다.
+        """
+        feed.unsubscribe(tickers)
+        for ticker in tickers:
+            self.store.remove(name, ticker)
+            self._published.pop((name, ticker), None)
+            if self.trigger is not None:
+                self.trigger.forget(name, ticker)
+        logger.info(f"[{name}] 유니버스에서 빠진 {len(tickers)}개 티커 구독 해제: {tickers}")
+
+    def publish(self) -> int:
+        """
+        피드의 메모리 오더북 중 바뀐 것만 공유 메모리에 기록합니다.
+
+        Returns:
+            int: 기록한 오더북 수
+        """
+        now = time.time()
+        written = 0
+        for name, feed in self.feeds.items():
+            for ticker in feed.tickers():
+                snapshot = feed.get(ticker)
+                if snapshot is None:
+                    # 오래되었거나 재동기화 중 ~ 수신 시각을 갱신하지 않으므로 워커는 max_age 경과 후 REST로 조회
+                    continue
+                received_at = now - (feed.staleness(ticker) or 0.0)
+                if self._published.get((name, ticker)) is snapshot:
+                    # 피드는 오더북이 바뀔 때만 새 스냅샷을 만듦
+                    self.store.touch(name, ticker, received_at)
+                    continue
+                self.store.write(name, ticker, snapshot, received_at=received_at)
+                self._published[(name, ticker)] = snapshot
+                written += 1
+                if self.trigger is not None:
+                    self.trigger.observe(name, ticker, snapshot)
+        self.store.heartbeat()
+        if self.trigger is not None:
+            self.fire()
+        return written
+
+    def fire(self) -> list[tuple]:
+        """
+        최우선 호가가 움직인 코인의 거래소 조합을 재계산 요청합니다.
+        (Upbit KRW-USDT 등 공통 티커가 아닌 오더북은 주기 작업에 맡김)
+
+        Returns:
+            list[tuple]: 요청한 (korean_ex, foreign_ex, coin_symbol) 목록
+        """
+        pairs = [pair for coin in self.trigger.due() for pair in self.universe.by_coin.get(coin, ())]
+        if pairs and self.dispatch is not None:
+            self.dispatch(pairs)
+        return pairs
+
+    def run(self):
+        self.refresh(start=True)
+        refreshed_at = time.monotonic()
+        logger.info(f"마켓데이터 데몬 시작: {self.store.path} ({', '.join(self.feeds)})")
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                self.publish()
+                if started - refreshed_at >= MARKETDATA_REFRESH_INTERVAL:
+                    refreshed_at = started
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"마켓데이터 데몬 오류: {e}", exc_info=True)
+            self._stopping.wait(max(0.0, MARKETDATA_PUBLISH_INTERVAL - (time.monotonic() - started)))
+        for feed in self.feeds.values():
+            feed.stop()
+        logger.info("마켓데이터 데몬 종료")
+
+    def stop(self, *args):
+        self._stopping.set()
+
+
+if __name__ == "__main__":
+    # 로깅 설정 초기화 (모듈 import 시에는 기존 로거 설정을 건드리지 않음)
+    setup_logging()
+    store = SharedBookStore.create(MARKETDATA_SHM_PATH, MARKETDATA_SLOTS, MARKETDATA_LEVELS)
+    trigger, dispatcher = None, None
+    if MARKETDATA_TRIGGER_ENABLED:
+        trigger = TopOfBookTrigger.from_env()
+        dispatcher = CeleryDispatcher(batch_size=MARKETDATA_TRIGGER_BATCH_SIZE)
+    daemon = MarketDataDaemon(store, MARKETDATA_FEEDS, trigger=trigger, dispatch=dispatcher)
+    if UNIVERSE_LISTEN:
+        daemon.universe.listen(os.getenv("DATABASE_URL"))
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.run()
+    if dispatcher is not None:
+        dispatcher.shutdown()
@@ -1,4 +1,6 @@
 import asyncio
+import json
+import os
 from pathlib import Path
 import logging
 import logging.config
@@ -7,11 +9,18 @@ from celery import Celery, group
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor
 from pytz import timezone
+import redis
 import yaml  # 추가
 from backend.core.ex_manager import ExchangeManager, exMgr
+from backend.core.sharding import SHARDING_ENABLED, ShardDirectory
+from backend.core.task_planner import TASK_LATENCY_KEY, TaskPlanner, WorkerCapacity
+from backend.core.tiering import LATEST_RATE_KEY, CoinTiering
+from backend.core.universe import UNIVERSE_LISTEN, TickerUniverse
 from backend.exchanges.bithumb import BithumbExchange
 from backend.exchanges.bybit import BybitExchange
+from backend.exchanges.http import http_clients
 from backend.exchanges.upbit import UpbitExchange
+from backend.utils.env import env_flag
 
 # 환경 변수 로드
 dotenv.load_dotenv()
@@ -55,6 +64,34 @@ logger = logging.getLogger(__name__)
 app = Celery('producer')
 app.config_from_object('celeryconfig')
 
+# 태스크 분할 ~ 워커가 기록한 코인별 처리 시간과 살아있는 워커 슬롯 수 기준
+planner = TaskPlanner.from_env()
+worker_capacity = WorkerCapacity(app, fallback=int(os.getenv("TASK_PLANNER_FALLBACK_SLOTS", 10)))
+# 코인 → 워커 전용 큐 고정 배정 (SHARDING_ENABLED)
+shard_directory = ShardDirectory(app) if SHARDING_ENABLED else None
+# 코인 등급(hot/warm/cold)별 계산 주기 (TIERING_ENABLED) ~ 등급 주기는 SCHEDULER_INTERVAL 사이클 단위
+TIERING_ENABLED = env_flag("TIERING_ENABLED")
+SCHEDULER_INTERVAL = int(os.getenv("SCHEDULER_INTERVAL", 30))
+tiering = CoinTiering.from_env() if TIERING_ENABLED else None
+# 공통 진입가능 티커 캐시 ~ upsert_tickers가 티커를 바꿨을 때(직접 호출 또는 Postgres NOTIFY)만 다시 조회
+universe = TickerUniverse.from_env(exMgr.get_common_tickers_from_db)
+_redis_client = None
+
+def get_redis_client():
+    """
+    워커가 기록한 태스크 처리 시간을 읽을 Redis 클라이언트 (consumer와 같은 DB)
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.StrictRedis(
+            host=os.getenv('REDIS_HOST'),
+            port=6379,
+            db=1,
+            socket_connect_timeout=2,
+            decode_responses=True
+        )
+    return _redis_client
+
 @app.task
 def calculate_orderbook_exrate_task(tickers: list[tuple]):
     """
@@ -69,9 +106,51 @@ def renew_tickers_job(exMgr: ExchangeManager):
     """
     스케줄러가 티커 정보를 갱신합니다.
     """
-    asyncio.run(exMgr.upsert_tickers())
+    async def renew():
+        try:
+            if await exMgr.upsert_tickers():
+                universe.invalidate()
+        finally:
+            # asyncio.run마다 새 이벤트 루프 ~ 이 루프의 세션/공유 요청 한도 연결 정리
+            await http_clients.close()
+
+    asyncio.run(renew())
     logger.info("티커 정보가 갱신되었습니다.")
 
+def select_tiered_tickers(tickers: list[tuple]) -> list[tuple]:
+    """
+    열린 포지션, 유저 진입/종료 조건, 워커가 기록한 최신 환율로 코인 등급을 나누고 이번 사이클에 계산할 티커만 고릅니다.
+    필요한 정보를 읽지 못하면 전체 티커를 계산합니다.
+    """
+    try:
+        open_coins = exMgr.get_open_position_coins()
+        if open_coins is None:
+            return tickers
+        users_by_pair = {
+            pair: exMgr.get_users_with_both_exchanges_running_autotrading(*pair)
+            for pair in {(ticker[0], ticker[1]) for ticker in tickers}
+        }
+        latest_rates = {
+            key: json.loads(value) for key, value in get_redis_client().hgetall(LATEST_RATE_KEY).items()
+        }
+    except Exception as e:
+        logger.warning(f"코인 등급 분류 실패, 전체 티커 계산: {e}")
+        return tickers
+    tiers = tiering.classify(tickers, users_by_pair, open_coins, latest_rates)
+    return tiering.select(tickers, tiers)
+
+def publish_tasks(tasks):
+    """
+    태스크를 발행합니다. 실패하면 다음 주기에 샤드 구성을 다시 조회합니다.
+    """
+    try:
+        group(tasks).apply_async(retry=False, expires=30)
+    except Exception as e:
+        logger.error(f"태스크 발행 실패: {e}")
+        if shard_directory is not None:
+            shard_directory.invalidate()
+
+
 def celery_worker_job():
     """
     스케줄러가 worker 작업을 스케줄링합니다.
@@ -79,28 +158,39 @@ def celery_worker_job():
     스케줄러 스레드풀 block을 방지합니다.
     """
     try:
-        batch_size = 10
-
         async def async_publish():
             total_tasks = 0
             loop = asyncio.get_running_loop()
             
-            tickers = exMgr.get_common_tickers_from_db()
+            tickers = universe.get()
             
             if not tickers:
                 logger.info(f"공통 진입가능 티커가 없습니다")
                 return
 
+            if tiering is not None:
+                tickers = select_tiered_tickers(tickers)
+
+            try:
+                planner.observe(get_redis_client().hgetall(TASK_LATENCY_KEY))
+            except Exception as e:
+                logger.warning(f"태스크 처리 시간 조회 실패: {e}")
+
+            # 코인 단위로 태스크 구성 ~ 같은 코인의 모든 거래소 조합을 한 태스크에서 계산하여
+            # 해외거래소 오더북을 코인당 한 번만 조회, 예상 처리 시간 기준으로 워커 슬롯 수 이내로 분할
+            # 샤딩 사용 시 코인을 담당 워커의 전용 큐로 보내 워커별 오더북/캐시를 유지
+            routes = shard_directory.route(tickers) if shard_directory is not None else [(None, None, tickers)]
             tasks = []
-            for i in range(0, len(tickers), batch_size):
-                batch = tickers[i:i + batch_size]
-                tasks.append(calculate_orderbook_exrate_task.s(batch))
+            for queue, slots, pairs in routes:
+                for batch in planner.plan(pairs, slots or worker_capacity.slots()):
+                    task = calculate_orderbook_exrate_task.s(batch)
+                    tasks.append(task.set(queue=queue) if queue else task)
 
             total = len(tasks)
             total_tasks += total
             if tasks:
                 # Celery publish를 thread executor에 위임
-                loop.run_in_executor(None, lambda: group(tasks).apply_async(retry=False, expires=30))
+                loop.run_in_executor(None, publish_tasks, tasks)
             logger.info(f"{total_tasks}개 tasks를 publish to celery broker")
 
         asyncio.run(async_publish())
@@ -115,6 +205,10 @@ if __name__ == "__main__":
     exMgr.register_exchange("bybit", BybitExchange.from_env())
     exMgr.register_exchange("bithumb", BithumbExchange.from_env())
 
+    # 다른 프로세스(API 서버 등)의 티커 갱신도 알림으로 반영
+    if UNIVERSE_LISTEN:
+        universe.listen(os.getenv("DATABASE_URL"))
+
     # 초기 티커 갱신
     renew_tickers_job(exMgr) 
     
@@ -130,5 +224,5 @@ if __name__ == "__main__":
         'max_instances': 2,  # 동시에 실행되는 작업의 최대 인스턴스 수
     })
     scheduler.add_job(renew_tickers_job, 'cron', minute='*/5', args=[exMgr])  # 5분마다 실행
-    scheduler.add_job(celery_worker_job, 'interval', seconds=30)  # 30초마다 작업 스케줄링
+    scheduler.add_job(celery_worker_job, 'interval', seconds=SCHEDULER_INTERVAL)  # 기본 30초마다 작업 스케줄링
     scheduler.start()
\ No newline at end of file
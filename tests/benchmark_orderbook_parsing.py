@@ -0,0 +1,75 @@
+"""
+오더북 응답 파싱 벤치마크 ~ 샘플 응답(tests/fixtures)으로 기존 방식과 현재 방식의 디코딩 시간/최대 메모리를 비교합니다.
+
+실행: python -m tests.benchmark_orderbook_parsing
+"""
+import json
+import timeit
+import tracemalloc
+from pathlib import Path
+from backend.exchanges.payloads import bybit_orderbook, gateio_orderbook, orjson, units_orderbooks
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def legacy_bybit(raw: bytes):
+    # 기존 방식 ~ 텍스트 디코딩 후 dict 트리, 레벨마다 float() 변환하여 dict 리스트 생성 (짧은 쪽 길이로 잘림)
+    data = json.loads(raw.decode())["result"]
+    return [
+        {"ask_price": float(ask[0]), "ask_size": float(ask[1]), "bid_price": float(bid[0]), "bid_size": float(bid[1])}
+        for ask, bid in zip(data["a"], data["b"])
+    ]
+
+
+def legacy_gateio(raw: bytes):
+    data = json.loads(raw.decode())
+    return [
+        {"ask_price": float(ask[0]), "ask_size": float(ask[1]), "bid_price": float(bid[0]), "bid_size": float(bid[1])}
+        for ask, bid in zip(data["asks"], data["bids"])
+    ]
+
+
+def legacy_units(raw: bytes):
+    # 기존 방식 ~ dict 트리를 다시 레벨 dict 트리로 복사
+    return [
+        {
+            "ticker": item["market"].replace("KRW-", ""),
+            "timestamp": item["timestamp"],
+            "orderbook": [
+                {"ask_price": unit["ask_price"], "bid_price": unit["bid_price"],
+                 "ask_size": unit["ask_size"], "bid_size": unit["bid_size"]}
+                for unit in item["orderbook_units"]
+            ]
+        }
+        for item in json.loads(raw.decode())
+    ]
+
+
+def measure(func, raw: bytes, number: int) -> tuple[float, int]:
+    seconds = timeit.timeit(lambda: func(raw), number=number) / number
+    tracemalloc.start()
+    result = func(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return seconds, peak
+
+
+def main(number: int = 2000):
+    cases = [
+        ("bybit (500 levels)", "bybit_orderbook.json", legacy_bybit, lambda raw: bybit_orderbook(raw, "XRP")),
+        ("gateio (100 levels)", "gateio_orderbook.json", legacy_gateio, lambda raw: gateio_orderbook(raw, "XRP")),
+        ("upbit (15 markets x 30 units)", "upbit_orderbook.json", legacy_units, units_orderbooks),
+    ]
+    print(f"JSON decoder: {'orjson' if orjson is not None else 'json'}")
+    for name, fixture, legacy, current in cases:
+        raw = (FIXTURES / fixture).read_bytes()
+        legacy_time, legacy_peak = measure(legacy, raw, number)
+        current_time, current_peak = measure(current, raw, number)
+        print(f"{name:32s} time {legacy_time * 1e6:8.1f}us -> {current_time * 1e6:8.1f}us "
+              f"(x{legacy_time / current_time:.1f}), peak {legacy_peak / 1024:7.1f}KiB -> {current_peak / 1024:7.1f}KiB "
+              f"(x{legacy_peak / current_peak:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+환율 계산 벤치마크 ~ 기본 시드 그리드(100개)로 코인 131개 분량의 환율을 계산하는 시간을 측정합니다.
+
+실행: python -m tests.benchmark_rate_engine
+"""
+import timeit
+from backend.core.rate_engine import DEFAULT_SEEDS, calc_ex_rates
+from tests.test_rate_engine import make_orderbook
+
+
+def main(tickers: int = 131, number: int = 20):
+    korean_ob = make_orderbook("XRP", 3000, 30, 1, (100, 2000), seed=1)
+    foreign_ob = make_orderbook("XRP", 2.17, 200, 0.0001, (50, 3000), seed=2)
+    seconds = timeit.timeit(
+        lambda: [calc_ex_rates(korean_ob, foreign_ob, DEFAULT_SEEDS) for _ in range(tickers)], number=number
+    ) / number
+    print(f"{tickers} tickers x {len(DEFAULT_SEEDS)} seeds: {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
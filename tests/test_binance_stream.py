@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+import pytest
+from backend.exchanges.binance_stream import BinanceOrderbookStream
+
+
+def event(first, last, prev, asks=(), bids=(), symbol="XRPUSDT"):
+    return json.dumps({
+        "e": "depthUpdate", "E": 1000 + last, "s": symbol,
+        "U": first, "u": last, "pu": prev, "a": list(asks), "b": list(bids),
+    })
+
+
+def snapshot(last_update_id, asks, bids):
+    return {"lastUpdateId": last_update_id, "E": 1000 + last_update_id, "asks": asks, "bids": bids}
+
+
+@pytest.fixture
+def stream():
+    stream = BinanceOrderbookStream(max_age=2.0)
+    stream.last_message_at = time.monotonic()
+    return stream
+
+
+def test_snapshot_replays_buffered_events(stream):
+    # 스냅샷 전 이벤트는 버퍼링
+    assert stream.handle_message(event(1, 5, 0, [["2.01", "10"]])) is None
+    assert stream.handle_message(event(6, 12, 5, [["2.01", "20"]], [["2.00", "70"]])) is None
+    assert stream.get("XRP") is None
+
+    assert stream.apply_depth_snapshot("XRP", snapshot(10, [["2.01", "5"], ["2.02", "50"]], [["2.00", "60"]]))
+    ob = stream.get("XRP")
+    # u < lastUpdateId 인 이벤트는 버리고, U <= lastUpdateId <= u 인 이벤트부터 적용
+    assert ob.timestamp == 1012
+    assert ob.ask_sizes.tolist() == [20.0, 50.0]
+    assert ob.bid_sizes.tolist() == [70.0]
+
+    stream.handle_message(event(13, 15, 12, [["2.01", "0"]]))
+    assert stream.get("XRP").ask_prices.tolist() == [2.02]
+
+
+def test_pu_gap_invalidates_and_requests_resync(stream):
+    stream.handle_message(event(6, 12, 5))
+    assert stream.apply_depth_snapshot("XRP", snapshot(10, [["2.01", "5"]], [["2.00", "60"]]))
+    assert stream.handle_message(event(20, 22, 19)) == ["XRP"]
+    assert stream.get("XRP") is None
+    # 재동기화 전 이벤트는 다시 버퍼링
+    assert stream.handle_message(event(23, 25, 22)) is None
+    assert [e["u"] for e in stream._buffers["XRP"]] == [22, 25]
+
+
+def test_first_event_after_snapshot_must_cover_last_update_id(stream):
+    # 버퍼가 비어 있으면 스냅샷 이후 첫 이벤트로 연속성 검사
+    assert stream.apply_depth_snapshot("XRP", snapshot(10, [["2.01", "5"]], [["2.00", "60"]]))
+    assert stream.handle_message(event(1, 8, 0, [["2.01", "1"]])) is None
+    assert stream.get("XRP").ask_sizes.tolist() == [5.0]
+    assert stream.handle_message(event(9, 11, 8, [["2.01", "7"]])) is None
+    assert stream.get("XRP").ask_sizes.tolist() == [7.0]
+
+    assert stream.apply_depth_snapshot("ETH", snapshot(10, [["3.01", "5"]], [["3.00", "60"]]))
+    assert stream.handle_message(event(12, 14, 11, symbol="ETHUSDT")) == ["ETH"]
+
+
+def test_stale_snapshot_is_rejected(stream):
+    stream.handle_message(event(20, 25, 19))
+    assert not stream.apply_depth_snapshot("XRP", snapshot(10, [["2.01", "5"]], [["2.00", "60"]]))
+    assert stream.get("XRP") is None
+    assert [e["u"] for e in stream._buffers["XRP"]] == [25]
+
+
+def test_failed_snapshot_is_retried_with_backoff(stream, monkeypatch):
+    class Client:
+        def __init__(self):
+            self.calls = 0
+
+        async def futures_order_book(self, symbol, limit):
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("snapshot down")
+            return snapshot(10, [["2.01", "5"]], [["2.00", "60"]])
+
+    client = Client()
+
+    async def get_client():
+        return client
+
+    monkeypatch.setattr("backend.exchanges.binance_stream.BinanceExchange.get_client", get_client)
+    stream.handle_message(event(6, 12, 5))
+    asyncio.run(stream._sync("XRP"))
+    assert stream.get("XRP") is None
+    assert "XRP" not in stream._syncing
+
+    # 대기 시간 전에는 버퍼링만, 지나면 재동기화 요청
+    assert stream.handle_message(event(13, 14, 12)) is None
+    stream._retry_at["XRP"] = time.monotonic()
+    assert stream.handle_message(event(15, 16, 14)) == ["XRP"]
+    assert stream.handle_message(event(17, 18, 16)) is None
+
+    asyncio.run(stream._sync("XRP"))
+    assert stream.get("XRP").timestamp == 1018
+    assert stream._retry_at == {} and stream._retry_delays == {}
+
+
+def test_feed_thread_closes_its_client_on_stop(stream, monkeypatch):
+    from backend.exchanges.binance import BinanceExchange
+
+    class Client:
+        closed = False
+
+        async def close_connection(self):
+            self.closed = True
+
+    client = Client()
+
+    async def run_feed():
+        BinanceExchange._clients[asyncio.get_running_loop()] = client
+        stream._stopping = True
+
+    monkeypatch.setattr(stream, "_run_feed", run_feed)
+    stream._thread_main()
+    assert client.closed
+    assert not BinanceExchange._clients
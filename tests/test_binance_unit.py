@@ -1,47 +1,66 @@
-
 import pytest
-from backend.exchanges.binance import BinanceExchange
+from backend.exchanges.binance import BinanceExchange, futures_depth_limit
 from binance.exceptions import BinanceAPIException
 from unittest.mock import patch, AsyncMock
 
+
+@pytest.fixture(autouse=True)
+def reset_binance():
+    BinanceExchange._clients.clear()
+    BinanceExchange.orderbook_feed = None
+    yield
+    BinanceExchange._clients.clear()
+    BinanceExchange.orderbook_feed = None
+
 @pytest.mark.asyncio
 async def test_get_tickers_success():
     dummy_client = AsyncMock()
-    dummy_client.get_all_tickers.return_value = [
-        {"symbol": "BTCUSDT"},
-        {"symbol": "ETHUSDT"},
-        {"symbol": "XRPBTC"}
-    ]
-    dummy_client.close_connection.return_value = None
+    dummy_client.futures_exchange_info.return_value = {"symbols": [
+        {"baseAsset": "BTC", "quoteAsset": "USDT", "contractType": "PERPETUAL", "status": "TRADING"},
+        {"baseAsset": "ETH", "quoteAsset": "USDT", "contractType": "PERPETUAL", "status": "TRADING"},
+        {"baseAsset": "BTC", "quoteAsset": "USDT", "contractType": "CURRENT_QUARTER", "status": "TRADING"},
+        {"baseAsset": "XRP", "quoteAsset": "USDC", "contractType": "PERPETUAL", "status": "TRADING"},
+        {"baseAsset": "LUNA", "quoteAsset": "USDT", "contractType": "PERPETUAL", "status": "SETTLING"},
+    ]}
     with patch("backend.exchanges.binance.AsyncClient.create", new=AsyncMock(return_value=dummy_client)):
         tickers = await BinanceExchange.get_tickers()
-        assert "BTC" in tickers and "ETH" in tickers and "XRPBTC" not in tickers
+        assert tickers == ["BTC", "ETH"]
 
 @pytest.mark.asyncio
 async def test_get_ticker_orderbook_success():
     dummy_client = AsyncMock()
-    dummy_client.get_order_book.return_value = {
+    dummy_client.futures_order_book.return_value = {
         "lastUpdateId": 123,
+        "E": 1620000000000,
         "asks": [["50100", "1.0"]],
         "bids": [["50000", "2.0"]]
     }
-    dummy_client.close_connection.return_value = None
-    
-    with patch("backend.exchanges.binance.AsyncClient.create", new=AsyncMock(return_value=dummy_client)):
+    create = AsyncMock(return_value=dummy_client)
+
+    with patch("backend.exchanges.binance.AsyncClient.create", new=create):
         bex = BinanceExchange()
-        ob = await bex.get_ticker_orderbook("BTC")
+        ob = await bex.get_ticker_orderbook("BTC", limit=60)
+        await bex.get_ticker_orderbook("BTC")
         assert ob["ticker"] == "BTC"
         assert ob["orderbook"][0]["ask_price"] == 50100.0
         assert ob["orderbook"][0]["bid_size"] == 2.0
+        # 클라이언트는 루프당 한 번만 생성하고, limit은 허용값으로 올림
+        create.assert_awaited_once()
+        assert dummy_client.futures_order_book.await_args_list[0].kwargs == {"symbol": "BTCUSDT", "limit": 100}
 
 @pytest.mark.asyncio
 async def test_get_ticker_candles_success():
     dummy_client = AsyncMock()
-    dummy_client.get_klines.return_value = [[1620000000000, "100", "110", "90", "105", "1000"]]
-    dummy_client.close_connection.return_value = None
+    dummy_client.futures_klines.return_value = [[1620000000000, "100", "110", "90", "105", "1000"]]
 
     with patch("backend.exchanges.binance.AsyncClient.create", new=AsyncMock(return_value=dummy_client)):
         bex = BinanceExchange()
         candles = await bex.get_ticker_candles("BTC")
         assert candles[0]["open"] == 100.0
         assert candles[0]["close"] == 105.0
+
+def test_futures_depth_limit():
+    assert futures_depth_limit(5) == 5
+    assert futures_depth_limit(21) == 50
+    assert futures_depth_limit(500) == 500
+    assert futures_depth_limit(5000) == 1000
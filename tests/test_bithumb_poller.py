@@ -0,0 +1,71 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+import pytest
+from backend.exchanges.bithumb import BithumbExchange
+from backend.exchanges.bithumb_poller import BithumbOrderbookPoller
+from backend.exchanges.orderbook import OrderbookSnapshot
+
+
+def snapshot(ticker, timestamp=1):
+    return OrderbookSnapshot.from_levels(ticker, timestamp, [[101, 1]], [[100, 1]])
+
+
+def test_next_batch_packs_oldest_markets_up_to_limit():
+    poller = BithumbOrderbookPoller(markets_per_call=2, hot_interval=0.5, cold_interval=3)
+    poller.subscribe(["BTC", "ETH", "XRP"])
+    poller.set_hot(["XRP"])
+    now = time.monotonic()
+    first = poller.next_batch(now)
+    assert len(first) == 2
+    # 응답에 없는 마켓도 다음 갱신 시각이 설정됨
+    poller._store(first, [snapshot(first[0])], now)
+    # 갱신 시각이 지난 마켓이 먼저, 남는 자리는 곧 갱신할 마켓으로 채움
+    second = poller.next_batch(now)
+    assert second[0] == ({"BTC", "ETH", "XRP"} - set(first)).pop()
+    assert len(second) == 2
+    poller._store(["BTC", "ETH", "XRP"], [snapshot("XRP")], now)
+    # hot 마켓(0.5초)만 갱신 시각이 지남
+    assert poller.next_batch(now + 1)[0] == "XRP"
+    assert poller.next_batch(now + 0.1) == []
+
+
+def test_last_good_snapshot_has_age_and_max_age():
+    poller = BithumbOrderbookPoller(max_age=5)
+    poller._store(["XRP"], [snapshot("XRP", 7)], time.monotonic())
+    assert poller.get("XRP").timestamp == 7
+    assert poller.age("XRP") < 1
+    poller._books["XRP"].received_at -= 10
+    assert poller.get("XRP") is None
+    assert poller.age("XRP") >= 10
+
+
+@pytest.mark.asyncio
+async def test_poller_paces_requests_evenly():
+    poller = BithumbOrderbookPoller(markets_per_call=1, requests_per_sec=20, hot_interval=10, cold_interval=10)
+    poller.subscribe(["BTC", "ETH", "XRP"])
+    calls = []
+
+    async def fetch(tickers, count):
+        calls.append(time.monotonic())
+        return [snapshot(ticker) for ticker in tickers]
+
+    with patch.object(BithumbExchange, "fetch_ticker_orderbook", new=fetch):
+        task = asyncio.create_task(poller._run_feed())
+        await asyncio.sleep(0.2)
+        poller.stop()
+        await asyncio.wait_for(task, 1)
+    assert len(calls) == 3
+    assert min(b - a for a, b in zip(calls, calls[1:])) >= 0.045
+    assert {ticker for ticker in ["BTC", "ETH", "XRP"] if poller.get(ticker)} == {"BTC", "ETH", "XRP"}
+
+
+@pytest.mark.asyncio
+async def test_exchange_serves_orderbook_from_poller(monkeypatch):
+    poller = BithumbOrderbookPoller()
+    poller._store(["XRP"], [snapshot("XRP")], time.monotonic())
+    monkeypatch.setattr(BithumbExchange, "orderbook_feed", poller)
+    with patch.object(BithumbExchange, "fetch_ticker_orderbook", new=AsyncMock(return_value=[])) as rest:
+        obs = await BithumbExchange.get_ticker_orderbook(["XRP"], 30)
+    rest.assert_not_awaited()
+    assert obs[0].best_ask == 101
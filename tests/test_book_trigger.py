@@ -0,0 +1,51 @@
+from backend.core.book_trigger import TopOfBookTrigger
+from backend.exchanges.orderbook import OrderbookSnapshot
+from backend.exchanges.shared_books import SharedBookStore
+from marketdata import MarketDataDaemon
+
+
+def book(ticker, ask, bid):
+    return OrderbookSnapshot.from_levels(ticker, None, [[ask, 1]], [[bid, 1]])
+
+
+def test_trigger_fires_on_top_of_book_move_with_min_interval():
+    trigger = TopOfBookTrigger(threshold_bps=10, min_interval=60)
+    assert not trigger.observe("bybit", "BTC", book("BTC", 100.0, 99.9))
+    assert not trigger.observe("bybit", "BTC", book("BTC", 100.05, 99.9))  # 5bp
+    assert trigger.observe("bybit", "BTC", book("BTC", 100.2, 99.9))       # 20bp
+    assert trigger.due() == ["BTC"]
+
+    # 기준값은 마지막 트리거 시점 호가 ~ 누적 변화도 감지, 같은 코인은 min_interval 동안 보류
+    assert trigger.observe("upbit", "BTC", book("BTC", 1.0, 0.9)) is False
+    assert trigger.observe("bybit", "BTC", book("BTC", 100.2, 99.7))
+    assert trigger.due() == []
+    trigger.min_interval = 0
+    assert trigger.due() == ["BTC"]
+
+
+def test_daemon_dispatches_only_moved_coin_pairs(tmp_path):
+    store = SharedBookStore.create(str(tmp_path / "books"), slots=4, levels=10)
+    dispatched = []
+    daemon = MarketDataDaemon(store, [], trigger=TopOfBookTrigger(threshold_bps=5, min_interval=0),
+                              dispatch=dispatched.append)
+    daemon.universe.load([("upbit", "bybit", "BTC"), ("bithumb", "bybit", "BTC"), ("upbit", "bybit", "XRP")])
+
+    class Feed:
+        books = {"BTC": book("BTC", 100.0, 99.9), "XRP": book("XRP", 2.0, 1.99)}
+
+        def tickers(self):
+            return list(self.books)
+
+        def get(self, ticker):
+            return self.books[ticker]
+
+        def staleness(self, ticker):
+            return 0.0
+
+    daemon.feeds["bybit"] = Feed()
+    daemon.publish()
+    Feed.books["BTC"] = book("BTC", 100.2, 100.0)
+    Feed.books["XRP"] = book("XRP", 2.0, 1.99)
+    daemon.publish()
+    assert dispatched == [[("bithumb", "bybit", "BTC"), ("upbit", "bybit", "BTC")]]
+    store.close()
@@ -173,4 +173,35 @@ async def test_get_available_balance(bybit_service):
     # print(json.dumps(balance, indent=2))
 
     # 결과 검증
-    # assert balance == 1000.0
\ No newline at end of file
+    # assert balance == 1000.0
+@pytest.mark.asyncio
+async def test_funding_rates_are_cached_until_next_funding(monkeypatch):
+    import time
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from backend.exchanges.http import http_clients
+
+    calls = []
+    next_funding = int((time.time() + 60) * 1000)
+
+    async def handler(request):
+        calls.append(request.path)
+        return web.json_response({"retCode": 0, "result": {"list": [
+            {"symbol": "BTCUSDT", "fundingRate": "0.0001", "nextFundingTime": str(next_funding)},
+        ]}})
+
+    app = web.Application()
+    app.router.add_get("/v5/market/tickers", handler)
+    server = TestServer(app)
+    await server.start_server()
+    monkeypatch.setattr(BybitExchange, "server_url", str(server.make_url("")).rstrip("/"))
+    monkeypatch.setattr(BybitExchange, "_funding_cache", None)
+    try:
+        assert await BybitExchange.get_funding_rates() == {"BTC": 0.0001}
+        assert await BybitExchange.get_funding_rates() == {"BTC": 0.0001}
+        assert len(calls) == 1
+        # 다음 펀딩 정산 시각까지만 재사용
+        assert BybitExchange._funding_cache[0] == pytest.approx(next_funding / 1000)
+    finally:
+        await http_clients.close()
+        await server.close()
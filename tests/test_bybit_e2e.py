@@ -4,6 +4,7 @@ import time
 import pytest
 
 from backend.exchanges.bybit import BybitExchange
+from backend.exchanges.orderbook import OrderbookSnapshot
 
 
 REQUIRED_ENV_VARS = ("BYBIT_ACCESS_KEY", "BYBIT_SECRET_KEY")
@@ -43,8 +44,8 @@ async def test_orderbook_e2e(bybit_service: BybitExchange):
     # Use a liquid symbol like BTC
     ob = await bybit_service.get_ticker_orderbook("BTC")
     with open("bybit_btc_orderbook_e2e_output.json", "w") as f:
-        json.dump(ob, f, indent=2)
-    assert isinstance(ob, dict)
+        json.dump(ob.to_dict(), f, indent=2)
+    assert isinstance(ob, OrderbookSnapshot)
     assert ob.get("ticker") == "BTC"
     assert isinstance(ob.get("timestamp"), (int, float))
     orderbook = ob.get("orderbook")
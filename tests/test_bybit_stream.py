@@ -0,0 +1,58 @@
+import json
+import time
+import pytest
+from backend.exchanges.bybit import BybitExchange
+from backend.exchanges.bybit_stream import BybitOrderbookStream
+
+
+def message(type_, u, asks, bids, symbol="XRPUSDT"):
+    return json.dumps({
+        "topic": f"orderbook.200.{symbol}",
+        "type": type_,
+        "ts": 1000 + u,
+        "data": {"s": symbol, "a": asks, "b": bids, "u": u, "seq": u},
+    })
+
+
+@pytest.fixture
+def stream():
+    stream = BybitOrderbookStream(depth=200, max_age=2.0)
+    stream.last_message_at = time.monotonic()
+    return stream
+
+
+def test_snapshot_and_delta_build_local_book(stream):
+    stream.handle_message(message("snapshot", 10, [["2.01", "100"], ["2.02", "50"]], [["2.00", "70"], ["1.99", "30"]]))
+    stream.handle_message(message("delta", 11, [["2.01", "0"], ["2.015", "10"]], [["2.00", "80"]]))
+    ob = stream.get("XRP")
+    assert ob.timestamp == 1011
+    assert ob.ask_prices.tolist() == [2.015, 2.02]
+    assert ob.ask_sizes.tolist() == [10.0, 50.0]
+    assert ob.bid_prices.tolist() == [2.0, 1.99]
+    assert ob.bid_sizes.tolist() == [80.0, 30.0]
+
+
+def test_sequence_gap_invalidates_and_requests_resync(stream):
+    stream.handle_message(message("snapshot", 10, [["2.01", "100"]], [["2.00", "70"]]))
+    assert stream.handle_message(message("delta", 13, [["2.01", "90"]], [])) == ["XRP"]
+    assert stream.get("XRP") is None
+    # 재동기화 스냅샷 전의 delta는 무시
+    assert stream.handle_message(message("delta", 14, [["2.01", "80"]], [])) is None
+    stream.handle_message(message("snapshot", 1, [["2.03", "5"]], [["2.02", "5"]]))
+    assert stream.get("XRP").best_ask == 2.03
+
+
+def test_get_unknown_ticker_queues_subscription_and_stale_feed_returns_none(stream):
+    assert stream.get("BTC") is None
+    assert stream._take_pending() == ["BTC"]
+    stream.handle_message(message("snapshot", 1, [["2.01", "1"]], [["2.00", "1"]]))
+    stream.last_message_at = time.monotonic() - 10
+    assert stream.get("XRP") is None
+
+
+@pytest.mark.asyncio
+async def test_exchange_serves_orderbook_from_feed(stream, monkeypatch):
+    stream.handle_message(message("snapshot", 1, [["2.01", "1"]], [["2.00", "1"]]))
+    monkeypatch.setattr(BybitExchange, "orderbook_feed", stream)
+    ob = await BybitExchange.get_ticker_orderbook("XRP", stream.depth)
+    assert ob.best_bid == 2.0
@@ -14,4 +14,102 @@ from consumer import round_volume_to_lot_size
 def test_round_volume_to_lot_size(volume, lot_size, expected):
     result = round_volume_to_lot_size(volume, lot_size)
     print(result)
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+def _executor_kind(queue):
+    import consumer
+    consumer.app.conf.rate_compute_executor = 'process'
+    executor = consumer.get_rate_executor()
+    queue.put(type(executor).__name__)
+    consumer.close_http_clients()
+
+
+def test_process_executor_falls_back_to_threads_in_prefork_child():
+    import billiard
+    queue = billiard.Queue()
+    # Celery prefork 자식 프로세스와 같은 daemon 프로세스
+    process = billiard.Process(target=_executor_kind, args=(queue,), daemon=True)
+    process.start()
+    process.join(10)
+    assert queue.get(timeout=5) == "ThreadPoolExecutor"
+
+
+USER = {
+    'email': 'user@example.com', 'coin_mode': 'auto', 'trade_mode': 'auto', 'selected_coins': [],
+    'seed_amount': 1000000, 'seed_division': 1, 'entry_count': 0, 'leverage': 1,
+    'entry_rate': 1300, 'exit_rate': 1500, 'total_entry_count': 0, 'total_order_amount': 0,
+    'telegram_chat_id': 1, 'telegram_notifications_enabled': True,
+}
+
+
+class Rates:
+    def __init__(self, info):
+        self.info = info
+
+    def lookup(self, seed):
+        return self.info
+
+
+@pytest.mark.parametrize("info", [
+    None,
+    {'seed': 1000000, 'entry_ex_rate': None, 'exit_ex_rate': None},
+    {'seed': 1000000, 'entry_ex_rate': 1500.0, 'exit_ex_rate': None},
+])
+def test_process_user_skips_exhausted_books(monkeypatch, info):
+    import asyncio
+    import consumer
+
+    sent = []
+
+    async def send_telegram(chat_id, message):
+        sent.append(message)
+
+    monkeypatch.setattr(consumer, "send_telegram", send_telegram)
+    item = {'name': 'XRP', 'ex_rates': Rates(info)}
+    # 예외(TypeError) 없이 "error"가 아닌 값으로 건너뜀
+    result = asyncio.run(consumer.process_user(USER, item, None, None, 'upbit', 'bybit', 1400.0))
+    assert result is None
+    assert sent == []
+
+
+def test_process_user_computes_seed_missing_from_cached_grid(monkeypatch):
+    import asyncio
+    import consumer
+
+    monkeypatch.setenv("SEED_GRID_MODE", "strategies")
+    rechecks, invalidated = [], []
+
+    async def recheck_rate(pair, coin, seed, side):
+        rechecks.append((pair, coin, seed, side))
+        return None
+
+    monkeypatch.setattr(consumer.exMgr, "recheck_rate", recheck_rate)
+    monkeypatch.setattr(consumer.exMgr, "invalidate_seed_grid", lambda: invalidated.append(1))
+    # 그리드 캐시 이후 생성된 전략 ~ 그 이상인 다른 전략의 시드가 조회됨
+    item = {'name': 'XRP', 'ex_rates': Rates({'seed': 2_000_000, 'entry_ex_rate': 1400.0, 'exit_ex_rate': 1410.0})}
+    asyncio.run(consumer.process_user(USER, item, None, None, 'upbit', 'bybit', 1400.0))
+    assert sorted(side for *_, side in rechecks) == ['entry', 'exit']
+    assert {seed for _, _, seed, _ in rechecks} == {1_000_000}
+    assert invalidated == [1]
+
+
+def test_feed_priorities_are_refreshed_on_ttl(monkeypatch):
+    import consumer
+
+    class Poller(consumer.BithumbOrderbookPoller):
+        def __init__(self):
+            self.hot = []
+
+        def set_hot(self, tickers):
+            self.hot.append(tickers)
+
+    queries = []
+    poller = Poller()
+    monkeypatch.setattr(consumer.BithumbExchange, "orderbook_feed", poller)
+    monkeypatch.setattr(consumer.exMgr, "get_active_strategy_coins", lambda: queries.append(1) or {"XRP"})
+    consumer.refresh_feed_priorities(force=True)
+    consumer.refresh_feed_priorities()
+    consumer.refresh_feed_priorities()
+    # TTL 안에서는 태스크마다 DB를 조회하지 않음
+    assert queries == [1]
+    assert poller.hot == [{"XRP"}]
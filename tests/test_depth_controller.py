@@ -0,0 +1,40 @@
+from backend.core.depth_controller import DepthController
+
+
+def test_unknown_ticker_uses_venue_max():
+    depth = DepthController()
+    assert depth.depth("bybit", "XRP") == 500
+    assert depth.depth("Upbit", "XRP") == 100
+
+
+def test_observe_shrinks_to_needed_levels_with_margin():
+    depth = DepthController(min_depth=20, margin=1.5, pad=5)
+    depth.observe("bybit", "XRP", needed=40, received=500)
+    assert depth.depth("bybit", "XRP") == 65
+    depth.observe("bybit", "BTC", needed=3, received=500)
+    assert depth.depth("bybit", "BTC") == 20
+    assert depth.batch_depth("bybit", ["XRP", "BTC", "ETH"]) == 500
+
+
+def test_observe_exhausted_book_returns_to_venue_max(caplog):
+    depth = DepthController()
+    depth.observe("bybit", "XRP", needed=10, received=500)
+    depth.observe("bybit", "XRP", needed=21, received=20)
+    assert depth.depth("bybit", "XRP") == 500
+    # 최대 레벨로 요청해도 소진되면 얇은 호가창으로 경고
+    depth.observe("bybit", "XRP", needed=501, received=500)
+    assert "호가창 부족" in caplog.text
+
+
+def test_seed_depth_scales_last_observation_to_seed():
+    depth = DepthController(min_depth=20, margin=1.5, pad=5)
+    assert depth.seed_depth("bybit", "XRP", 1_000_000) == 500
+    depth.observe("bybit", "XRP", needed=100, received=500, max_seed=100_000_000)
+    assert depth.depth("bybit", "XRP") == 155
+    # 시드 비율만큼 줄이고 margin/pad 적용, min_depth ~ depth() 범위
+    assert depth.seed_depth("bybit", "XRP", 50_000_000) == 80
+    assert depth.seed_depth("bybit", "XRP", 1_000_000) == 20
+    assert depth.seed_depth("bybit", "XRP", 100_000_000) == 155
+    # 호가창이 소진되면 추정하지 않음
+    depth.observe("bybit", "XRP", needed=501, received=500, max_seed=100_000_000)
+    assert depth.seed_depth("bybit", "XRP", 1_000_000) == 500
@@ -0,0 +1,21 @@
+import pytest
+
+from backend.utils.env import env_flag
+
+
+@pytest.mark.parametrize("value", ["1", "true", "True", "YES", "on", " true "])
+def test_env_flag_truthy(monkeypatch, value):
+    monkeypatch.setenv("SOME_FLAG", value)
+    assert env_flag("SOME_FLAG") is True
+
+
+@pytest.mark.parametrize("value", ["0", "false", "no", "off", ""])
+def test_env_flag_falsy(monkeypatch, value):
+    monkeypatch.setenv("SOME_FLAG", value)
+    assert env_flag("SOME_FLAG", True) is False
+
+
+def test_env_flag_default_when_unset(monkeypatch):
+    monkeypatch.delenv("SOME_FLAG", raising=False)
+    assert env_flag("SOME_FLAG") is False
+    assert env_flag("SOME_FLAG", True) is True
@@ -5,6 +5,8 @@ import asyncio
 from unittest.mock import patch, MagicMock, AsyncMock
 from backend.core.ex_manager import ExchangeManager
 from backend.core.ex_manager import exMgr
+from backend.core.rate_engine import json_default
+from backend.core.seed_grid import SeedGrid
 
 @pytest.fixture
 def ex_manager():
@@ -49,7 +51,7 @@ async def test_calc_exrate_batch(ex_manager, tickers):
     result = await ex_manager.calc_exrate_batch(tickers)
     # with open('test_calc_exrate_batch_output.json', 'w') as f:
     #     json.dump(result, f, indent=2)
-    print(json.dumps(result, indent=2))
+    print(json.dumps(result, indent=2, default=json_default))
 
 @pytest.mark.asyncio
 async def test_compare_single_vs_batch_exrate():
@@ -183,4 +185,101 @@ async def test_compare_single_vs_batch_exrate():
     # print("\n📋 배치 계산 전체 결과:")
     # print(json.dumps(manta_batch, indent=2))
     # print("\n📋 단일 계산 전체 결과:")
-    # print(json.dumps(manta_single, indent=2))
\ No newline at end of file
+    # print(json.dumps(manta_single, indent=2))
+
+@pytest.mark.asyncio
+async def test_recheck_rate_single_side():
+    from backend.exchanges.orderbook import OrderbookSnapshot
+    korean_ob = OrderbookSnapshot.from_levels("XRP", 1, [[3000, 10000]], [[2990, 10000]])
+    foreign_ob = OrderbookSnapshot.from_levels("XRP", 1, [[2.2, 100000]], [[2.0, 100000]])
+    with patch("backend.core.ex_manager.BithumbExchange.get_ticker_orderbook", new=AsyncMock(return_value=[korean_ob])) as kr_mock, \
+         patch("backend.core.ex_manager.BybitExchange.get_ticker_orderbook", new=AsyncMock(return_value=foreign_ob)):
+        entry = await ExchangeManager.recheck_rate(('bithumb', 'bybit'), 'XRP', 3_000_000, 'entry')
+        exit_ = await ExchangeManager.recheck_rate(('bithumb', 'bybit'), 'XRP', 2_990_000, 'exit')
+    # 레벨 수 관측 전이면 메인 계산과 같은 레벨 수로 조회
+    from backend.core.depth_controller import depth_controller
+    kr_mock.assert_called_with(['XRP'], depth_controller.depth('bithumb', 'XRP'))
+    assert entry == 1500.0
+    assert exit_ == 1359.09
+
+
+@pytest.mark.asyncio
+async def test_recheck_rate_requests_seed_depth_and_retries_when_exhausted():
+    from backend.core.depth_controller import depth_controller
+    from backend.exchanges.orderbook import OrderbookSnapshot
+    depth_controller.observe('bithumb', 'RECHK', needed=60, received=100, max_seed=100_000_000)
+    depth_controller.observe('bybit', 'RECHK', needed=200, received=500, max_seed=100_000_000)
+    # 얕은 오더북은 시드를 채우지 못함 ~ 메인 계산 레벨 수로 다시 조회
+    shallow = OrderbookSnapshot.from_levels("RECHK", 1, [[3000, 1]], [[2990, 1]])
+    deep = OrderbookSnapshot.from_levels("RECHK", 2, [[3000, 10000]], [[2990, 10000]])
+    foreign_ob = OrderbookSnapshot.from_levels("RECHK", 1, [[2.2, 100000]], [[2.0, 100000]])
+    with patch("backend.core.ex_manager.BithumbExchange.get_ticker_orderbook",
+               new=AsyncMock(side_effect=[[shallow], [deep]])) as kr_mock, \
+         patch("backend.core.ex_manager.BybitExchange.get_ticker_orderbook", new=AsyncMock(return_value=foreign_ob)) as fr_mock:
+        entry = await ExchangeManager.recheck_rate(('bithumb', 'bybit'), 'RECHK', 3_000_000, 'entry')
+    assert entry == 1500.0
+    assert [call.args[1] for call in kr_mock.call_args_list] == [20, depth_controller.depth('bithumb', 'RECHK')]
+    assert [call.args[1] for call in fr_mock.call_args_list] == [20, depth_controller.depth('bybit', 'RECHK')]
+
+
+def test_batch_tickers_by_coin_keeps_coin_pairs_together():
+    from backend.core.ex_manager import batch_tickers_by_coin
+    tickers = [('upbit', 'bybit', 'XRP'), ('upbit', 'bybit', 'BTC'), ('bithumb', 'bybit', 'XRP'),
+               ('bithumb', 'bybit', 'BTC'), ('upbit', 'bybit', 'ETH')]
+    batches = batch_tickers_by_coin(tickers, 3)
+    assert batches == [
+        [('upbit', 'bybit', 'XRP'), ('bithumb', 'bybit', 'XRP'), ('upbit', 'bybit', 'BTC'), ('bithumb', 'bybit', 'BTC')],
+        [('upbit', 'bybit', 'ETH')],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_calc_exrate_batch_fetches_shared_foreign_book_once():
+    from backend.exchanges.orderbook import OrderbookSnapshot
+    upbit_ob = OrderbookSnapshot.from_levels("XRP", 1, [[3000, 10000]], [[2990, 10000]])
+    bithumb_ob = OrderbookSnapshot.from_levels("XRP", 1, [[3010, 10000]], [[2980, 10000]])
+    foreign_ob = OrderbookSnapshot.from_levels("XRP", 1, [[2.2, 100000]], [[2.0, 100000]])
+    with patch("backend.core.ex_manager.UpbitExchange.get_ticker_orderbook", new=AsyncMock(return_value=[upbit_ob])), \
+         patch("backend.core.ex_manager.BithumbExchange.get_ticker_orderbook", new=AsyncMock(return_value=[bithumb_ob])), \
+         patch("backend.core.ex_manager.BybitExchange.get_ticker_orderbook", new=AsyncMock(return_value=foreign_ob)) as fr_mock:
+        res = await ExchangeManager.calc_exrate_batch(
+            [('upbit', 'bybit', 'XRP'), ('bithumb', 'bybit', 'XRP')], SeedGrid([3_000_000])
+        )
+    assert fr_mock.await_count == 1
+    assert [(r['korean_ex'], r['ex_rates'][0]['entry_ex_rate']) for r in res] == [('upbit', 1500.0), ('bithumb', 1505.0)]
+
+
+@pytest.mark.asyncio
+async def test_calc_exrate_batch_with_process_executor_matches_inline():
+    from concurrent.futures import ProcessPoolExecutor
+    from backend.core.depth_controller import DepthController
+    from backend.exchanges.orderbook import OrderbookSnapshot
+    korean_ob = OrderbookSnapshot.from_levels("XRP", 1, [[3000, 1000], [3001, 5000]], [[2990, 1000], [2989, 5000]])
+    foreign_ob = OrderbookSnapshot.from_levels("XRP", 1, [[2.2, 5000], [2.21, 5000]], [[2.0, 5000], [1.99, 5000]])
+    tickers = [('bithumb', 'bybit', 'XRP')]
+    with patch("backend.core.ex_manager.BithumbExchange.get_ticker_orderbook", new=AsyncMock(return_value=[korean_ob])), \
+         patch("backend.core.ex_manager.BybitExchange.get_ticker_orderbook", new=AsyncMock(return_value=foreign_ob)):
+        inline = await ExchangeManager.calc_exrate_batch(tickers, depth=DepthController())
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            offloaded = await ExchangeManager.calc_exrate_batch(tickers, depth=DepthController(), executor=executor)
+    assert offloaded[0]['ex_rates'].to_list() == inline[0]['ex_rates'].to_list()
+    assert offloaded[0]['liquidity'] == inline[0]['liquidity']
+
+
+@pytest.mark.asyncio
+async def test_calc_exrate_batch_reuses_memo_for_unchanged_books():
+    from backend.core.depth_controller import DepthController
+    from backend.core.rate_engine import calc_rate_ladder_with_liquidity
+    from backend.core.rate_memo import RateMemo
+    from backend.exchanges.orderbook import OrderbookSnapshot
+    korean_ob = OrderbookSnapshot.from_levels("XRP", 1, [[3000, 10000]], [[2990, 10000]])
+    foreign_ob = OrderbookSnapshot.from_levels("XRP", 7, [[2.2, 100000]], [[2.0, 100000]])
+    memo = RateMemo()
+    with patch("backend.core.ex_manager.BithumbExchange.get_ticker_orderbook", new=AsyncMock(return_value=[korean_ob])), \
+         patch("backend.core.ex_manager.BybitExchange.get_ticker_orderbook", new=AsyncMock(return_value=foreign_ob)), \
+         patch("backend.core.ex_manager.calc_rate_ladder_with_liquidity", wraps=calc_rate_ladder_with_liquidity) as calc_mock:
+        first = await ExchangeManager.calc_exrate_batch([('bithumb', 'bybit', 'XRP')], depth=DepthController(), memo=memo)
+        second = await ExchangeManager.calc_exrate_batch([('bithumb', 'bybit', 'XRP')], depth=DepthController(), memo=memo)
+    assert calc_mock.call_count == 1
+    assert second[0]['ex_rates'] is first[0]['ex_rates']
+    assert memo.stats()['hits'] == 1
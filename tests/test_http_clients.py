@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from backend.exchanges.http import HttpClientRegistry
+from backend.exchanges.upbit import UpbitExchange
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_shared_per_venue_and_closed():
+    registry = HttpClientRegistry(limit_per_host=7, timeouts={"market": (2.0, 0.5), "order": (4.0, 0.5)})
+    upbit = registry.session("upbit")
+    assert registry.session("upbit") is upbit
+    assert registry.session("bybit") is not upbit
+    assert upbit.connector.limit_per_host == 7
+    assert registry.timeout("order").total == 4.0
+
+    await registry.close()
+    assert upbit.closed
+    # 닫힌 뒤에는 새 세션 생성
+    assert registry.session("upbit") is not upbit
+    await registry.close()
+
+
+def test_sessions_are_per_event_loop():
+    registry = HttpClientRegistry()
+
+    async def open_session():
+        session = registry.session("upbit")
+        await registry.close()
+        return session
+
+    assert asyncio.run(open_session()) is not asyncio.run(open_session())
+
+
+@pytest.mark.asyncio
+async def test_exchange_uses_registry_session():
+    session = UpbitExchange.http_session()
+    assert UpbitExchange.http_session() is session
+    assert UpbitExchange.http_timeout("market").total > 0
+    await UpbitExchange.http.close()
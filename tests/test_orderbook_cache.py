@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from backend.exchanges.orderbook import OrderbookSnapshot
+from backend.exchanges.orderbook_cache import OrderbookCache
+
+cache = OrderbookCache(ttl=60)
+
+
+def snapshot(ticker):
+    return OrderbookSnapshot.from_levels(ticker, 1, [[101, 1]], [[100, 1]])
+
+
+class FakeKorean:
+    name = "fake_kr"
+    calls = []
+
+    @classmethod
+    @cache.cached("count", batch=True)
+    async def get_ticker_orderbook(cls, tickers: list[str], count: int = 30):
+        cls.calls.append((list(tickers), count))
+        await asyncio.sleep(0.01)
+        return [snapshot(ticker) for ticker in tickers if ticker != "DELISTED"]
+
+
+class FakeForeign:
+    name = "fake_fr"
+    calls = 0
+
+    @classmethod
+    @cache.cached("limit")
+    async def get_ticker_orderbook(cls, ticker: str, limit: int = 500):
+        cls.calls += 1
+        await asyncio.sleep(0.01)
+        if ticker == "FAIL":
+            raise RuntimeError("boom")
+        return snapshot(ticker)
+
+
+class FakeDefaultDepth:
+    name = "fake_default"
+    calls = 0
+
+    @classmethod
+    @cache.cached("limit")
+    async def get_ticker_orderbook(cls, ticker: str, limit: int | None = None):
+        cls.calls += 1
+        await asyncio.sleep(0.01)
+        return snapshot(ticker)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    cache.clear()
+    FakeKorean.calls = []
+    FakeForeign.calls = 0
+    FakeDefaultDepth.calls = 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch():
+    results = await asyncio.gather(*(FakeForeign.get_ticker_orderbook("XRP") for _ in range(5)))
+    assert FakeForeign.calls == 1
+    assert all(result is results[0] for result in results)
+    # ttl 안에서는 재사용, 캐시보다 얕은 요청은 캐시된 오더북 사용, 깊은 요청은 새로 조회
+    await FakeForeign.get_ticker_orderbook("XRP")
+    await FakeForeign.get_ticker_orderbook("XRP", limit=50)
+    assert FakeForeign.calls == 1
+    await FakeForeign.get_ticker_orderbook("XRP", limit=1000)
+    assert FakeForeign.calls == 2
+    await FakeForeign.get_ticker_orderbook("XRP", limit=500)
+    assert FakeForeign.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_only_missing_tickers():
+    first, second = await asyncio.gather(
+        FakeKorean.get_ticker_orderbook(["BTC", "XRP"]),
+        FakeKorean.get_ticker_orderbook(["XRP", "ETH", "DELISTED"]),
+    )
+    assert FakeKorean.calls == [(["BTC", "XRP"], 30), (["ETH", "DELISTED"], 30)]
+    assert [ob.ticker for ob in first] == ["BTC", "XRP"]
+    assert [ob.ticker for ob in second] == ["XRP", "ETH"]
+    assert second[0] is first[1]
+
+
+@pytest.mark.asyncio
+async def test_shallow_request_joins_deeper_inflight_fetch():
+    # 주문 직전 재확인(얕은 요청)이 같은 오더북의 메인 배치 조회와 합쳐짐
+    batch, recheck = await asyncio.gather(
+        FakeKorean.get_ticker_orderbook(["BTC", "XRP"], 60),
+        FakeKorean.get_ticker_orderbook(["XRP"], 20),
+    )
+    assert FakeKorean.calls == [(["BTC", "XRP"], 60)]
+    assert recheck[0] is batch[1]
+
+
+@pytest.mark.asyncio
+async def test_failure_is_shared_and_not_cached():
+    results = await asyncio.gather(*(FakeForeign.get_ticker_orderbook("FAIL") for _ in range(3)), return_exceptions=True)
+    assert FakeForeign.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        await FakeForeign.get_ticker_orderbook("FAIL")
+    assert FakeForeign.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_unlimited_depth_is_reused():
+    # limit=None(거래소 기본 깊이)은 제한 없음으로 취급 ~ 동시 요청/ttl 내 재요청 모두 재사용
+    first, second = await asyncio.gather(
+        FakeDefaultDepth.get_ticker_orderbook("XRP"),
+        FakeDefaultDepth.get_ticker_orderbook("XRP"),
+    )
+    assert first is second
+    assert await FakeDefaultDepth.get_ticker_orderbook("XRP") is first
+    assert await FakeDefaultDepth.get_ticker_orderbook("XRP", limit=100) is first
+    assert FakeDefaultDepth.calls == 1
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+import pytest
+from backend.exchanges.orderbook import OrderbookSnapshot
+from backend.exchanges.payloads import bybit_orderbook, gateio_orderbook, units_orderbooks
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def test_bybit_payload_keeps_sides_independent():
+    raw = (FIXTURES / "bybit_orderbook.json").read_bytes()
+    data = json.loads(raw)["result"]
+    ob = bybit_orderbook(raw, "XRP")
+    expected = OrderbookSnapshot.from_levels("XRP", data["ts"], data["a"], data["b"])
+    assert ob.timestamp == data["ts"]
+    # 매도 500 / 매수 490 레벨 ~ 짧은 쪽으로 잘리지 않음
+    assert len(ob.ask_prices) == 500 and len(ob.bid_prices) == 490
+    assert ob.ask_prices.tolist() == expected.ask_prices.tolist()
+    assert ob.bid_sizes.tolist() == expected.bid_sizes.tolist()
+
+
+def test_bybit_payload_fallbacks_and_errors():
+    pretty = json.dumps({"retCode": 0, "result": {"ts": 1, "a": [["2.01", "3"]], "b": []}}, indent=2).encode()
+    ob = bybit_orderbook(pretty, "XRP")
+    assert ob.ask_sizes.tolist() == [3.0] and ob.bid_prices.tolist() == []
+
+    compact = b'{"retCode":0,"result":{"s":"XRPUSDT","a":[],"b":[["2.00","1e-3"]],"ts":2}}'
+    ob = bybit_orderbook(compact, "XRP")
+    assert ob.ask_prices.tolist() == [] and ob.bid_sizes.tolist() == [0.001] and ob.timestamp == 2
+
+    with pytest.raises(Exception, match="Invalid symbol"):
+        bybit_orderbook(b'{"retCode":10001,"retMsg":"Invalid symbol","result":{}}', "XRP")
+
+
+def test_gateio_and_units_payloads():
+    raw = (FIXTURES / "gateio_orderbook.json").read_bytes()
+    data = json.loads(raw)
+    ob = gateio_orderbook(raw, "XRP")
+    assert ob.ask_prices.tolist() == [float(price) for price, _ in data["asks"]]
+    assert ob.bid_sizes.tolist() == [float(size) for _, size in data["bids"]]
+
+    raw = (FIXTURES / "upbit_orderbook.json").read_bytes()
+    data = json.loads(raw)
+    obs = units_orderbooks(raw)
+    assert [ob.ticker for ob in obs] == [item["market"][4:] for item in data]
+    units = data[0]["orderbook_units"]
+    assert obs[0].ask_prices.tolist() == [unit["ask_price"] for unit in units]
+    assert obs[0].bid_sizes.tolist() == [unit["bid_size"] for unit in units]
@@ -0,0 +1,50 @@
+import pickle
+import pytest
+from backend.exchanges.orderbook import OrderbookSnapshot
+from backend.core.rate_engine import calc_ex_rates
+
+
+def test_from_levels_keeps_independent_side_lengths():
+    ob = OrderbookSnapshot.from_levels("BTC", 1, [["100.5", "1"], ["101", "2"], ["102", "3"]], [["100", "4"]])
+    assert ob.ask_prices.tolist() == [100.5, 101.0, 102.0]
+    assert ob.bid_sizes.tolist() == [4.0]
+    assert ob.best_ask == 100.5
+    assert ob.best_bid == 100.0
+
+
+def test_from_levels_empty_side():
+    ob = OrderbookSnapshot.from_levels("BTC", 1, [], [])
+    assert len(ob.ask_prices) == 0
+    assert ob.best_ask is None
+    assert ob["orderbook"] == []
+
+
+def test_legacy_dict_view():
+    units = [
+        {"ask_price": 101.0, "bid_price": 99.0, "ask_size": 1.0, "bid_size": 2.0},
+        {"ask_price": 102.0, "bid_price": 98.0, "ask_size": 3.0, "bid_size": 4.0},
+    ]
+    ob = OrderbookSnapshot.from_units("XRP", 123, units)
+    assert ob["ticker"] == "XRP"
+    assert ob.get("timestamp") == 123
+    assert ob["orderbook"] == units
+    assert ob.get("unknown") is None
+    with pytest.raises(KeyError):
+        ob["unknown"]
+
+
+def test_snapshot_is_picklable():
+    ob = OrderbookSnapshot.from_levels("BTC", 1, [["100", "1"]], [["99", "1"]])
+    restored = pickle.loads(pickle.dumps(ob))
+    assert restored.ticker == "BTC"
+    assert restored.ask_prices.tolist() == [100.0]
+
+
+def test_rate_engine_reads_snapshot_arrays():
+    units = [
+        {"ask_price": 1000.0 + i, "bid_price": 999.0 - i, "ask_size": 5000.0, "bid_size": 5000.0}
+        for i in range(20)
+    ]
+    korean = OrderbookSnapshot.from_units("ABC", 1, units)
+    foreign = OrderbookSnapshot.from_levels("ABC", 1, [[0.71, 1e6]], [[0.70, 1e6]])
+    assert calc_ex_rates(korean, foreign) == calc_ex_rates(korean.to_dict(), foreign.to_dict())
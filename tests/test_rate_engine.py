@@ -0,0 +1,187 @@
+import json
+import pickle
+import random
+import pytest
+from decimal import Decimal, ROUND_HALF_UP
+from backend.core.costs import net_factors
+from backend.core.rate_engine import DepthLadder, RateLadder, calc_ex_rates, calc_rate_ladder, calc_rate_ladder_with_liquidity, calc_side_rate, json_default
+
+
+def make_orderbook(ticker, mid, levels, tick, size_range, seed=0):
+    rng = random.Random(seed)
+    return {
+        "ticker": ticker,
+        "timestamp": 0,
+        "orderbook": [
+            {
+                "ask_price": round(mid + tick * (i + 1), 8),
+                "bid_price": round(mid - tick * (i + 1), 8),
+                "ask_size": rng.uniform(*size_range),
+                "bid_size": rng.uniform(*size_range),
+            }
+            for i in range(levels)
+        ]
+    }
+
+
+def legacy_walk(korean_ob, foreign_ob, seed, factors=(1.0, 1.0)):
+    """
+    기존 calc_exrate_batch의 레벨 순회 로직 (호가창 소진 시 None)
+    factors를 주면 환율 분자(시드)에 진입/종료 순환율 계수를 곱함
+    """
+    def walk_quote(units, side, amount):
+        size = 0
+        for unit in units:
+            quote = unit[f"{side}_price"] * unit[f"{side}_size"]
+            if amount >= quote:
+                size += unit[f"{side}_size"]
+                amount -= quote
+            else:
+                return size + amount / unit[f"{side}_price"], False
+        return size, amount > 0
+
+    def walk_size(units, side, size):
+        quote = 0
+        for unit in units:
+            if size >= unit[f"{side}_size"]:
+                quote += unit[f"{side}_price"] * unit[f"{side}_size"]
+                size -= unit[f"{side}_size"]
+            else:
+                return quote + unit[f"{side}_price"] * size, False
+        return quote, size > 0
+
+    def to_rate(quote, factor):
+        rate = Decimal(str(seed * factor)) / Decimal(str(quote))
+        return float(rate.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+    size, kr_out = walk_quote(korean_ob["orderbook"], "ask", seed)
+    quote, fr_out = walk_size(foreign_ob["orderbook"], "bid", size)
+    entry = None if kr_out or fr_out or quote == 0 else to_rate(quote, factors[0])
+
+    size, kr_out = walk_quote(korean_ob["orderbook"], "bid", seed)
+    quote, fr_out = walk_size(foreign_ob["orderbook"], "ask", size)
+    exit_ = None if kr_out or fr_out or quote == 0 else to_rate(quote, factors[1])
+    return entry, exit_
+
+
+@pytest.fixture
+def books():
+    korean_ob = make_orderbook("XRP", 3000, 30, 1, (100, 2000), seed=1)
+    foreign_ob = make_orderbook("XRP", 2.17, 200, 0.0001, (50, 3000), seed=2)
+    return korean_ob, foreign_ob
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calc_ex_rates_matches_legacy_walk(seed):
+    korean_ob = make_orderbook("XRP", 3000, 30, 1, (100, 2000), seed=seed)
+    foreign_ob = make_orderbook("XRP", 2.17, 200, 0.0001, (50, 3000), seed=seed + 1000)
+    result = calc_ex_rates(korean_ob, foreign_ob)
+    assert [r['seed'] for r in result] == list(range(1_000_000, 100_000_001, 1_000_000))
+    for rate in result:
+        entry, exit_ = legacy_walk(korean_ob, foreign_ob, rate['seed'])
+        # 반올림 결과까지 기존 Decimal ROUND_HALF_UP 경로와 정확히 일치해야 함
+        assert rate['entry_ex_rate'] == entry
+        assert rate['exit_ex_rate'] == exit_
+
+
+def test_calc_ex_rates_exhausted_book_returns_none():
+    korean_ob = make_orderbook("ABC", 1000, 2, 1, (10, 10))
+    foreign_ob = make_orderbook("ABC", 0.7, 100, 0.001, (1000, 1000))
+    # 한국거래소 ask 총액은 약 2만원 ~ 모든 시드에서 소진
+    result = calc_ex_rates(korean_ob, foreign_ob)
+    assert all(r['entry_ex_rate'] is None for r in result)
+    assert all(r['exit_ex_rate'] is None for r in result)
+
+
+def test_exact_fill_is_not_exhausted():
+    ladder = DepthLadder([1001, 1002], [1000, 1000])
+    sizes, exhausted = ladder.size_for_quote([2_003_000, 2_003_001])
+    assert sizes[0] == 2000 and exhausted.tolist() == [False, True]
+    quotes, exhausted = ladder.quote_for_size([2000, 2000.5])
+    assert quotes[0] == 2_003_000 and exhausted.tolist() == [False, True]
+
+    # 시드가 한국거래소 ask 총액과 정확히 같아도 기존 순회 로직처럼 환율을 계산
+    korean_ob = make_orderbook("ABC", 1000, 2, 1, (1000, 1000))
+    foreign_ob = make_orderbook("ABC", 0.7, 100, 0.001, (1000, 1000))
+    seed = 2_003_000
+    rate = calc_ex_rates(korean_ob, foreign_ob, seeds=[seed])[0]
+    entry, exit_ = legacy_walk(korean_ob, foreign_ob, seed)
+    assert rate['entry_ex_rate'] == entry is not None
+    assert rate['exit_ex_rate'] == exit_
+
+
+def test_calc_ex_rates_empty_book():
+    korean_ob = {"ticker": "ABC", "timestamp": 0, "orderbook": []}
+    foreign_ob = make_orderbook("ABC", 0.7, 10, 0.001, (1000, 1000))
+    result = calc_ex_rates(korean_ob, foreign_ob, seeds=[1_000_000])
+    assert result == [{'seed': 1_000_000, 'entry_ex_rate': None, 'exit_ex_rate': None}]
+
+
+def test_rate_ladder_lookup(books):
+    korean_ob, foreign_ob = books
+    ladder = calc_rate_ladder(korean_ob, foreign_ob, [1_000_000, 2_000_000, 5_000_000])
+    assert ladder.lookup(1_000_000)['seed'] == 1_000_000
+    assert ladder.lookup(1_000_001)['seed'] == 2_000_000
+    assert ladder.lookup(500)['seed'] == 1_000_000
+    assert ladder.lookup(5_000_001) is None
+    assert list(ladder) == ladder.to_list() == calc_ex_rates(korean_ob, foreign_ob, [1_000_000, 2_000_000, 5_000_000])
+
+
+def test_rate_ladder_is_immutable_and_serializable():
+    ladder = RateLadder([1_000_000, 2_000_000], [1380.5, float('nan')], [1390.1, 1391.2])
+    with pytest.raises(AttributeError):
+        ladder.seeds = None
+    with pytest.raises(ValueError):
+        ladder.entry_rates[0] = 0
+    assert ladder[1] == {'seed': 2_000_000, 'entry_ex_rate': None, 'exit_ex_rate': 1391.2}
+    assert json.loads(json.dumps({"ex_rates": ladder}, default=json_default))["ex_rates"] == ladder.to_list()
+    assert pickle.loads(pickle.dumps(ladder)).to_list() == ladder.to_list()
+
+
+def test_calc_side_rate_matches_ladder(books):
+    korean_ob, foreign_ob = books
+    expected = calc_rate_ladder(korean_ob, foreign_ob, [3_333_333])[0]
+    assert calc_side_rate(korean_ob, foreign_ob, 3_333_333, 'entry') == expected['entry_ex_rate']
+    assert calc_side_rate(korean_ob, foreign_ob, 3_333_333, 'exit') == expected['exit_ex_rate']
+    with pytest.raises(ValueError):
+        calc_side_rate(korean_ob, foreign_ob, 3_333_333, 'both')
+
+
+def test_liquidity_ceiling_and_levels():
+    korean_ob = make_orderbook("ABC", 1000, 10, 1, (1000, 1000))
+    foreign_ob = make_orderbook("ABC", 0.7, 100, 0.001, (300, 300))
+    ladder, liquidity = calc_rate_ladder_with_liquidity(korean_ob, foreign_ob, [1_000_000, 3_000_000])
+    assert ladder.to_list() == calc_ex_rates(korean_ob, foreign_ob, [1_000_000, 3_000_000])
+    # 한국 ask 10레벨 x 1000개 = 10,045,000원, 해외 bid 총 30,000개 ~ 한국 호가창이 한도
+    assert liquidity['entry_ceiling'] == pytest.approx(sum((1001 + i) * 1000 for i in range(10)))
+    # 300만원 = 한국 ask 3레벨 / bid 4레벨, 종료 수량 약 3003개 = 해외 ask 11레벨
+    assert liquidity['korean_levels'] == 4
+    assert liquidity['foreign_levels'] == 11
+
+    _, liquidity = calc_rate_ladder_with_liquidity(korean_ob, foreign_ob, [100_000_000])
+    assert liquidity['korean_levels'] == 11
+    # 한국 호가창이 먼저 소진되어도 해외 레벨 수는 최대 시드 수량 기준 ~ 약 99,900개 = 해외 호가창 소진(100 + 1)
+    assert liquidity['foreign_levels'] == 101
+
+    _, liquidity = calc_rate_ladder_with_liquidity(korean_ob, foreign_ob, [20_000_000])
+    # 한국 bid 소진 후 남은 약 1,006만원을 마지막 호가(990원)로 환산 ~ 약 20,157개 = 해외 ask 68레벨
+    # (소진 전까지의 수량 10,000개만 세면 34레벨)
+    assert liquidity['foreign_levels'] == 68
+
+
+def test_net_rates_apply_fees_and_funding(books):
+    korean_ob, foreign_ob = books
+    seeds = [1_000_000, 5_000_000]
+    plain, _ = calc_rate_ladder_with_liquidity(korean_ob, foreign_ob, seeds)
+    assert not plain.has_net and 'net_entry_ex_rate' not in plain[0]
+
+    factors = net_factors(0.0005, 0.00055, funding_rate=0.0001)
+    ladder, _ = calc_rate_ladder_with_liquidity(korean_ob, foreign_ob, seeds, factors)
+    assert ladder.entry_rates.tolist() == plain.entry_rates.tolist()
+    for item in ladder:
+        # 순환율도 기존 Decimal ROUND_HALF_UP 경로와 정확히 일치
+        assert (item['net_entry_ex_rate'], item['net_exit_ex_rate']) == legacy_walk(korean_ob, foreign_ob, item['seed'], factors)
+        # 수수료 반영 시 진입 환율은 비싸지고 종료 환율은 싸짐
+        assert item['net_entry_ex_rate'] > item['entry_ex_rate']
+        assert item['net_exit_ex_rate'] < item['exit_ex_rate']
+    assert pickle.loads(pickle.dumps(ladder)).to_list() == ladder.to_list() == list(ladder)
@@ -0,0 +1,101 @@
+import time
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from backend.exchanges.http import HttpClientRegistry
+from backend.exchanges.rate_limit import RateLimiter, RedisBucketStore, SharedTokenBucket, TokenBucket
+
+
+def test_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # 버스트 소진 후에는 예약 순서대로 1/rate초씩 밀림
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_follows_remaining_header_and_backoff():
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.update(remaining=0, reset_in=0.5)
+    assert bucket.reserve() == pytest.approx(0.6, abs=0.02)
+
+    bucket = TokenBucket(rate=10, capacity=10)
+    assert bucket.penalize() == 0.5
+    assert bucket.penalize() == 1.0
+    assert bucket.reserve() >= 1.0
+    # 정상 응답 후에는 백오프 초기화
+    bucket.update(remaining=5)
+    assert bucket.penalize() == 0.5
+
+
+def test_groups_and_headers():
+    limiter = RateLimiter()
+    assert limiter.group("upbit", "GET", "/v1/orderbook") == "orderbook"
+    assert limiter.group("upbit", "GET", "/v1/candles/days") == "candle"
+    assert limiter.group("bithumb", "GET", "/v1/orderbook") == "quotation"
+    assert limiter.group("upbit", "POST", "/v1/orders") == "order"
+    assert limiter.group("upbit", "GET", "/v1/order") == "exchange"
+    assert limiter.group("bybit", "GET", "/v5/asset/coin/query-info") == "wallet"
+
+    limiter.observe("upbit", "exchange", 200, {"Remaining-Req": "group=default; min=1799; sec=0"})
+    assert limiter.bucket("upbit", "exchange").reserve() > 0.9
+
+    # 헤더는 group 필드의 버킷에만 적용
+    limiter.observe("upbit", "orderbook", 200, {"Remaining-Req": "group=candles; min=599; sec=0"})
+    assert limiter.bucket("upbit", "candle").reserve() > 0.9
+    assert limiter.bucket("upbit", "orderbook").reserve() == 0
+
+    # Bybit UID 기준 헤더는 IP 기준 시세 버킷에 적용하지 않음
+    limiter.observe("bybit", "quotation", 200, {"X-Bapi-Limit-Status": "0"})
+    assert limiter.bucket("bybit", "quotation").reserve() == 0
+
+    limiter.observe("bybit", "quotation", 429, {"Retry-After": "2"})
+    assert limiter.bucket("bybit", "quotation").reserve() >= 1.9
+
+
+@pytest.mark.asyncio
+async def test_session_middleware_backs_off_on_429():
+    responses = iter([
+        web.Response(status=429),
+        web.Response(text="ok", headers={"Remaining-Req": "group=default; min=10; sec=9"}),
+    ])
+
+    async def handler(request):
+        return next(responses)
+
+    app = web.Application()
+    app.router.add_get("/v1/accounts", handler)
+    server = TestServer(app)
+    await server.start_server()
+    limiter = RateLimiter(limits={"upbit": {"exchange": (100, 100)}})
+    registry = HttpClientRegistry(limiter=limiter)
+    try:
+        session = registry.session("upbit")
+        async with session.get(server.make_url("/v1/accounts")) as res:
+            assert res.status == 429
+        started = time.monotonic()
+        async with session.get(server.make_url("/v1/accounts")) as res:
+            assert res.status == 200
+        assert time.monotonic() - started >= 0.45
+    finally:
+        await registry.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_bucket_falls_back_to_local_when_redis_is_down():
+    # 열려 있지 않은 포트 ~ 공유 저장소 장애
+    store = RedisBucketStore("redis://127.0.0.1:1/0", egress="host-a", retry_interval=60)
+    limiter = RateLimiter(limits={"upbit": {"exchange": (10, 1)}}, store=store)
+    bucket = limiter.bucket("upbit", "exchange")
+    assert isinstance(bucket, SharedTokenBucket)
+    assert bucket.key == "ratelimit:host-a:upbit:exchange"
+
+    await bucket.acquire()
+    assert await store.eval(bucket.key, 10, 1, "acquire") is None
+    # 로컬 버킷으로 계속 한도 적용
+    started = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - started >= 0.08
+    await limiter.close()
@@ -0,0 +1,37 @@
+from backend.core.rate_memo import RateMemo
+from backend.exchanges.orderbook import OrderbookSnapshot
+
+
+def make_snapshot(ticker, timestamp):
+    return OrderbookSnapshot.from_levels(ticker, timestamp, [[3000, 10]], [[2990, 10]])
+
+
+def test_memo_hits_only_when_both_timestamps_match():
+    memo = RateMemo(maxsize=2)
+    key = memo.key("upbit", make_snapshot("XRP", 1), "bybit", make_snapshot("XRP", 100), "v1")
+    assert memo.get(key) is None
+    memo.put(key, "ladder")
+    assert memo.get(memo.key("upbit", make_snapshot("XRP", 1), "bybit", make_snapshot("XRP", 100), "v1")) == "ladder"
+    assert memo.get(memo.key("upbit", make_snapshot("XRP", 1), "bybit", make_snapshot("XRP", 101), "v1")) is None
+    assert memo.get(memo.key("upbit", make_snapshot("XRP", 1), "bybit", make_snapshot("XRP", 100), "v2")) is None
+    assert memo.stats() == {'hits': 1, 'misses': 3, 'hit_rate': 0.25, 'size': 1}
+
+
+def test_memo_skips_books_without_timestamp_and_is_bounded():
+    memo = RateMemo(maxsize=2)
+    assert memo.key("gateio", make_snapshot("XRP", None), "bybit", make_snapshot("XRP", 1)) is None
+    memo.put(None, "ladder")
+    assert memo.stats()['size'] == 0
+    for ts in range(3):
+        memo.put(memo.key("upbit", make_snapshot("XRP", ts), "bybit", make_snapshot("XRP", ts)), ts)
+    assert memo.stats()['size'] == 2
+
+
+def test_memo_misses_deeper_book_with_same_timestamp():
+    memo = RateMemo()
+    shallow = OrderbookSnapshot.from_levels("XRP", 1, [[3000, 10]], [[2990, 10]])
+    deeper = OrderbookSnapshot.from_levels("XRP", 1, [[3000, 10], [3001, 10]], [[2990, 10], [2989, 10]])
+    foreign = make_snapshot("XRP", 100)
+    memo.put(memo.key("upbit", shallow, "bybit", foreign), "exhausted")
+    assert memo.get(memo.key("upbit", deeper, "bybit", foreign)) is None
+    assert memo.get(memo.key("upbit", shallow, "bybit", foreign)) == "exhausted"
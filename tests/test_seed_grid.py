@@ -0,0 +1,82 @@
+import pytest
+from backend.core.seed_grid import SeedGrid
+from backend.core.rate_engine import calc_ex_rate, calc_ex_rates
+from backend.exchanges.orderbook import OrderbookSnapshot
+
+
+def test_linear_grid_matches_legacy_seeds():
+    grid = SeedGrid.linear()
+    assert list(grid) == list(range(1_000_000, 100_000_001, 1_000_000))
+
+
+def test_log_spaced_grid():
+    grid = SeedGrid.log_spaced(1_000_000, 100_000_000, count=5)
+    assert list(grid) == [1_000_000, 3_160_000, 10_000_000, 31_620_000, 100_000_000]
+
+
+def test_from_strategies_uses_exact_entry_seed():
+    grid = SeedGrid.from_strategies([
+        {'seed_amount': 10_000_000, 'seed_division': 3},
+        {'seed_amount': 5_000_000, 'seed_division': 1},
+        (5_000_000, 1),
+        {'seed_amount': None, 'seed_division': 2},
+    ])
+    assert list(grid) == [3_333_333, 5_000_000]
+
+
+def test_version_depends_only_on_seeds():
+    assert SeedGrid([3, 1, 2]).version == SeedGrid([1, 2, 3, 3]).version
+    assert SeedGrid([1, 2]).version != SeedGrid([1, 2, 3]).version
+
+
+def test_from_env_strategies_mode(monkeypatch):
+    monkeypatch.setenv("SEED_GRID_MODE", "strategies")
+    grid = SeedGrid.from_env(lambda: [(7_000_000, 2)])
+    assert list(grid) == [3_500_000]
+
+    # 활성 전략이 없으면 로그 그리드로 대체
+    monkeypatch.setenv("SEED_GRID_COUNT", "3")
+    grid = SeedGrid.from_env(lambda: [])
+    assert list(grid) == [1_000_000, 10_000_000, 100_000_000]
+
+
+def test_exact_seed_evaluation():
+    korean = OrderbookSnapshot.from_levels("ABC", 1, [[1000 + i, 3000] for i in range(50)], [[999 - i, 3000] for i in range(50)])
+    foreign = OrderbookSnapshot.from_levels("ABC", 1, [[0.7 + i * 0.001, 5000] for i in range(50)], [[0.69 - i * 0.001, 5000] for i in range(50)])
+    exact = calc_ex_rate(korean, foreign, 3_333_333)
+    assert exact['seed'] == 3_333_333
+    assert exact == calc_ex_rates(korean, foreign, [1_000_000, 3_333_333])[1]
+
+
+def test_from_env_log_mode_includes_strategy_seeds(monkeypatch):
+    monkeypatch.setenv("SEED_GRID_MODE", "log")
+    monkeypatch.setenv("SEED_GRID_COUNT", "3")
+    grid = SeedGrid.from_env(lambda: [(7_000_000, 2)])
+    assert list(grid) == [1_000_000, 3_500_000, 10_000_000, 100_000_000]
+
+
+def test_seed_grid_is_cached(monkeypatch):
+    from backend.core.ex_manager import ExchangeManager
+    monkeypatch.setenv("SEED_GRID_MODE", "strategies")
+    manager = ExchangeManager()
+    calls = []
+    monkeypatch.setattr(manager, "get_active_strategy_seeds", lambda: calls.append(1) or [(7_000_000, 2)])
+    assert manager.get_seed_grid() is manager.get_seed_grid()
+    assert len(calls) == 1
+
+
+def test_invalidated_seed_grid_is_rebuilt_after_min_age(monkeypatch):
+    from backend.core.ex_manager import ExchangeManager
+    monkeypatch.setenv("SEED_GRID_MODE", "strategies")
+    manager = ExchangeManager()
+    strategies = [(7_000_000, 2)]
+    monkeypatch.setattr(manager, "get_active_strategy_seeds", lambda: list(strategies))
+    assert list(manager.get_seed_grid()) == [3_500_000]
+
+    strategies.append((5_000_000, 1))
+    manager.invalidate_seed_grid(min_age=0)
+    assert list(manager.get_seed_grid()) == [3_500_000, 5_000_000]
+    # 방금 만든 그리드는 min_age 동안 재사용
+    grid = manager.get_seed_grid()
+    manager.invalidate_seed_grid()
+    assert manager.get_seed_grid() is grid
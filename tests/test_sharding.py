@@ -0,0 +1,127 @@
+from backend.core.sharding import HashRing, ShardDirectory, shard_queue
+
+COINS = [f"C{i}" for i in range(600)]
+
+
+def test_ring_is_stable_and_moves_only_the_new_nodes_share():
+    before = HashRing(["shard.a", "shard.b", "shard.c", "shard.d", "shard.e"])
+    assert HashRing(["shard.e", "shard.d", "shard.c", "shard.b", "shard.a"]).node_for("BTC") == before.node_for("BTC")
+
+    after = HashRing(before.nodes + ["shard.f"])
+    moved = [coin for coin in COINS if before.node_for(coin) != after.node_for(coin)]
+    # 새 노드로 옮겨간 코인만 바뀜 (약 1/6)
+    assert all(after.node_for(coin) == "shard.f" for coin in moved)
+    assert 50 < len(moved) < 150
+
+    counts = {}
+    for coin in COINS:
+        counts[after.node_for(coin)] = counts.get(after.node_for(coin), 0) + 1
+    assert min(counts.values()) > 600 / 6 * 0.6
+
+
+def test_ring_keeps_coin_pairs_together():
+    tickers = [("upbit", "bybit", "BTC"), ("bithumb", "bybit", "BTC"), ("upbit", "gateio", "ETH")]
+    assigned = HashRing(["shard.a", "shard.b"]).assign(tickers)
+    for pairs in assigned.values():
+        for coin in {pair[2] for pair in pairs}:
+            assert sum(pair[2] == coin for pair in pairs) == sum(t[2] == coin for t in tickers)
+
+
+def test_directory_routes_to_live_shard_queues():
+    class Inspect:
+        def active_queues(self):
+            return {
+                "celery@a": [{"name": "celery"}, {"name": "shard.a"}],
+                "celery@b": [{"name": "celery"}, {"name": "shard.b"}],
+            }
+
+        def stats(self):
+            return {"celery@a": {"pool": {"max-concurrency": 4}}, "celery@b": {"pool": {"max-concurrency": 2}}}
+
+    class Control:
+        def inspect(self, timeout):
+            return Inspect()
+
+    class App:
+        control = Control()
+
+    directory = ShardDirectory(App())
+    routes = directory.route([("upbit", "bybit", coin) for coin in COINS[:50]])
+    assert {queue: slots for queue, slots, _ in routes} == {"shard.a": 4, "shard.b": 2}
+    assert sum(len(pairs) for _, _, pairs in routes) == 50
+    assert shard_queue("host-1") == "shard.host-1"
+
+
+class FakeApp:
+    def __init__(self, replies, consumers=None):
+        self.replies = replies
+        self.consumers = consumers
+        app = self
+
+        class Inspect:
+            def active_queues(self):
+                reply = app.replies.pop(0)
+                if isinstance(reply, Exception):
+                    raise reply
+                return reply
+
+            def stats(self):
+                return {"celery@a": {"pool": {"max-concurrency": 4}}, "celery@b": {"pool": {"max-concurrency": 2}}}
+
+        class Control:
+            def inspect(self, timeout):
+                return Inspect()
+
+        self.control = Control()
+
+    def connection_for_write(self):
+        app = self
+
+        class Channel:
+            def queue_declare(self, queue, passive):
+                return queue, 0, app.consumers.get(queue, 0)
+
+            def close(self):
+                pass
+
+        class Connection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def channel(self):
+                return Channel()
+
+        if self.consumers is None:
+            raise ConnectionError("broker down")
+        return Connection()
+
+
+LIVE = {
+    "celery@a": [{"name": "celery"}, {"name": "shard.a"}],
+    "celery@b": [{"name": "celery"}, {"name": "shard.b"}],
+}
+
+
+def test_directory_sends_dead_shards_coins_to_shared_queue():
+    app = FakeApp([LIVE, LIVE], consumers={"shard.a": 1, "shard.b": 0})
+    directory = ShardDirectory(app)
+    tickers = [("upbit", "bybit", coin) for coin in COINS[:50]]
+    routes = directory.route(tickers)
+    owned_by_b = [t for t in tickers if directory.ring.node_for(t[2]) == "shard.b"]
+    assert {queue for queue, _, _ in routes} == {"shard.a", None}
+    assert [pairs for queue, _, pairs in routes if queue is None] == [owned_by_b]
+    # 다음 route()에서 샤드 구성을 다시 조회
+    directory.route(tickers)
+    assert app.replies == []
+
+
+def test_directory_falls_back_to_shared_queue_when_inspect_fails():
+    app = FakeApp([LIVE, TimeoutError("no reply")], consumers={"shard.a": 1, "shard.b": 1})
+    directory = ShardDirectory(app)
+    tickers = [("upbit", "bybit", coin) for coin in COINS[:50]]
+    assert {queue for queue, _, _ in directory.route(tickers)} == {"shard.a", "shard.b"}
+    directory.invalidate()
+    assert directory.route(tickers) == [(None, None, tickers)]
@@ -0,0 +1,121 @@
+import time
+import pytest
+from backend.exchanges.bybit_stream import BybitOrderbookStream
+from backend.exchanges.orderbook import OrderbookSnapshot
+from backend.exchanges.shared_books import SharedBookFeed, SharedBookStore
+from marketdata import MarketDataDaemon
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "books")
+
+
+def test_reader_sees_writes_and_new_slots(path):
+    writer = SharedBookStore.create(path, slots=4, levels=3)
+    reader = SharedBookStore.open(path)
+    assert reader.read("upbit", "XRP") is None
+
+    writer.write("upbit", "XRP", OrderbookSnapshot.from_levels("XRP", 10, [[101, 1], [102, 2], [103, 3], [104, 4]], [[100, 5]]), 123.0)
+    snapshot, received_at = reader.read("upbit", "XRP")
+    assert snapshot.timestamp == 10 and received_at == 123.0
+    # levels를 넘는 호가는 잘림
+    assert snapshot.ask_prices.tolist() == [101, 102, 103]
+    assert snapshot.bid_sizes.tolist() == [5]
+
+    writer.write("upbit", "XRP", OrderbookSnapshot.from_levels("XRP", None, [[99, 1]], []))
+    snapshot, _ = reader.read("upbit", "XRP")
+    assert snapshot.timestamp is None and snapshot.ask_prices.tolist() == [99] and snapshot.bid_prices.tolist() == []
+    reader.close()
+    writer.close()
+
+
+def test_reader_discards_torn_reads(path):
+    writer = SharedBookStore.create(path, slots=2, levels=2)
+    writer.write("bybit", "BTC", OrderbookSnapshot.from_levels("BTC", 1, [[2, 1]], [[1, 1]]))
+    reader = SharedBookStore.open(path)
+    # 쓰는 중(홀수 seq)이면 버림
+    writer._slots[0]["seq"] += 1
+    assert reader.read("bybit", "BTC") is None
+    writer._slots[0]["seq"] += 1
+    assert reader.read("bybit", "BTC")[0].best_ask == 2
+    reader.close()
+    writer.close()
+
+
+def test_feed_falls_back_when_daemon_stale(path):
+    writer = SharedBookStore.create(path, slots=2, levels=2)
+    writer.write("bybit", "BTC", OrderbookSnapshot.from_levels("BTC", 1, [[2, 1]], [[1, 1]]))
+    feed = SharedBookFeed(path, "bybit", max_age=2.0, heartbeat_timeout=3.0, reopen_interval=0)
+    assert feed.get("BTC").best_bid == 1
+    assert feed.get("ETH") is None
+
+    writer._header["heartbeat"] = time.time() - 10
+    assert feed.get("BTC") is None
+    writer.heartbeat()
+    writer.touch("bybit", "BTC", time.time() - 5)
+    assert feed.get("BTC") is None
+    assert feed.get("BTC", max_age=10).best_bid == 1
+    feed.stop()
+    writer.close()
+
+
+def test_daemon_publishes_only_changed_books(path):
+    store = SharedBookStore.create(path, slots=4, levels=10)
+    daemon = MarketDataDaemon(store, [])
+    stream = BybitOrderbookStream()
+    stream.last_message_at = time.monotonic()
+    stream._tickers.add("XRP")
+    stream.handle_message('{"topic":"orderbook.200.XRPUSDT","type":"snapshot","ts":5,"data":{"s":"XRPUSDT","a":[["2.01","1"]],"b":[["2.00","1"]],"u":1}}')
+    daemon.feeds["bybit"] = stream
+
+    assert daemon.publish() == 1
+    assert daemon.publish() == 0
+    feed = SharedBookFeed(path, "bybit")
+    assert feed.get("XRP").best_ask == 2.01
+    feed.stop()
+    store.close()
+
+
+def test_removed_slot_is_reused_and_reader_reindexes(path):
+    writer = SharedBookStore.create(path, slots=2, levels=2)
+    writer.write("bybit", "BTC", OrderbookSnapshot.from_levels("BTC", 1, [[2, 1]], [[1, 1]]))
+    writer.write("bybit", "ETH", OrderbookSnapshot.from_levels("ETH", 1, [[4, 1]], [[3, 1]]))
+    reader = SharedBookStore.open(path)
+    assert reader.read("bybit", "BTC")[0].best_ask == 2
+
+    writer.remove("bybit", "BTC")
+    assert reader.read("bybit", "BTC") is None
+    # 비운 슬롯을 새 티커에 재사용 ~ 슬롯 수를 넘지 않음
+    writer.write("bybit", "XRP", OrderbookSnapshot.from_levels("XRP", 1, [[6, 1]], [[5, 1]]))
+    assert int(writer._header["used"]) == 2
+    assert reader.read("bybit", "BTC") is None
+    assert reader.read("bybit", "XRP")[0].best_ask == 6
+    assert reader.read("bybit", "ETH")[0].best_ask == 4
+    reader.close()
+    writer.close()
+
+
+def test_daemon_unsubscribes_coins_removed_from_universe(path):
+    from backend.core.universe import TickerUniverse
+
+    tickers = [("upbit", "bybit", "XRP"), ("upbit", "bybit", "BTC")]
+    universe = TickerUniverse(lambda: list(tickers))
+    store = SharedBookStore.create(path, slots=4, levels=10)
+    daemon = MarketDataDaemon(store, [], universe=universe)
+    stream = BybitOrderbookStream()
+    stream.last_message_at = time.monotonic()
+    daemon.feeds["bybit"] = stream
+    daemon.refresh()
+    assert stream.tickers() == ["BTC", "XRP"]
+    stream.handle_message('{"topic":"orderbook.200.XRPUSDT","type":"snapshot","ts":5,"data":{"s":"XRPUSDT","a":[["2.01","1"]],"b":[["2.00","1"]],"u":1}}')
+    assert daemon.publish() == 1
+
+    tickers.pop(0)
+    universe.invalidate()
+    daemon.refresh()
+    assert stream.tickers() == ["BTC"]
+    assert stream._removed == {"XRP"} and "XRP" not in stream._books
+    assert SharedBookFeed(path, "bybit").get("XRP") is None
+    assert ("bybit", "XRP") not in daemon._published
+    store.close()
@@ -0,0 +1,60 @@
+from backend.core.task_planner import TaskPlanner, WorkerCapacity, request_cost
+
+
+def universe(coins):
+    return [
+        (korean, foreign, coin)
+        for coin in coins
+        for korean in ("upbit", "bithumb")
+        for foreign in ("bybit", "gateio")
+    ]
+
+
+def test_korean_batch_call_is_charged_once_per_task():
+    # 코인별로는 해외거래소 요청만
+    assert request_cost(universe(["BTC"])) == 2
+    planner = TaskPlanner(request_seconds=0.1)
+    planner.observe({"korean:upbit": 0.5, "BTC": 0.3})
+    assert planner.overhead(universe(["BTC", "ETH"])) == 0.5 + 0.1
+    assert planner.latency == {"BTC": 0.3}
+
+
+def test_plan_uses_fewest_tasks_that_meet_deadline():
+    tickers = universe([f"C{i}" for i in range(20)])
+    planner = TaskPlanner(request_seconds=0.1, deadline=1.25)
+    # 코인당 해외 2요청 x 0.1초 = 0.2초, 합계 4초 + 태스크마다 한국 일괄 조회 0.2초 ~ 마감 1.25초면 4개 태스크 (5코인씩)
+    batches = planner.plan(tickers, slots=16)
+    assert len(batches) == 4
+    assert sorted(t for batch in batches for t in batch) == sorted(tickers)
+    for batch in batches:
+        coins = {t[2] for t in batch}
+        assert len(batch) == 4 * len(coins)  # 코인의 모든 조합이 한 태스크에
+
+    # 워커 슬롯이 부족하면 슬롯 수를 넘기지 않음
+    assert len(planner.plan(tickers, slots=2)) == 2
+
+
+def test_plan_balances_observed_latency():
+    tickers = universe(["SLOW", "A", "B", "C"])
+    planner = TaskPlanner(request_seconds=0.1, deadline=1.3)
+    planner.observe({"SLOW": 0.9, "A": 0.3, "B": 0.3, "C": 0.3})
+    batches = planner.plan(tickers, slots=4)
+    assert [{t[2] for t in batch} for batch in batches] == [{"SLOW"}, {"A", "B", "C"}]
+
+    planner.observe({"SLOW": 0.1})
+    assert planner.latency["SLOW"] == 0.9 + 0.3 * (0.1 - 0.9)
+
+
+def test_worker_capacity_sums_pool_concurrency():
+    class Inspect:
+        def stats(self):
+            return {"w1": {"pool": {"max-concurrency": 4}}, "w2": {"pool": {"max-concurrency": 2}}}
+
+    class Control:
+        def inspect(self, timeout):
+            return Inspect()
+
+    class App:
+        control = Control()
+
+    assert WorkerCapacity(App()).slots() == 6
@@ -0,0 +1,44 @@
+from backend.core.tiering import COLD, HOT, WARM, CoinTiering, threshold_distance
+
+TICKERS = [("upbit", "bybit", coin) for coin in ("BTC", "ETH", "XRP", "DOGE", "SOL")]
+USERS = {
+    ("upbit", "bybit"): [
+        {"coin_mode": "custom", "selected_coins": ["ETH", "XRP"], "trade_mode": "custom",
+         "entry_rate": 1380, "exit_rate": 1450},
+    ]
+}
+
+
+def rate(entry, exit):
+    return {"entry_ex_rate": entry, "exit_ex_rate": exit, "usdt_price": 1400}
+
+
+def test_threshold_distance():
+    user = USERS[("upbit", "bybit")][0]
+    assert threshold_distance(user, rate(1390, 1400)) == (1390 - 1380) / 1380
+    assert threshold_distance(user, rate(1370, 1400)) == 0.0
+    # 자동 매매 모드는 테더 가격의 99% 기준
+    assert threshold_distance({"trade_mode": "auto"}, rate(1386, 1390)) == 0.0
+
+
+def test_classify_by_positions_thresholds_and_selection():
+    tiering = CoinTiering(hot_band=0.003, warm_band=0.015)
+    latest = {
+        "upbit:bybit:ETH": rate(1382, 1390),   # 진입 조건에 0.15% ~ hot
+        "upbit:bybit:XRP": rate(1500, 1400),   # 선택되었지만 조건과 멀리 ~ warm
+        "upbit:bybit:DOGE": rate(1500, 1400),  # 선택 안 됨 ~ cold
+        "upbit:bybit:SOL": rate(1500, 1400),
+    }
+    tiers = tiering.classify(TICKERS, USERS, {"SOL"}, latest)
+    assert tiers == {"BTC": WARM, "ETH": HOT, "XRP": WARM, "DOGE": COLD, "SOL": HOT}
+
+
+def test_select_runs_each_tier_at_its_cadence():
+    tiering = CoinTiering(hot_every=1, warm_every=2, cold_every=5)
+    tiers = {"BTC": HOT, "ETH": WARM, "XRP": COLD}
+    tickers = [("upbit", "bybit", coin) for coin in tiers]
+    runs = {coin: 0 for coin in tiers}
+    for _ in range(10):
+        for ticker in tiering.select(tickers, tiers):
+            runs[ticker[2]] += 1
+    assert runs == {"BTC": 10, "ETH": 5, "XRP": 2}
@@ -0,0 +1,40 @@
+from backend.core.universe import TickerUniverse
+
+TICKERS = [("upbit", "bybit", "BTC"), ("bithumb", "bybit", "BTC"), ("upbit", "bybit", "ETH")]
+
+
+def test_get_reads_once_until_invalidated():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return TICKERS
+
+    universe = TickerUniverse(fetch)
+    assert sorted(universe.get()) == sorted(TICKERS)
+    universe.get()
+    assert len(calls) == 1
+    assert universe.by_coin["BTC"] == (("bithumb", "bybit", "BTC"), ("upbit", "bybit", "BTC"))
+    assert universe.coins == ("BTC", "ETH")
+
+    universe.invalidate()
+    universe.get()
+    assert len(calls) == 2
+    # 내용이 같으면 버전 유지
+    assert universe.version == 1
+
+
+def test_empty_reload_keeps_previous_universe():
+    results = [TICKERS, []]
+    universe = TickerUniverse(lambda: results.pop(0))
+    universe.get()
+    universe.invalidate()
+    assert sorted(universe.get()) == sorted(TICKERS)
+
+
+def test_max_age_forces_reload():
+    calls = []
+    universe = TickerUniverse(lambda: calls.append(1) or TICKERS, max_age=0)
+    universe.get()
+    universe.get()
+    assert len(calls) == 2
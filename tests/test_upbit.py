@@ -29,7 +29,7 @@ async def test_get_tickers_success(upbit_service):
 
     # get_tickers 호출
     tickers = await upbit_service.get_ticker_orderbook(['BTC'])
-    print(json.dumps(tickers, indent=2))
+    print(json.dumps([ob.to_dict() for ob in tickers], indent=2))
     print(len(tickers[0].get("orderbook")))
 
     # 결과 검증
@@ -94,7 +94,7 @@ async def test_get_ticker_orderbook_success():
 
     # get_orderbook 호출
     orderbook = await UpbitExchange.get_ticker_orderbook(['BTC', 'ETH'])
-    print(json.dumps(orderbook, indent=2))
+    print(json.dumps([ob.to_dict() for ob in orderbook], indent=2))
 
     # 결과 검증
     # assert len(orderbook["orderbook_units"]) == 2
@@ -0,0 +1,57 @@
+import json
+import time
+from unittest.mock import AsyncMock, patch
+import pytest
+from backend.exchanges.orderbook import OrderbookSnapshot
+from backend.exchanges.upbit import UpbitExchange
+from backend.exchanges.upbit_stream import UpbitOrderbookStream
+
+
+def message(code, timestamp, units):
+    return json.dumps({"type": "orderbook", "code": code, "timestamp": timestamp, "orderbook_units": units}).encode()
+
+
+@pytest.fixture
+def stream():
+    stream = UpbitOrderbookStream(depth=30)
+    stream.last_message_at = time.monotonic()
+    return stream
+
+
+def test_each_message_replaces_market_book(stream):
+    stream.handle_message(message("KRW-XRP", 1, [
+        {"ask_price": 3001, "bid_price": 3000, "ask_size": 10, "bid_size": 20},
+        {"ask_price": 3002, "bid_price": 2999, "ask_size": 11, "bid_size": 21},
+    ]))
+    stream.handle_message(message("KRW-XRP", 2, [
+        {"ask_price": 3002, "bid_price": 3001, "ask_size": 5, "bid_size": 6},
+    ]))
+    ob = stream.get("XRP")
+    assert ob.timestamp == 2
+    assert ob.ask_prices.tolist() == [3002.0]
+    assert ob.bid_sizes.tolist() == [6.0]
+    assert stream.handle_message(json.dumps({"status": "UP"})) is None
+
+
+@pytest.mark.asyncio
+async def test_exchange_fetches_only_markets_missing_from_feed(stream, monkeypatch):
+    stream.handle_message(message("KRW-XRP", 1, [{"ask_price": 3001, "bid_price": 3000, "ask_size": 10, "bid_size": 20}]))
+    monkeypatch.setattr(UpbitExchange, "orderbook_feed", stream)
+    btc = OrderbookSnapshot.from_levels("BTC", 1, [[100, 1]], [[99, 1]])
+    with patch.object(UpbitExchange, "fetch_ticker_orderbook", new=AsyncMock(return_value=[btc])) as rest:
+        obs = await UpbitExchange.get_ticker_orderbook(["BTC", "XRP"], 30)
+    rest.assert_awaited_once_with(["BTC"], 30)
+    assert [ob.ticker for ob in obs] == ["BTC", "XRP"]
+    # 피드에 없던 마켓은 구독 대기열에 추가
+    assert stream._take_pending() == ["BTC"]
+
+
+@pytest.mark.asyncio
+async def test_exchange_uses_rest_when_request_is_deeper_than_feed(stream, monkeypatch):
+    stream.handle_message(message("KRW-XRP", 1, [{"ask_price": 3001, "bid_price": 3000, "ask_size": 10, "bid_size": 20}]))
+    monkeypatch.setattr(UpbitExchange, "orderbook_feed", stream)
+    xrp = OrderbookSnapshot.from_levels("XRP", 2, [[3001, 10]], [[3000, 20]])
+    with patch.object(UpbitExchange, "fetch_ticker_orderbook", new=AsyncMock(return_value=[xrp])) as rest:
+        obs = await UpbitExchange.get_ticker_orderbook(["XRP"], stream.depth + 1)
+    rest.assert_awaited_once_with(["XRP"], stream.depth + 1)
+    assert obs[0].timestamp == 2